@@ -0,0 +1,146 @@
+import re
+from typing import Awaitable, Callable, Dict, List, Tuple
+from urllib.parse import unquote
+from app.api.server import HTTPError, Request
+from app.api.service import InventoryService
+
+
+# HTTP status for each error kind reported by a write
+ERROR_STATUS = {
+    "item_not_found": 404,
+    "invalid_adjustment": 409,
+    "sale_rejected": 409,
+    "invalid_request": 400
+}
+
+
+def _require(data: Dict, key: str, kind: type, positive: bool = False, default=None):
+    """
+    Get a field of a JSON body, checking its type.
+
+    The field is required unless a `default` is given, which replaces a
+    missing, null or empty value.
+    """
+    value = data.get(key)
+    if default is not None and value in (None, ""):
+        return default
+    if isinstance(value, bool) or not isinstance(value, kind):
+        expected = "string" if kind is str else "number"
+        requirement = "is required and must" if default is None else "must"
+        raise HTTPError(400, "invalid_request", f"Field '{key}' {requirement} be a {expected}")
+    if positive and value <= 0:
+        raise HTTPError(400, "invalid_request", f"Field '{key}' must be positive")
+    return value
+
+
+def _write_response(result: Dict, created: bool = False) -> Tuple[int, Dict]:
+    """Map a write outcome from the service to a status and body."""
+    if result["ok"]:
+        return (201 if created else 200), result
+    return ERROR_STATUS.get(result["error"], 400), result
+
+
+class InventoryAPI:
+    """
+    HTTP endpoints over an InventoryService.
+
+    GET endpoints read the service's latest snapshot and report its
+    version; POST and DELETE endpoints queue a write and answer once the
+    batch containing it has been applied.
+    """
+
+    def __init__(self, service: InventoryService):
+        self.service = service
+        self.routes: List[Tuple[str, re.Pattern, Callable[..., Awaitable[Tuple[int, Dict]]]]] = [
+            ("GET", re.compile(r"/items"), self.list_items),
+            ("POST", re.compile(r"/items"), self.add_item),
+            ("GET", re.compile(r"/items/(?P<name>[^/]+)"), self.get_item),
+            ("DELETE", re.compile(r"/items/(?P<name>[^/]+)"), self.remove_item),
+            ("POST", re.compile(r"/items/(?P<name>[^/]+)/adjustments"), self.adjust_item),
+            ("POST", re.compile(r"/sales"), self.record_sale),
+            ("GET", re.compile(r"/reports/inventory"), self.inventory_report),
+            ("GET", re.compile(r"/reports/summary"), self.summary_report),
+        ]
+
+    async def __call__(self, request: Request) -> Tuple[int, Dict]:
+        """Dispatch a request to its endpoint."""
+        path = request.path.rstrip("/") or "/"
+        allowed = []
+        for method, pattern, endpoint in self.routes:
+            match = pattern.fullmatch(path)
+            if not match:
+                continue
+            if method != request.method:
+                allowed.append(method)
+                continue
+            params = {key: unquote(value) for key, value in match.groupdict().items()}
+            try:
+                return await endpoint(request, **params)
+            except HTTPError:
+                raise
+            except Exception as e:
+                return 500, {"error": "internal_error", "message": str(e)}
+        if allowed:
+            raise HTTPError(405, "method_not_allowed", f"Use {', '.join(allowed)} for {path}")
+        raise HTTPError(404, "not_found", f"No endpoint at {path}")
+
+    async def list_items(self, request: Request) -> Tuple[int, Dict]:
+        snapshot = self.service.snapshot
+        threshold = request.query.get("threshold")
+        try:
+            threshold = None if threshold is None else int(threshold)
+        except ValueError:
+            raise HTTPError(400, "invalid_request", "Query parameter 'threshold' must be an integer")
+        items = snapshot.list_items(
+            category=request.query.get("category"),
+            show_low_stock=request.query.get("low_stock", "").lower() in ("1", "true", "yes"),
+            threshold=threshold
+        )
+        return 200, {"version": snapshot.version, "items": items}
+
+    async def get_item(self, request: Request, name: str) -> Tuple[int, Dict]:
+        snapshot = self.service.snapshot
+        item = snapshot.get_item(name)
+        if item is None:
+            raise HTTPError(404, "item_not_found", f"Item '{name}' not found in inventory")
+        return 200, {"version": snapshot.version, "item": item}
+
+    async def add_item(self, request: Request) -> Tuple[int, Dict]:
+        data = request.json()
+        result = await self.service.submit(
+            "add",
+            _require(data, "name", str),
+            _require(data, "quantity", (int, float)),
+            _require(data, "price", (int, float)),
+            _require(data, "category", str, default="Uncategorized"),
+            _require(data, "unit", str, default="unit")
+        )
+        return _write_response(result, created=True)
+
+    async def remove_item(self, request: Request, name: str) -> Tuple[int, Dict]:
+        return _write_response(await self.service.submit("remove", name))
+
+    async def adjust_item(self, request: Request, name: str) -> Tuple[int, Dict]:
+        data = request.json()
+        result = await self.service.submit(
+            "adjust", name, _require(data, "quantity_change", (int, float)),
+            _require(data, "note", str, default=""))
+        return _write_response(result, created=True)
+
+    async def record_sale(self, request: Request) -> Tuple[int, Dict]:
+        data = request.json()
+        result = await self.service.submit(
+            "sale",
+            _require(data, "name", str),
+            _require(data, "quantity", (int, float), positive=True),
+            _require(data, "note", str, default="")
+        )
+        return _write_response(result, created=True)
+
+    async def inventory_report(self, request: Request) -> Tuple[int, Dict]:
+        snapshot = self.service.snapshot
+        return 200, {"version": snapshot.version, "report": snapshot.report}
+
+    async def summary_report(self, request: Request) -> Tuple[int, Dict]:
+        snapshot = self.service.snapshot
+        return 200, {"version": snapshot.version, "summary": snapshot.summary}
@@ -0,0 +1,120 @@
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+
+MAX_BODY_BYTES = 1 << 20
+
+
+class HTTPError(Exception):
+    """Error answered with an HTTP status and a JSON error body."""
+
+    def __init__(self, status: int, error: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.error = error
+        self.message = message
+
+
+class Request:
+    """A parsed HTTP request."""
+
+    def __init__(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        self.method = method
+        url = urlsplit(target)
+        self.path = url.path
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Dict:
+        """Decode the body as a JSON object."""
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "invalid_json", "Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "invalid_json", "Request body must be a JSON object")
+        return data
+
+    @property
+    def keep_alive(self) -> bool:
+        return self.headers.get("connection", "").lower() != "close"
+
+
+Handler = Callable[[Request], Awaitable[Tuple[int, Dict]]]
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """
+    Read one HTTP/1.1 request from a connection.
+
+    Returns:
+        The request, or None once the client has closed the connection
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "bad_request", "Malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        headers[key.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "bad_request", "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "body_too_large", "Request body is too large")
+    body = await reader.readexactly(length) if length else b""
+    return Request(method.upper(), target, headers, body)
+
+
+def encode_response(status: int, payload: Dict, keep_alive: bool = True) -> bytes:
+    """Encode a JSON response; Decimals are written as strings."""
+    body = json.dumps(payload, default=str).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def serve_connection(handler: Handler, reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter) -> None:
+    """Answer requests on one connection until the client closes it."""
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                status, payload = await handler(request)
+                keep_alive = request.keep_alive
+            except HTTPError as e:
+                status, payload = e.status, {"error": e.error, "message": e.message}
+                keep_alive = False
+            writer.write(encode_response(status, payload, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(handler: Handler, host: str = "127.0.0.1", port: int = 8000) -> asyncio.AbstractServer:
+    """Start an HTTP server dispatching every request to `handler`."""
+    return await asyncio.start_server(
+        lambda reader, writer: serve_connection(handler, reader, writer), host, port)
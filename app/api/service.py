@@ -0,0 +1,333 @@
+import asyncio
+import math
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from app.models.inventory import Inventory, InventoryError
+from app.storage.sqlite import SQLiteStorage
+
+
+def item_key(name: str) -> str:
+    """Normalize an item name the way Inventory's name index does."""
+    return name.strip().lower()
+
+
+class ItemViews(Mapping):
+    """
+    Immutable item views of one snapshot.
+
+    Snapshots share one base dict and each holds only the entries
+    changed since it, so publishing a batch copies those entries instead
+    of the whole catalogue. Neither dict is modified once published.
+    """
+
+    def __init__(self, base: Dict[str, Dict], changes: Dict[str, Optional[Dict]], size: int):
+        """
+        Args:
+            base: Normalized item name -> serialized item, shared between snapshots
+            changes: Entries changed since `base`, with None for removed items
+            size: Number of items in the merged view
+        """
+        self._base = base
+        self._changes = changes
+        self._size = size
+
+    def __getitem__(self, key: str) -> Dict:
+        if key in self._changes:
+            view = self._changes[key]
+            if view is None:
+                raise KeyError(key)
+            return view
+        return self._base[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key, view in self._changes.items():
+            if view is not None:
+                yield key
+        for key in self._base:
+            if key not in self._changes:
+                yield key
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class Snapshot:
+    """
+    Read-only view of the inventory at one version.
+
+    A new snapshot is published after every write batch. Readers only
+    ever see a published snapshot, so a report never mixes the state
+    before and after a batch, and reading never waits on the writer.
+    """
+
+    def __init__(self, version: int, items: Mapping, total_revenue: Decimal,
+                 report: Dict, summary: Dict):
+        """
+        Args:
+            version: Snapshot number, increasing with every published batch
+            items: Normalized item name -> serialized item
+            total_revenue: Total revenue at this version
+            report: Inventory report at this version
+            summary: Summary insights at this version
+        """
+        self.version = version
+        self.items = items
+        self.total_revenue = total_revenue
+        self.report = report
+        self.summary = summary
+        self._sorted_items: Optional[List[Dict]] = None
+        # Lower-cased category -> its items sorted by name, built on first use
+        self._items_by_category: Optional[Dict[str, List[Dict]]] = None
+
+    def get_item(self, name: str) -> Optional[Dict]:
+        """Get a serialized item by name."""
+        return self.items.get(item_key(name))
+
+    def list_items(self, category: Optional[str] = None, show_low_stock: bool = False,
+                   threshold: Optional[int] = None) -> List[Dict]:
+        """
+        Get serialized items sorted by name, filtered like `Inventory.get_items`.
+
+        With `show_low_stock`, items are compared against `threshold`, or
+        by default against their own "low_stock_threshold".
+        """
+        if self._sorted_items is None:
+            self._sorted_items = sorted(self.items.values(), key=lambda item: item["name"])
+        items = self._sorted_items
+        if category:
+            if self._items_by_category is None:
+                self._items_by_category = {}
+                for item in self._sorted_items:
+                    self._items_by_category.setdefault(item["category"].lower(), []).append(item)
+            items = self._items_by_category.get(category.lower(), [])
+        if show_low_stock:
+            items = [item for item in items
+                     if item["quantity"] <= (item["low_stock_threshold"] if threshold is None else threshold)]
+        return items
+
+
+class InventoryService:
+    """
+    Serializes concurrent requests onto one Inventory.
+
+    All Inventory access happens on a single writer thread. Writes are
+    queued and the writer drains the queue in batches: consecutive sales
+    in a batch are applied with one `record_sales_bulk` call, other
+    writes one by one, and a fresh Snapshot is published once the batch
+    is done. Reads are answered from the latest snapshot on the event
+    loop, without touching the Inventory.
+    """
+
+    def __init__(self, path: str, journal: bool = False, max_batch: int = 256,
+                 event_sink: Optional[Callable[[Dict], None]] = None):
+        """
+        Args:
+            path: Inventory file (JSON, or a SQLite database by extension)
+            journal: Journal changes next to a JSON file instead of rewriting it
+            max_batch: Most queued writes applied in one batch
+            event_sink: Callable receiving the Inventory's status events
+        """
+        if max_batch <= 0:
+            raise ValueError("Batch size must be positive")
+
+        self.path = path
+        self.journal = journal
+        self.max_batch = max_batch
+        self.event_sink = event_sink
+        self._events: List[Dict] = []
+        self.inventory = Inventory(event_sink=self._record_event)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inventory-writer")
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        # Published item views: a shared base plus the entries changed since
+        # it, folded into a new base once they outgrow `_fold_limit()`
+        self._item_views: Dict[str, Dict] = {}
+        self._changed_views: Dict[str, Optional[Dict]] = {}
+        self._item_count = 0
+        self._version = 0
+        self.snapshot: Optional[Snapshot] = None
+
+    def _record_event(self, event: Dict) -> None:
+        self._events.append(event)
+        if self.event_sink is not None:
+            self.event_sink(event)
+
+    async def start(self) -> None:
+        """Load the inventory, publish the first snapshot and start the writer."""
+        loop = asyncio.get_running_loop()
+        self.snapshot = await loop.run_in_executor(self._executor, self._open)
+        self._queue = asyncio.Queue()
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def stop(self) -> None:
+        """Apply queued writes, save the inventory and stop the writer."""
+        if self._writer is None:
+            return
+        await self._queue.join()
+        self._writer.cancel()
+        try:
+            await self._writer
+        except asyncio.CancelledError:
+            pass
+        self._writer = None
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._close)
+        self._executor.shutdown()
+
+    def _open(self) -> Snapshot:
+        if self.path.lower().endswith(SQLiteStorage.SUFFIXES):
+            self.inventory.open_database(self.path)
+        elif self.journal:
+            self.inventory.enable_journal(self.path)
+        else:
+            self.inventory.load_from_file(self.path)
+        self._item_views = {item_key(item.name): self._item_view(item.name) for item in self.inventory.produces}
+        self._item_count = len(self._item_views)
+        return self._publish()
+
+    def _close(self) -> None:
+        self.inventory.save_to_file(self.path)
+        self.inventory.close_storage()
+
+    async def submit(self, kind: str, *args) -> Dict:
+        """
+        Queue a write and wait for its outcome.
+
+        Args:
+            kind: One of "sale", "add", "adjust" or "remove"
+            *args: Arguments of the matching Inventory method
+
+        Returns:
+            Dict with "ok", "error", "message" and "version" keys, plus
+            operation-specific details
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((kind, args, future))
+        return await future
+
+    async def _write_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                results, snapshot = await loop.run_in_executor(
+                    self._executor, self._apply, [(kind, args) for kind, args, _ in batch])
+                self.snapshot = snapshot
+                for (_, _, future), result in zip(batch, results):
+                    result["version"] = snapshot.version
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _apply(self, batch: List[Tuple[str, Tuple]]) -> Tuple[List[Dict], Snapshot]:
+        """
+        Apply a batch of writes on the writer thread and publish the result.
+
+        The snapshot is published even if a write raises, so reads never
+        lag behind whatever the batch changed before failing.
+        """
+        results = []
+        touched = set()
+        index = 0
+        try:
+            while index < len(batch):
+                if batch[index][0] == "sale":
+                    end = index
+                    while end < len(batch) and batch[end][0] == "sale":
+                        end += 1
+                    touched.update(args[0] for _, args in batch[index:end])
+                    results.extend(self._apply_sales([args for _, args in batch[index:end]]))
+                    index = end
+                else:
+                    kind, args = batch[index]
+                    touched.add(args[0])
+                    results.append(self._apply_one(kind, args))
+                    index += 1
+        finally:
+            self._update_views(touched)
+            self.snapshot = self._publish()
+        return results, self.snapshot
+
+    def _update_views(self, names: set) -> None:
+        """Record the current views of the named items for the next snapshot."""
+        changes = dict(self._changed_views)
+        for name in names:
+            key = item_key(name)
+            existed = changes[key] is not None if key in changes else key in self._item_views
+            changes[key] = self._item_view(name)
+            self._item_count += (changes[key] is not None) - existed
+        if len(changes) > self._fold_limit():
+            views = dict(self._item_views)
+            for key, view in changes.items():
+                if view is None:
+                    views.pop(key, None)
+                else:
+                    views[key] = view
+            self._item_views = views
+            changes = {}
+        self._changed_views = changes
+
+    def _fold_limit(self) -> int:
+        """Most changed entries kept beside the base before it is rebuilt."""
+        # Balances copying the changes each batch against rebuilding the base
+        return max(self.max_batch, math.isqrt(len(self._item_views)))
+
+    def _apply_sales(self, rows: List[Tuple]) -> List[Dict]:
+        outcome = self.inventory.record_sales_bulk(rows, atomic=False)
+        low_stock = set(outcome["low_stock"])
+        return [{
+            "ok": row["ok"],
+            "error": None if row["ok"] else "sale_rejected",
+            "message": row["error"],
+            "name": row["name"],
+            "quantity": row["quantity"],
+            "amount": row["amount"],
+            "remaining": row["remaining"],
+            "low_stock": row["ok"] and self.inventory.get_item(row["name"]).name in low_stock
+        } for row in outcome["rows"]]
+
+    def _apply_one(self, kind: str, args: Tuple) -> Dict:
+        method = {
+            "add": self.inventory.add_item,
+            "adjust": self.inventory.adjust_item,
+            "remove": self.inventory.remove_item
+        }[kind]
+        self._events.clear()
+        try:
+            ok = method(*args)
+        except (InventoryError, ValueError) as e:
+            return {"ok": False, "error": "invalid_request", "message": str(e)}
+        event = self._events[-1] if self._events else {}
+        return {
+            "ok": ok,
+            "error": None if ok else event.get("kind"),
+            "message": event.get("message"),
+            "item": self._item_view(args[0])
+        }
+
+    def _item_view(self, name: str) -> Optional[Dict]:
+        """Serialize an item with the low-stock threshold that applies to it."""
+        item = self.inventory.get_item(name)
+        if item is None:
+            return None
+        return {**item.to_dict(), "low_stock_threshold": self.inventory.get_low_stock_threshold(name)}
+
+    def _publish(self) -> Snapshot:
+        self._version += 1
+        return Snapshot(
+            version=self._version,
+            items=ItemViews(self._item_views, self._changed_views, self._item_count),
+            total_revenue=self.inventory.get_total_revenue(),
+            report=self.inventory.get_inventory_report(),
+            summary=self.inventory.generate_summary_insights()
+        )
@@ -0,0 +1,57 @@
+"""
+HTTP API entrypoint.
+
+Usage:
+    python -m app.main data/inventory.json [--host 127.0.0.1] [--port 8000] [--journal]
+"""
+import argparse
+import asyncio
+import signal
+from typing import List, Optional
+from app.api.endpoints import InventoryAPI
+from app.api.server import start_server
+from app.api.service import InventoryService
+
+
+async def serve(file_path: str, host: str, port: int, journal: bool = False) -> None:
+    """Load the inventory and serve the API until interrupted, saving on the way out."""
+    service = InventoryService(file_path, journal=journal,
+                               event_sink=lambda event: print(event["message"]))
+    await service.start()
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stopping.set)
+        except (NotImplementedError, RuntimeError):
+            # Not supported on Windows; Ctrl+C cancels serve() instead
+            pass
+    try:
+        server = await start_server(InventoryAPI(service), host, port)
+        print(f"🌽 Inventory API listening on http://{host}:{port}")
+        async with server:
+            await stopping.wait()
+    finally:
+        await service.stop()
+        print("👋 Inventory API stopped")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Farm Produce Inventory Tracker API")
+    parser.add_argument("file_path",
+                        help="JSON file used to store the inventory, or a .db/.sqlite "
+                             "file to use a SQLite database")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on (default: %(default)s)")
+    parser.add_argument("--journal", action="store_true",
+                        help="append each change to a journal instead of rewriting the file")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.file_path, args.host, args.port, args.journal))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+from app.storage.atomic import atomic_write
+
+
+class LatencyHistogram:
+    """Latency distribution over fixed buckets, Prometheus style."""
+
+    # Upper bounds in seconds; the last bucket (+Inf) is implicit
+    BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+               0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record one observation."""
+        self.counts[bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile as the upper bound of the bucket it falls in.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Upper bound in seconds (inf for the last bucket), or None
+            without observations
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.BUCKETS + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class Metrics:
+    """
+    Counters and latency histograms for Inventory operations.
+
+    Each operation counts its calls by outcome: "ok", "failed" (it
+    returned False) or "error" (it raised). Gauges are read from
+    callables when metrics are reported. Recording takes a lock, so one
+    Metrics can be shared by threads.
+    """
+
+    OUTCOMES = ("ok", "failed", "error")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[Tuple[str, str], int] = {}
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+
+    def observe(self, operation: str, seconds: float, outcome: str = "ok") -> None:
+        """Record one call of an operation."""
+        with self._lock:
+            key = (operation, outcome)
+            self.counters[key] = self.counters.get(key, 0) + 1
+            histogram = self.histograms.get(operation)
+            if histogram is None:
+                histogram = self.histograms[operation] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def add_gauge(self, name: str, help: str, read: Callable[[], float]) -> None:
+        """Report the value returned by `read` as gauge `name`."""
+        self.gauges[name] = (help, read)
+
+    def timed(self, operation: str, method: Callable) -> Callable:
+        """Wrap a callable so every call is timed and counted under `operation`."""
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except BaseException:
+                self.observe(operation, time.perf_counter() - start, "error")
+                raise
+            self.observe(operation, time.perf_counter() - start, "failed" if result is False else "ok")
+            return result
+        return wrapper
+
+    def snapshot(self) -> Dict:
+        """
+        Get the current metrics.
+
+        Returns:
+            Dict with "operations": operation -> {"calls", "ok", "failed",
+            "error", "total_seconds", "mean_seconds", "p50_seconds",
+            "p99_seconds"}, and "gauges": gauge name -> value
+        """
+        with self._lock:
+            operations = {}
+            for operation, histogram in sorted(self.histograms.items()):
+                stats = {"calls": histogram.count}
+                for outcome in self.OUTCOMES:
+                    stats[outcome] = self.counters.get((operation, outcome), 0)
+                stats["total_seconds"] = histogram.sum
+                stats["mean_seconds"] = histogram.sum / histogram.count
+                stats["p50_seconds"] = histogram.quantile(0.5)
+                stats["p99_seconds"] = histogram.quantile(0.99)
+                operations[operation] = stats
+        gauges = {name: read() for name, (_, read) in sorted(self.gauges.items())}
+        return {"operations": operations, "gauges": gauges}
+
+    def to_prometheus(self, prefix: str = "inventory") -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            lines.append(f"# HELP {prefix}_operations_total Inventory operations by outcome.")
+            lines.append(f"# TYPE {prefix}_operations_total counter")
+            for (operation, outcome), count in sorted(self.counters.items()):
+                lines.append(f'{prefix}_operations_total{{operation="{operation}",outcome="{outcome}"}} {count}')
+
+            name = f"{prefix}_operation_seconds"
+            lines.append(f"# HELP {name} Inventory operation latency in seconds.")
+            lines.append(f"# TYPE {name} histogram")
+            for operation, histogram in sorted(self.histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.BUCKETS, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{operation="{operation}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{operation="{operation}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{name}_sum{{operation="{operation}"}} {histogram.sum!r}')
+                lines.append(f'{name}_count{{operation="{operation}"}} {histogram.count}')
+
+        for gauge, (help, read) in sorted(self.gauges.items()):
+            lines.append(f"# HELP {prefix}_{gauge} {help}")
+            lines.append(f"# TYPE {prefix}_{gauge} gauge")
+            lines.append(f"{prefix}_{gauge} {read()}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str, prefix: str = "inventory") -> None:
+        """
+        Write the metrics to a Prometheus text file.
+
+        The file is replaced atomically, so a collector (e.g. the node
+        exporter's textfile collector) never reads a partial dump.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with atomic_write(path, "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus(prefix))
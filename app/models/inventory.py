@@ -1,11 +1,25 @@
-import json
+import csv
+import functools
+import gzip
 import os
-from datetime import date, datetime
-from typing import List, Dict, Optional, Tuple
+import threading
+from contextlib import ExitStack, nullcontext
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 from decimal import Decimal
-from collections import Counter, defaultdict
+from app.metrics import Metrics
+from app.models.money import ZERO, to_decimal
 from app.models.produce import ProduceItem
+from app.models.stock_tracker import LowStockTracker
 from app.models.transaction import Transaction
+from app.models.transaction_store import TransactionStore, to_micros
+from app.storage.base import DatabaseBackend, StorageBackend
+from app.storage.journal import TransactionJournal
+from app.storage.json_snapshot import JSONSnapshot, SavedFile
+from app.storage.snapshot import BinarySnapshot
+from app.storage.sqlite import SQLiteStorage
+from app.storage.streaming import DeferredArray, read_inventory_file
 
 
 class InventoryError(Exception):
@@ -13,6 +27,24 @@ class InventoryError(Exception):
     pass
 
 
+def _locks_item(method):
+    """Run an Inventory method holding the lock stripe of its item name."""
+    @functools.wraps(method)
+    def locked(self, name, *args, **kwargs):
+        with self._item_lock(name):
+            return method(self, name, *args, **kwargs)
+    return locked
+
+
+def _locks_all(method):
+    """Run an Inventory method with every lock held, excluding all other operations."""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._all_locks():
+            return method(self, *args, **kwargs)
+    return locked
+
+
 class Inventory:
     """
     Enhanced inventory management system for produce items.
@@ -21,16 +53,221 @@ class Inventory:
     - Add, update, and adjust inventory items
     - Record sales and track revenue
     - Transaction logging with filtering
-    - Low stock alerts
-    - Data persistence (JSON)
+    - Low stock alerts with per-item and per-category thresholds
+    - Data persistence (JSON, optionally journaled, or SQLite)
+    - Status messages as printed lines or structured events
     - Inventory valuation and reporting
+
+    Stock value, per-category rollups and per-item sales totals are kept
+    up to date as items are added, sold, adjusted and removed, so reports
+    do not rescan the catalogue or the transaction history. Items should
+    therefore be changed through Inventory methods rather than directly.
+
+    With `thread_safe=True` the inventory can be shared between threads.
+    Each item is guarded by one of LOCK_STRIPES locks chosen by its
+    normalized name, so sales of different items run in parallel while
+    an item's stock check and update stay atomic. The shared aggregates
+    and the transaction log have a lock each; locks are always taken in
+    the order item stripes, aggregates, log. Loading, saving and other
+    whole-inventory operations take every lock. Saving only holds them
+    while the state is copied, so other threads keep going while the file
+    is written. Without `thread_safe` all locks are no-ops.
     """
+
+    LOCK_STRIPES = 64
+    # Operations timed and counted while metrics are enabled
+    INSTRUMENTED_OPERATIONS = (
+        "add_item", "remove_item", "record_sale", "record_sales_bulk", "adjust_item",
+        "save_to_file", "load_from_file", "checkpoint",
+        "get_transactions_page", "filter_transactions_by_type", "filter_transactions_by_date",
+        "get_item_history", "get_item_stats",
+        "get_inventory_report", "generate_summary_insights",
+        "export_inventory_to_csv", "export_transactions_to_csv", "export_full_report_to_csv"
+    )
     
-    def __init__(self):
+    def __init__(self, quiet: bool = False,
+                 event_sink: Optional[Callable[[Dict], None]] = None,
+                 thread_safe: bool = False, report_workers: int = 1,
+                 compact: bool = False):
+        """
+        Args:
+            quiet: Suppress status messages instead of printing them
+            event_sink: Callable receiving each status message as an event
+                dict with "kind", "level" and "message" keys plus
+                operation-specific details; replaces printing when given
+            thread_safe: Guard operations with locks so the inventory can be
+                shared between threads
+            report_workers: Processes used to build the sale aggregates from
+                a long transaction history; 1 computes them in this process
+            compact: Save JSON files without indentation, which makes them
+                about 30% smaller and quicker to write
+        """
+        if report_workers < 1:
+            raise ValueError("Report workers must be at least 1")
+
+        self.quiet = quiet
+        self.event_sink = event_sink
+        self.thread_safe = thread_safe
+        self.report_workers = report_workers
+        self.compact = compact
+        if thread_safe:
+            self._item_locks = [threading.RLock() for _ in range(self.LOCK_STRIPES)]
+            self._state_lock = threading.RLock()
+            self._log_lock = threading.RLock()
+            # Serializes saves; taken before any other lock
+            self._save_lock = threading.Lock()
+        else:
+            no_lock = nullcontext()
+            self._item_locks = [no_lock]
+            self._state_lock = self._log_lock = self._save_lock = no_lock
         self.produces: List[ProduceItem] = []
-        self.transactions: List[Transaction] = []
-        self._total_revenue = Decimal('0.00')
+        self._transactions = TransactionStore()
+        # Transactions still on disk (a DeferredArray or a database's
+        # history), parsed on first access to self.transactions
+        self._pending_history: Optional[DeferredArray] = None
+        # While a delta save replaces the file behind the pending history:
+        # the number of in-memory rows it appends after the pending ones
+        self._pending_rewrite: Optional[int] = None
+        self._total_revenue = ZERO
+        # Running aggregates over self.produces
+        self._stock_value = ZERO
+        self._category_stats: Dict[str, Dict] = {}
+        # Running aggregates over sale transactions; None until first needed
+        self._sales_stats: Optional[Dict] = None
+        # Case-folded name -> item, kept in step with self.produces
+        self._items_by_name: Dict[str, ProduceItem] = {}
+        # Lower-cased category -> its items, kept in step with self.produces
+        self._items_by_category: Dict[str, List[ProduceItem]] = {}
+        # Items ordered by stock level, kept in step with self.produces
+        self._low_stock = LowStockTracker()
+        # Backend every mutation is written through to, and the path it
+        # saves to (the snapshot path when journaling)
+        self._storage: Optional[StorageBackend] = None
+        self._storage_path: Optional[str] = None
+        self._journal_sequence = 0
+        # Mutations logged so far, and how many of them the last save or
+        # load covered
+        self._change_count = 0
+        self._saved_change_count = 0
+        # File the last save or load left on disk, which holds every
+        # transaction but the unsaved ones; items changed since, and the
+        # encoded JSON of the others
+        self._saved_file: Optional[SavedFile] = None
+        self._dirty_items = set()
+        self._item_fragments: Dict[ProduceItem, str] = {}
+        self._fragments_compact = compact
+        # Registry the instrumented operations report to, while enabled
+        self.metrics: Optional[Metrics] = None
+
+    def enable_metrics(self, metrics: Optional[Metrics] = None) -> Metrics:
+        """
+        Time and count every call of the INSTRUMENTED_OPERATIONS.
+
+        The operations are shadowed on this instance by timed wrappers, so
+        inventories without metrics keep calling the plain methods at no
+        extra cost. Item and transaction counts are reported as gauges.
+
+        Args:
+            metrics: Registry to report to; a new one by default
+
+        Returns:
+            Metrics: The registry, also available as `self.metrics`
+        """
+        self.disable_metrics()
+        metrics = metrics if metrics is not None else Metrics()
+        for name in self.INSTRUMENTED_OPERATIONS:
+            setattr(self, name, metrics.timed(name, getattr(self, name)))
+        metrics.add_gauge("items", "Items in the inventory.", lambda: len(self.produces))
+        metrics.add_gauge("transactions", "Transactions loaded in memory.", lambda: len(self._transactions))
+        self.metrics = metrics
+        return metrics
+
+    def disable_metrics(self) -> None:
+        """Stop timing operations, restoring the plain methods."""
+        for name in self.INSTRUMENTED_OPERATIONS:
+            self.__dict__.pop(name, None)
+        self.metrics = None
+
+    def _item_lock(self, name: str):
+        """Get the lock stripe guarding an item name."""
+        return self._item_locks[hash(self._normalize_name(name)) % len(self._item_locks)]
+
+    def _items_locked(self, names: Iterable[str]) -> ExitStack:
+        """Hold the lock stripes of several item names, taken in stripe order."""
+        stack = ExitStack()
+        count = len(self._item_locks)
+        for stripe in sorted({hash(self._normalize_name(name)) % count for name in names}):
+            stack.enter_context(self._item_locks[stripe])
+        return stack
+
+    def _all_locks(self) -> ExitStack:
+        """Hold every lock, in the documented order."""
+        stack = ExitStack()
+        for lock in self._item_locks:
+            stack.enter_context(lock)
+        stack.enter_context(self._state_lock)
+        stack.enter_context(self._log_lock)
+        return stack
+
+    def _emit(self, kind: str, level: str, message: str, **details) -> None:
+        """Report a status message to the event sink, or print it unless quiet."""
+        if self.event_sink is not None:
+            self.event_sink({"kind": kind, "level": level, "message": message, **details})
+        elif not self.quiet:
+            print(message)
+
+    @property
+    def transactions(self) -> TransactionStore:
+        """Transaction log, materialized from disk on first access."""
+        if self._pending_history is not None:
+            with self._log_lock:
+                if self._pending_history is not None:
+                    self._materialize_history()
+        return self._transactions
+
+    @transactions.setter
+    @_locks_all
+    def transactions(self, transactions: Iterable[Transaction]) -> None:
+        self._pending_history = None
+        self._sales_stats = None
+        if not isinstance(transactions, TransactionStore):
+            transactions = TransactionStore(transactions)
+        self._transactions = transactions
+        self._change_count += 1
+        self._saved_file = None
+
+    def has_pending_history(self) -> bool:
+        """Check whether loaded transaction history is still unparsed."""
+        return self._pending_history is not None
+
+    @property
+    def unsaved_changes(self) -> int:
+        """Number of mutations since the inventory was last saved or loaded."""
+        return self._change_count - self._saved_change_count
+
+    def is_dirty(self) -> bool:
+        """Check whether the inventory changed since it was last saved or loaded."""
+        return self._change_count != self._saved_change_count
+
+    def _materialize_history(self) -> None:
+        """Parse deferred transaction history ahead of anything logged since load."""
+        pending = self._pending_history
+        self._pending_history = None
+        if pending.is_stale():
+            _, pending = read_inventory_file(pending.path)
+            if pending is None:
+                return
+            if self._pending_rewrite is not None:
+                # A delta save replaced the file, appending rows still held in memory
+                pending.skip_last = self._pending_rewrite
 
+        history = TransactionStore()
+        for chunk in pending.iter_chunks():
+            history.extend_dicts(chunk)
+        history.extend_store(self._transactions)
+        self._transactions = history
+
+    @_locks_item
     def add_item(self, name: str, quantity: int, price: float, 
                  category: str = "Uncategorized", unit: str = "unit") -> bool:
         """
@@ -59,92 +296,134 @@ class Inventory:
         existing_item = self._find_item_by_name(name)
         if existing_item:
             new_quantity = existing_item.quantity + quantity
-            existing_item.update_quantity(new_quantity)
-            existing_item.update_price(price)
+            with self._state_lock:
+                self._untrack_item(existing_item)
+                existing_item.update_quantity(new_quantity)
+                existing_item.update_price(price)
+                self._track_item(existing_item)
             
             # Log the transaction
             self._log_transaction(
                 type="purchase",
                 produce_name=name,
                 quantity=quantity,
-                price=Decimal(str(price)),
-                note=f"Restocked existing item"
+                price=existing_item.price,
+                note=f"Restocked existing item",
+                item=existing_item
             )
             
-            print(f"✅ Updated existing item: {name}")
+            self._emit("item_updated", "success", f"✅ Updated existing item: {name}", name=name)
             return True
 
         # Create new item
         produce = ProduceItem(name, quantity, price, category, unit)
-        self.produces.append(produce)
+        with self._state_lock:
+            self.produces.append(produce)
+            self._items_by_name[self._normalize_name(name)] = produce
+            self._index_category(produce)
+            self._track_item(produce)
         
         # Log the transaction
         self._log_transaction(
             type="purchase",
             produce_name=name,
             quantity=quantity,
-            price=Decimal(str(price)),
-            note=f"Added new item to inventory"
+            price=produce.price,
+            note=f"Added new item to inventory",
+            item=produce
         )
         
-        print(f"✅ New item added to inventory: {name}")
+        self._emit("item_added", "success", f"✅ New item added to inventory: {name}", name=name)
         return True
 
+    @_locks_item
     def remove_item(self, name: str) -> bool:
         """Remove an item completely from inventory."""
         item = self._find_item_by_name(name)
         if not item:
-            print(f"❌ Item '{name}' not found in inventory")
+            self._emit("item_not_found", "error", f"❌ Item '{name}' not found in inventory", name=name)
             return False
         
-        self.produces.remove(item)
+        with self._state_lock:
+            self.produces.remove(item)
+            del self._items_by_name[self._normalize_name(item.name)]
+            self._unindex_category(item)
+            self._untrack_item(item)
+            self._low_stock.discard(item)
         self._log_transaction(
             type="adjustment",
             produce_name=name,
             quantity=item.quantity,
-            price=Decimal(str(item.price_per_unit)),
-            note="Item removed from inventory"
+            price=item.price,
+            note="Item removed from inventory",
+            item=item,
+            removed=True
         )
         
-        print(f"✅ Item '{name}' removed from inventory")
+        self._emit("item_removed", "success", f"✅ Item '{name}' removed from inventory", name=name)
         return True
 
+    def get_item(self, name: str) -> Optional[ProduceItem]:
+        """Look up an item by name, ignoring case and surrounding whitespace."""
+        return self._find_item_by_name(name)
+
+    def get_items(self, category: Optional[str] = None,
+                  show_low_stock: bool = False, threshold: Optional[int] = None) -> List[ProduceItem]:
+        """
+        Get inventory items with optional filtering, sorted by name.
+
+        Filtering by category only visits that category's items, and
+        low stock items come straight from the low-stock tracker.
+        
+        Args:
+            category: Filter by category (optional)
+            show_low_stock: Only include low stock items
+            threshold: Low stock threshold; by default each item's own
+            
+        Returns:
+            List of matching items
+        """
+        with self._state_lock:
+            if category:
+                items = self._items_by_category.get(self._normalize_category(category), [])
+                if show_low_stock:
+                    items = [item for item in items if self._is_low(item, threshold)]
+            elif show_low_stock:
+                items = self.check_low_stock(threshold)
+            else:
+                items = self.produces
+
+            return sorted(items, key=lambda x: x.name)
+
     def list_items(self, category: Optional[str] = None, 
-                   show_low_stock: bool = False, threshold: int = 10) -> None:
+                   show_low_stock: bool = False, threshold: Optional[int] = None) -> None:
         """
         List inventory items with optional filtering.
         
         Args:
             category: Filter by category (optional)
             show_low_stock: Show only low stock items
-            threshold: Low stock threshold
+            threshold: Low stock threshold; by default each item's own
         """
         if not self.produces:
-            print("📦 Inventory is empty.")
+            self._emit("item_list", "info", "📦 Inventory is empty.", items=[])
             return
 
-        items_to_show = self.produces
-        
-        if category:
-            items_to_show = [item for item in items_to_show 
-                           if item.category.lower() == category.lower()]
-        
-        if show_low_stock:
-            items_to_show = [item for item in items_to_show 
-                           if item.quantity <= threshold]
+        items_to_show = self.get_items(category, show_low_stock, threshold)
 
         if not items_to_show:
             filter_desc = f" (Category: {category})" if category else ""
             filter_desc += " (Low stock only)" if show_low_stock else ""
-            print(f"📦 No items found{filter_desc}.")
+            self._emit("item_list", "info", f"📦 No items found{filter_desc}.", items=[])
             return
 
-        print("\n📋 Current Inventory:")
-        print("-" * 0)
-        for item in sorted(items_to_show, key=lambda x: x.name):
-            stock_status = "⚠️ LOW" if item.quantity <= threshold else "✅"
-            print(f"{stock_status} {item}")
+        lines = ["\n📋 Current Inventory:", "-" * 0]
+        for item in items_to_show:
+            stock_status = "⚠️ LOW" if self._is_low(item, threshold) else "✅"
+            lines.append(f"{stock_status} {item}")
+        self._emit("item_list", "info", "\n".join(lines), items=items_to_show)
 
+    @_locks_item
     def record_sale(self, name: str, quantity_sold: int, 
                    customer_note: str = "") -> bool:
         """
@@ -163,38 +442,159 @@ class Inventory:
 
         item = self._find_item_by_name(name)
         if not item:
-            print(f"❌ Item '{name}' not found in inventory")
+            self._emit("item_not_found", "error", f"❌ Item '{name}' not found in inventory", name=name)
             return False
 
         if quantity_sold > item.quantity:
-            print(f"❌ Not enough stock available. Current stock: {item.quantity}")
+            self._emit("insufficient_stock", "error",
+                       f"❌ Not enough stock available. Current stock: {item.quantity}",
+                       name=item.name, available=item.quantity, requested=quantity_sold)
             return False
 
-        # Update inventory
+        # Update inventory and revenue
         new_quantity = item.quantity - quantity_sold
-        item.update_quantity(new_quantity)
-        
-        # Calculate sale amount
-        sale_amount = Decimal(str(quantity_sold)) * Decimal(str(item.price_per_unit))
-        self._total_revenue += sale_amount
+        sale_amount = to_decimal(quantity_sold) * item.price
+        with self._state_lock:
+            self._untrack_item(item)
+            item.update_quantity(new_quantity)
+            self._track_item(item)
+            self._total_revenue += sale_amount
 
         # Log the transaction
         self._log_transaction(
             type="sale",
             produce_name=name,
             quantity=quantity_sold,
-            price=Decimal(str(item.price_per_unit)),
-            note=customer_note
+            price=item.price,
+            note=customer_note,
+            item=item
         )
 
-        print(f"✅ Sale recorded: {quantity_sold} {item.name} sold for ${sale_amount:.2f}")
+        self._emit("sale_recorded", "success",
+                   f"✅ Sale recorded: {quantity_sold} {item.name} sold for ${sale_amount:.2f}",
+                   name=item.name, quantity=quantity_sold, amount=sale_amount)
         
         # Check for low stock
-        if new_quantity <= 10:  # Default threshold
-            print(f"⚠️ Low stock alert: {item.name} has only {new_quantity} units left")
+        if self._low_stock.is_low(item):
+            self._emit("low_stock", "warning",
+                       f"⚠️ Low stock alert: {item.name} has only {new_quantity} units left",
+                       name=item.name, quantity=new_quantity,
+                       threshold=self._low_stock.threshold_for(item))
         
         return True
 
+    def record_sales_bulk(self, rows: Iterable[Tuple], atomic: bool = True) -> Dict:
+        """
+        Record a batch of sales, e.g. a point-of-sale export at market close.
+
+        Every row is validated against the stock left after the rows before
+        it. With `atomic=True` the batch is applied only if every row is
+        valid; otherwise valid rows are applied and invalid ones skipped.
+        All transactions share one timestamp and are logged in one pass.
+        Nothing is printed; the outcome is returned instead.
+
+        Args:
+            rows: Iterable of (name, quantity) or (name, quantity, note) rows
+            atomic: Apply all rows or none
+
+        Returns:
+            Dict with "applied" (bool), "total_amount" (Decimal),
+            "low_stock" (names of sold items now at or below their low-stock
+            threshold) and
+            "rows": one dict per input row with "row", "name", "quantity",
+            "ok", "error", "amount" and "remaining"
+        """
+        rows = [tuple(row) if isinstance(row, (tuple, list)) else (row,) for row in rows]
+        with self._items_locked(row[0] for row in rows if row and isinstance(row[0], str)):
+            return self._record_sales_bulk(rows, atomic)
+
+    def _record_sales_bulk(self, rows: List[Tuple], atomic: bool) -> Dict:
+        """Validate and apply bulk sales; the caller holds the items' lock stripes."""
+        results = []
+        accepted = []
+        reserved: Dict[str, int] = {}
+
+        for index, row in enumerate(rows):
+            name, quantity, note = (row + ("",))[:3] if len(row) in (2, 3) else (None, None, "")
+            result = {"row": index, "name": name, "quantity": quantity,
+                      "ok": False, "error": None, "amount": None, "remaining": None}
+            results.append(result)
+
+            if len(row) not in (2, 3):
+                result["error"] = "Row must be (name, quantity) or (name, quantity, note)"
+                continue
+            if not isinstance(name, str) or not isinstance(note, str):
+                result["error"] = "Item name and note must be text"
+                continue
+            if not isinstance(quantity, (int, float)) or quantity <= 0:
+                result["error"] = "Quantity sold must be positive"
+                continue
+            item = self._find_item_by_name(name)
+            if not item:
+                result["error"] = f"Item '{name}' not found in inventory"
+                continue
+            key = self._normalize_name(name)
+            available = item.quantity - reserved.get(key, 0)
+            if quantity > available:
+                result["error"] = f"Not enough stock available. Current stock: {available}"
+                continue
+            reserved[key] = reserved.get(key, 0) + quantity
+            accepted.append((result, item, quantity, note))
+
+        total_amount = ZERO
+        if atomic and len(accepted) != len(results):
+            return {"applied": False, "total_amount": total_amount, "low_stock": [], "rows": results}
+
+        # Build every transaction before touching stock, so a row that
+        # still fails leaves nothing half applied
+        timestamp = datetime.now().isoformat()
+        sales = []
+        for result, item, quantity, note in accepted:
+            try:
+                txn = Transaction("sale", result["name"], quantity, float(item.price), note, timestamp)
+            except ValueError as e:
+                result["error"] = str(e)
+                if atomic:
+                    return {"applied": False, "total_amount": total_amount, "low_stock": [], "rows": results}
+                continue
+            sales.append((result, item, quantity, txn))
+
+        txns = []
+        journal_entries = []
+        sold_items = {}
+        for result, item, quantity, txn in sales:
+            amount = to_decimal(quantity) * item.price
+            with self._state_lock:
+                self._untrack_item(item)
+                item.update_quantity(item.quantity - quantity)
+                self._track_item(item)
+                self._total_revenue += amount
+            total_amount += amount
+
+            txns.append(txn)
+            if self._storage is not None:
+                journal_entries.append((txn.to_dict(), item.to_dict()))
+            sold_items[id(item)] = item
+
+            result.update(ok=True, amount=amount, remaining=item.quantity)
+
+        with self._log_lock:
+            self._transactions.extend(txns)
+            self._change_count += len(txns)
+            if self._sales_stats is not None:
+                for txn in txns:
+                    self._track_sale(txn)
+            if journal_entries:
+                self._journal_sequence = self._storage.append_batch(journal_entries)
+
+        return {
+            "applied": bool(txns),
+            "total_amount": total_amount,
+            "low_stock": [item.name for item in sold_items.values() if self._low_stock.is_low(item)],
+            "rows": results
+        }
+
+    @_locks_item
     def adjust_item(self, name: str, quantity_change: int, note: str = "") -> bool:
         """
         Adjust item quantity (for spoilage, damage, etc.).
@@ -209,64 +609,283 @@ class Inventory:
         """
         item = self._find_item_by_name(name)
         if not item:
-            print(f"❌ Item '{name}' not found in inventory")
+            self._emit("item_not_found", "error", f"❌ Item '{name}' not found in inventory", name=name)
             return False
 
         new_quantity = item.quantity + quantity_change
 
         if new_quantity < 0:
-            print(f"❌ Adjustment would result in negative stock. Current: {item.quantity}")
+            self._emit("invalid_adjustment", "error",
+                       f"❌ Adjustment would result in negative stock. Current: {item.quantity}",
+                       name=item.name, available=item.quantity, change=quantity_change)
             return False
 
-        item.update_quantity(new_quantity)
+        with self._state_lock:
+            self._untrack_item(item)
+            item.update_quantity(new_quantity)
+            self._track_item(item)
 
         self._log_transaction(
             type="adjustment",
             produce_name=item.name,
             quantity=abs(quantity_change),
-            price=Decimal(str(item.price_per_unit)),
-            note=note or ("Stock increase" if quantity_change > 0 else "Stock decrease")
+            price=item.price,
+            note=note or ("Stock increase" if quantity_change > 0 else "Stock decrease"),
+            item=item
         )
 
         adjustment_type = "increased" if quantity_change > 0 else "decreased"
-        print(f"✅ Adjustment complete: {item.name} {adjustment_type} by {abs(quantity_change)} units. New quantity: {new_quantity}")
+        self._emit("item_adjusted", "success",
+                   f"✅ Adjustment complete: {item.name} {adjustment_type} by {abs(quantity_change)} units. New quantity: {new_quantity}",
+                   name=item.name, change=quantity_change, quantity=new_quantity)
         return True
 
+    def get_categories(self) -> Dict[str, int]:
+        """
+        Get the number of items in each category.
+
+        Returns:
+            Dict of category name -> item count, sorted by category name
+        """
+        with self._state_lock:
+            return {category: stats["items"] for category, stats in sorted(self._category_stats.items())}
+
+    def get_category_stats(self, category: str) -> Optional[Dict]:
+        """
+        Get the item count and stock value of a category, ignoring case.
+
+        Args:
+            category: Category name
+
+        Returns:
+            Dict with "items" and "total_value" (Decimal), or None if no
+            item is in the category
+        """
+        with self._state_lock:
+            items = self._items_by_category.get(self._normalize_category(category))
+            if not items:
+                return None
+            # Usually one spelling; more only if items differ in case
+            spellings = {item.category for item in items}
+            return {
+                "items": len(items),
+                "total_value": sum((self._category_stats[name]["total_value"] for name in spellings), ZERO)
+            }
+
     def get_total_revenue(self) -> Decimal:
         """Get total revenue from all sales."""
         return self._total_revenue
 
-    def check_low_stock(self, threshold: int = 10) -> List[ProduceItem]:
+    def check_low_stock(self, threshold: Optional[int] = None) -> List[ProduceItem]:
         """
         Get list of items with low stock.
+
+        Only the low items are visited, not the whole catalogue.
         
         Args:
-            threshold: Stock level threshold
+            threshold: Stock level threshold; by default each item's own
+                (see `set_low_stock_threshold`)
             
         Returns:
-            List of items with stock <= threshold
+            List of items with stock <= threshold, lowest stock first
+        """
+        with self._state_lock:
+            if threshold is None:
+                return self._low_stock.low_items()
+            return self._low_stock.items_at_or_below(threshold)
+
+    def get_low_stock_threshold(self, name: str) -> Optional[int]:
+        """Get the low-stock threshold that applies to an item, or None if it is not found."""
+        item = self._find_item_by_name(name)
+        if item is None:
+            return None
+        with self._state_lock:
+            return self._low_stock.threshold_for(item)
+
+    def set_low_stock_threshold(self, threshold: Optional[int], name: Optional[str] = None,
+                                category: Optional[str] = None) -> None:
+        """
+        Set the default low-stock threshold, or one for an item or category.
+
+        An item's own threshold wins over its category's, which wins over
+        the default (initially 10). Subscribers are notified of items the
+        change moves across their threshold.
+
+        Args:
+            threshold: Stock level at or below which items are low; None
+                removes an item's or category's own threshold
+            name: Item to set the threshold for
+            category: Category to set the threshold for
+
+        Raises:
+            InventoryError: If the threshold is negative, or None for the default
+        """
+        if threshold is None and name is None and category is None:
+            raise InventoryError("Default low stock threshold is required")
+        if threshold is not None and threshold < 0:
+            raise InventoryError("Low stock threshold cannot be negative")
+
+        with self._state_lock:
+            self._low_stock.set_threshold(threshold, name=name, category=category)
+            if name is not None:
+                item = self._find_item_by_name(name)
+                affected = [item] if item else []
+            elif category is not None:
+                affected = self._items_by_category.get(self._normalize_category(category), [])
+            else:
+                affected = self.produces
+            for item in list(affected):
+                self._low_stock.update(item)
+
+    def subscribe_low_stock(self, callback: Callable[[Dict], None]) -> None:
+        """
+        Call `callback` whenever an item crosses its low-stock threshold.
+
+        The callback receives a dict with "name", "category", "quantity",
+        "threshold" and "low" (True when the item dropped to or below its
+        threshold, False when it was restocked above it). It runs while
+        the inventory is being updated, so it must not modify it.
         """
-        return [item for item in self.produces if item.quantity <= threshold]
+        self._low_stock.subscribe(callback)
+
+    def unsubscribe_low_stock(self, callback: Callable[[Dict], None]) -> None:
+        """Stop calling a callback passed to `subscribe_low_stock`."""
+        self._low_stock.unsubscribe(callback)
+
+    def _is_low(self, item: ProduceItem, threshold: Optional[int] = None) -> bool:
+        """Check an item against a threshold, or its own one."""
+        if threshold is None:
+            return self._low_stock.is_low(item)
+        return item.quantity <= threshold
 
     def get_transaction_history(self) -> List['Transaction']:
         """Get all transactions."""
-        return self.transactions.copy()
+        with self._log_lock:
+            return self.transactions.copy()
+
+    def get_transactions_page(self, limit: int = 20, offset: int = 0, after: Optional[int] = None,
+                              transaction_type: Optional[str] = None,
+                              start: Optional[date] = None, end: Optional[date] = None) -> Dict:
+        """
+        Get one page of transactions, newest first, without copying the log.
+
+        Pages are addressed by cursor: pass a page's "next_cursor" as
+        `after` to get the page that follows it. Cursors point at logged
+        rows, so transactions recorded meanwhile do not shift later pages.
+        The query goes through the storage backend's indexes if it has them.
+
+        Args:
+            limit: Maximum number of transactions on the page
+            offset: Number of matching transactions to skip (after the cursor)
+            after: Cursor returned with the previous page; None starts at
+                the newest transaction
+            transaction_type: Only include transactions of this type
+            start: Only include transactions on or after this date
+            end: Only include transactions on or before this date
+
+        Returns:
+            Dict with "transactions" (the page, newest first) and
+            "next_cursor" (None on the last page)
+
+        Raises:
+            InventoryError: If the limit is not positive or the offset is negative
+        """
+        if limit < 1:
+            raise InventoryError("Page limit must be at least 1")
+        if offset < 0:
+            raise InventoryError("Page offset cannot be negative")
+        start_micros = None if start is None else to_micros(datetime.combine(start, time.min))
+        end_micros = None if end is None else to_micros(datetime.combine(end + timedelta(days=1), time.min))
+
+        with self._log_lock:
+            rows = self._storage.transactions_page(
+                limit + 1, after, offset, transaction_type, start_micros, end_micros
+            ) if self._storage else None
+            if rows is None:
+                transactions, next_cursor = self.transactions.page(
+                    limit, after, offset, type=transaction_type,
+                    start_micros=start_micros, end_micros=end_micros
+                )
+                return {"transactions": transactions, "next_cursor": next_cursor}
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return {
+            "transactions": [Transaction.from_trusted(**row) for _, row in rows[:limit]],
+            "next_cursor": next_cursor
+        }
 
     def filter_transactions_by_type(self, transaction_type: str) -> List['Transaction']:
-        """Filter transactions by type."""
-        return [tx for tx in self.transactions 
-                if tx.type.lower() == transaction_type.lower()]
+        """Filter transactions by type, through the storage backend's index if it has one."""
+        with self._log_lock:
+            rows = self._storage.transactions_by_type(transaction_type) if self._storage else None
+            if rows is None:
+                return self.transactions.select_type(transaction_type)
+        return [Transaction.from_trusted(**row) for row in rows]
 
     def filter_transactions_by_date(self, start: date, end: date) -> List['Transaction']:
-        """Filter transactions by date range."""
-        results = []
-        for txn in self.transactions:
-            txn_datetime = datetime.fromisoformat(txn.timestamp)
-            txn_date = txn_datetime.date()
+        """Filter transactions by date range, through the storage backend's index if it has one."""
+        start_micros = to_micros(datetime.combine(start, time.min))
+        end_micros = to_micros(datetime.combine(end + timedelta(days=1), time.min))
+        with self._log_lock:
+            rows = self._storage.transactions_between(start_micros, end_micros) if self._storage else None
+            if rows is None:
+                return self.transactions.select_between(start_micros, end_micros)
+        return [Transaction.from_trusted(**row) for row in rows]
+
+    def get_item_history(self, name: str) -> List['Transaction']:
+        """
+        Get every transaction logged for an item, in log order.
+
+        Only the item's own rows are read, through the storage backend's
+        name index if it has one and a per-item index of the log otherwise.
+        Names match ignoring case and surrounding whitespace, like item
+        lookups, and the history of a removed item (ending with its
+        removal) stays available.
+        """
+        with self._log_lock:
+            rows = self._storage.transactions_for_item(name) if self._storage else None
+            if rows is None:
+                return self.transactions.item_history(name)
+        return [Transaction.from_trusted(**row) for row in rows]
+
+    def get_item_stats(self, name: str, days: int = 30) -> Optional[Dict]:
+        """
+        Get sales figures for one item, computed from its own transactions.
+
+        Args:
+            name: Item name, matched ignoring case and surrounding whitespace
+            days: Number of days back the sales velocity is measured over
+
+        Returns:
+            Dict with "name", "in_stock" (False once the item is removed),
+            "transactions", "sales", "units_sold", "revenue" (Decimal),
+            "sales_velocity" (units sold per day over the last `days` days)
+            and "last_sale", or None if no transaction names the item
+
+        Raises:
+            InventoryError: If days is less than 1
+        """
+        if days < 1:
+            raise InventoryError("Velocity window must be at least 1 day")
 
-            if start <= txn_date <= end:
-                results.append(txn)
-        return results
+        item = self._find_item_by_name(name)
+        since = to_micros(datetime.now() - timedelta(days=days))
+        with self._log_lock:
+            rows = self._storage.transactions_for_item(name) if self._storage else None
+            if rows is None:
+                summary = self.transactions.item_sales_summary(name, since)
+        if rows is not None:
+            item_log = TransactionStore()
+            item_log.extend_dicts(rows)
+            summary = item_log.item_sales_summary(name, since)
+        if not summary["transactions"]:
+            return None
+        recent_units = summary.pop("recent_units")
+        return {
+            "name": item.name if item else name.strip(),
+            "in_stock": item is not None,
+            **summary,
+            "sales_velocity": recent_units / days
+        }
 
     def get_inventory_value(self) -> Tuple[Decimal, List[Dict]]:
         """
@@ -275,243 +894,493 @@ class Inventory:
         Returns:
             Tuple of (total_value, breakdown_list)
         """
-        total_value = Decimal('0.00')
         breakdown = []
         
-        for item in self.produces:
-            item_value = Decimal(str(item.quantity)) * Decimal(str(item.price_per_unit))
-            total_value += item_value
-            breakdown.append({
-                "name": item.name,
-                "quantity": item.quantity,
-                "price": float(item.price_per_unit),
-                "value": float(item_value),
-                "category": item.category
-            })
-
-        return total_value, breakdown
+        with self._state_lock:
+            for item in self.produces:
+                item_value = self._item_value(item)
+                breakdown.append({
+                    "name": item.name,
+                    "quantity": item.quantity,
+                    "price": float(item.price_per_unit),
+                    "value": float(item_value),
+                    "category": item.category
+                })
+
+            return self._stock_value, breakdown
 
     def get_inventory_report(self) -> Dict:
         """Generate comprehensive inventory report."""
-        total_value, breakdown = self.get_inventory_value()
-        low_stock_items = self.check_low_stock()
-        
-        # Category breakdown
-        categories = {}
+        with self._state_lock, self._log_lock:
+            return {
+                "total_items": len(self.produces),
+                "total_value": float(self._stock_value),
+                "total_revenue": float(self._total_revenue),
+                "low_stock_items": self._low_stock.low_count,
+                "categories": {k: {"items": v["items"], "total_value": float(v["total_value"])} 
+                             for k, v in self._category_stats.items()},
+                # (now - timestamp).days <= 7, i.e. newer than 8 days ago
+                "recent_transactions": self.transactions.count_after(
+                    to_micros(datetime.now() - timedelta(days=8)))
+            }
+
+    @staticmethod
+    def _item_value(item: ProduceItem) -> Decimal:
+        """Get the stock value of an item."""
+        return item.stock_value
+
+    def _track_item(self, item: ProduceItem, sign: int = 1) -> None:
+        """Add an item's current state to the running aggregates and the low-stock tracker."""
+        self._add_to_rollups(item, sign)
+        if sign > 0:
+            self._low_stock.update(item)
+            self._dirty_items.add(item)
+
+    def _add_to_rollups(self, item: ProduceItem, sign: int = 1) -> None:
+        """Add (or with sign=-1 remove) an item's value to the stock and category totals."""
+        value = self._item_value(item)
+        self._stock_value += sign * value
+        stats = self._category_stats.get(item.category)
+        if stats is None:
+            stats = self._category_stats[item.category] = {"items": 0, "total_value": ZERO}
+        stats["items"] += sign
+        stats["total_value"] += sign * value
+        if not stats["items"]:
+            del self._category_stats[item.category]
+
+    def _untrack_item(self, item: ProduceItem) -> None:
+        """Remove an item's current state from the running aggregates."""
+        self._track_item(item, sign=-1)
+
+    def _rebuild_item_stats(self) -> None:
+        """Recompute the item aggregates and the category index from self.produces."""
+        self._stock_value = ZERO
+        self._category_stats = {}
+        self._items_by_category = {}
         for item in self.produces:
-            cat = item.category
-            if cat not in categories:
-                categories[cat] = {"items": 0, "total_value": Decimal('0.00')}
-            categories[cat]["items"] += 1
-            categories[cat]["total_value"] += Decimal(str(item.quantity)) * Decimal(str(item.price_per_unit))
+            self._add_to_rollups(item)
+            self._index_category(item)
+        self._low_stock.rebuild(self.produces)
 
-        return {
-            "total_items": len(self.produces),
-            "total_value": float(total_value),
-            "total_revenue": float(self._total_revenue),
-            "low_stock_items": len(low_stock_items),
-            "categories": {k: {"items": v["items"], "total_value": float(v["total_value"])} 
-                         for k, v in categories.items()},
-            "recent_transactions": len([tx for tx in self.transactions 
-                                     if (datetime.now() - datetime.fromisoformat(tx.timestamp)).days <= 7])
-        }
+    @staticmethod
+    def _normalize_category(category: str) -> str:
+        """Normalize a category into its index key."""
+        return category.lower()
+
+    def _index_category(self, item: ProduceItem) -> None:
+        """Add an item to the category index."""
+        self._items_by_category.setdefault(self._normalize_category(item.category), []).append(item)
+
+    def _unindex_category(self, item: ProduceItem) -> None:
+        """Remove an item from the category index."""
+        key = self._normalize_category(item.category)
+        items = self._items_by_category[key]
+        items.remove(item)
+        if not items:
+            del self._items_by_category[key]
+
+    def _get_sales_stats(self) -> Dict:
+        """Get the sale aggregates, computing them from history on first use."""
+        if self._sales_stats is None:
+            units, revenue, last_sale = self.transactions.sales_summary(workers=self.report_workers)
+            most_sold = units.most_common(1)
+            most_profitable = sorted(revenue.items(), key=lambda x: x[1], reverse=True)
+            self._sales_stats = {
+                "units": units,
+                "revenue": revenue,
+                "total_revenue": sum(revenue.values()),
+                "last_sale": last_sale,
+                # First-sale order breaks ties between equally ranked items
+                "rank": {name: rank for rank, name in enumerate(units)},
+                "top_selling": most_sold[0][0] if most_sold else None,
+                "top_revenue": most_profitable[0][0] if most_profitable else None
+            }
+        return self._sales_stats
+
+    def _track_sale(self, txn: Transaction) -> None:
+        """Fold a newly logged sale into the sale aggregates."""
+        stats = self._sales_stats
+        name = txn.produce_name
+        rank = stats["rank"].setdefault(name, len(stats["rank"]))
+        stats["units"][name] += int(txn.quantity)
+        amount = txn.total_amount
+        stats["revenue"][name] += amount
+        stats["total_revenue"] += amount
+        if not stats["last_sale"] or txn.timestamp > stats["last_sale"]:
+            stats["last_sale"] = txn.timestamp
+
+        for key, totals in (("top_selling", stats["units"]), ("top_revenue", stats["revenue"])):
+            top = stats[key]
+            if top is None or totals[name] > totals[top] or (
+                    totals[name] == totals[top] and rank < stats["rank"][top]):
+                stats[key] = name
+
+    @staticmethod
+    def _normalize_name(name: str) -> str:
+        """Normalize an item name into its lookup key."""
+        return TransactionStore.name_key(name)
 
     def _find_item_by_name(self, name: str) -> Optional[ProduceItem]:
         """Find item by name (case-insensitive)."""
-        name_lower = name.lower().strip()
+        return self._items_by_name.get(self._normalize_name(name))
+
+    def _rebuild_name_index(self) -> None:
+        """Rebuild the name index from self.produces."""
+        self._items_by_name = {}
         for item in self.produces:
-            if item.name.lower() == name_lower:
-                return item
-        return None
+            # First occurrence wins, matching the old linear scan
+            self._items_by_name.setdefault(self._normalize_name(item.name), item)
 
     def _log_transaction(self, type: str, produce_name: str, quantity: int, 
-                        price: Decimal, note: str = "") -> None:
-        """Log a transaction."""
+                        price: Decimal, note: str = "",
+                        item: Optional[ProduceItem] = None, removed: bool = False) -> None:
+        """
+        Log a transaction.
+
+        When a storage backend is attached, the transaction and the state
+        of the item it touched are written through to it as one mutation.
+
+        Args:
+            item: Item affected by the mutation being logged
+            removed: Whether the mutation removed the item
+        """
         txn = Transaction(type, produce_name, quantity, float(price), note)
-        self.transactions.append(txn)
+        with self._log_lock:
+            self._transactions.append(txn)
+            self._change_count += 1
+            if txn.type == "sale" and self._sales_stats is not None:
+                self._track_sale(txn)
+
+            if self._storage is not None:
+                if removed:
+                    self._journal_sequence = self._storage.append(txn.to_dict(), removed=item.name)
+                else:
+                    self._journal_sequence = self._storage.append(
+                        txn.to_dict(), item=item.to_dict() if item else None)
+
+    def _apply_journal_record(self, record: Dict) -> None:
+        """Replay one journal record on top of the loaded snapshot."""
+        if "removed" in record:
+            item = self._find_item_by_name(record["removed"])
+            if item:
+                self.produces.remove(item)
+                del self._items_by_name[self._normalize_name(item.name)]
+        elif "item" in record:
+            state = ProduceItem.from_dict(record["item"])
+            item = self._find_item_by_name(state.name)
+            if item:
+                item.quantity = state.quantity
+                item.price_per_unit = state.price_per_unit
+                item.category = state.category
+                item.unit_of_measurement = state.unit_of_measurement
+            else:
+                self.produces.append(state)
+                self._items_by_name[self._normalize_name(state.name)] = state
+
+        txn = Transaction.from_dict(record["txn"])
+        self._transactions.append(txn)
+        if txn.type == "sale":
+            self._total_revenue += txn.total_amount
+        self._journal_sequence = record["seq"]
+
+    @_locks_all
+    def enable_journal(self, path: str, checkpoint_interval: int = 1000) -> bool:
+        """
+        Load inventory from a snapshot and journal all further mutations.
+
+        Every mutation then appends one record to `<path>.journal`, so saving
+        to `path` only has to sync the journal. A full snapshot is written
+        once `checkpoint_interval` records have accumulated.
+
+        Args:
+            path: Snapshot file path
+            checkpoint_interval: Journal records between checkpoints
+
+        Returns:
+            bool: True if an existing snapshot or journal was loaded
+        """
+        self.close_storage()
+        loaded = self.load_from_file(path)
+        self._storage = TransactionJournal(
+            TransactionJournal.path_for(path),
+            sequence=self._journal_sequence,
+            checkpoint_interval=checkpoint_interval
+        )
+        self._storage_path = path
+        if not loaded and (self.produces or self._transactions or self._pending_history):
+            # Unsaved in-memory state must be covered by a snapshot first
+            self.checkpoint()
+        return loaded
+
+    def disable_journal(self) -> None:
+        """Close the journal; later saves go back to full snapshots."""
+        self.close_storage()
+
+    def open_database(self, path: str) -> bool:
+        """
+        Load inventory from a SQLite database and write all further mutations to it.
+
+        Args:
+            path: Database file path (created if missing)
+
+        Returns:
+            bool: True if an existing database was loaded
+        """
+        try:
+            storage = SQLiteStorage(path)
+        except Exception as e:
+            self._emit("load_failed", "error", f"❌ Failed to load inventory: {e}", path=path)
+            return False
+        return self.attach_storage(storage)
+
+    @_locks_all
+    def attach_storage(self, storage: DatabaseBackend) -> bool:
+        """
+        Load inventory from a database backend and write all further mutations to it.
+
+        Items and totals are read up front, while transaction history stays
+        in the database until `transactions` is first accessed; the
+        transaction filters are answered by the backend's indexed queries.
+        An empty backend is instead filled with the current in-memory state.
+        Saving to the backend's path afterwards only has to sync it.
+
+        Args:
+            storage: Backend to load from and write through to
+
+        Returns:
+            bool: True if existing data was loaded from the backend
+        """
+        self.close_storage()
+        try:
+            if storage.is_empty():
+                storage.replace_all([item.to_dict() for item in self.produces],
+                                    str(self._total_revenue), self.transactions.iter_dicts())
+                loaded = False
+            else:
+                self._load_from_database(storage)
+                loaded = True
+        except Exception as e:
+            storage.close()
+            self._emit("load_failed", "error", f"❌ Failed to load inventory: {e}", path=storage.path)
+            return False
+
+        self._storage = storage
+        self._storage_path = storage.path
+        if loaded:
+            self._emit("loaded", "success", f"✅ Inventory loaded from {storage.path}",
+                       path=storage.path, replayed=0)
+        return loaded
+
+    @_locks_all
+    def close_storage(self) -> None:
+        """Close the attached storage backend, if any; later saves write JSON snapshots."""
+        if self._storage is not None:
+            self._storage.close()
+            self._storage = None
+            self._storage_path = None
 
-    def export_inventory_to_csv(self, filepath: str):
+    def _load_from_database(self, storage: DatabaseBackend) -> None:
+        """Replace in-memory state with a database backend's, deferring its history."""
+        self.produces = [ProduceItem.from_dict(item) for item in storage.load_items()]
+        self._rebuild_name_index()
+        self._total_revenue = Decimal(storage.load_total_revenue())
+        self.transactions = TransactionStore()
+        self._pending_history = storage.history()
+        self._rebuild_item_stats()
+        self._dirty_items = set()
+        self._item_fragments = {}
+        self._mark_saved(None, self._change_count)
+
+    @_locks_all
+    def checkpoint(self) -> bool:
+        """
+        Write a full snapshot and truncate the journal.
+
+        Returns:
+            bool: True if the checkpoint was written
+        """
+        if not isinstance(self._storage, TransactionJournal):
+            raise InventoryError("Journaling is not enabled")
+        self._storage.sync()
+        saved_file = self._write_snapshot(self._storage_path, *self._snapshot_state())
+        if saved_file is None:
+            return False
+        self._storage.truncate()
+        self._mark_saved(saved_file, self._change_count)
+        return True
+
+    # Fixed CSV schemas, one per export type
+    INVENTORY_CSV_FIELDS = ("category", "name", "price_per_unit", "quantity",
+                            "total_value", "unit_of_measurement")
+    TRANSACTION_CSV_FIELDS = ("formatted_date", "note", "produce_name", "quantity",
+                              "timestamp", "total_amount", "type", "unit_price")
+    REPORT_CSV_FIELDS = ("category", "item_name", "price_per_unit", "quantity",
+                         "stock_status", "total_value")
+    CSV_CHUNK_ROWS = 10000
+
+    def export_inventory_to_csv(self, filepath: str, compress: bool = False) -> bool:
         """
         Export inventory data to CSV file.
         
         Args:
             filepath: Path to save the CSV file
+            compress: Gzip the output (implied by a ".gz" filepath)
             
         Returns:
             bool: True if export was successful
         """
         if not self.produces:
-            print("❌ No inventory data to export")
+            self._emit("export_empty", "error", "❌ No inventory data to export")
             return False
         try:
-            data = []
-            for produce in self.produces:
-                produce_dict = produce.to_dict()
-                produce_dict['total_value'] = float(
-                        Decimal(str(produce_dict['quantity'])) * Decimal(str(produce_dict['price_per_unit'])))
-                data.append(produce_dict)
-            success = self._export_to_csv(data, filepath)
+            rows = ((item.category, item.name, item.price_per_unit, item.quantity,
+                     float(self._item_value(item)), item.unit_of_measurement)
+                    for item in self.produces)
+            success = self._export_to_csv(rows, self.INVENTORY_CSV_FIELDS, filepath, compress)
             if success:
-                print(f"✅ Inventory exported to {filepath}")
+                self._emit("exported", "success", f"✅ Inventory exported to {filepath}", path=filepath)
             return success
         except Exception as e:
-            print(f"❌ Failed to export inventory: {e}")
+            self._emit("export_failed", "error", f"❌ Failed to export inventory: {e}", path=filepath)
             return False
 
-    def export_transactions_to_csv(self, filepath: str):
+    def export_transactions_to_csv(self, filepath: str, compress: bool = False) -> bool:
         """
         Export transaction history to CSV file.
+
+        Rows are streamed from the transaction store, so memory use does
+        not grow with the size of the history.
         
         Args:
             filepath: Path to save the CSV file
+            compress: Gzip the output (implied by a ".gz" filepath)
             
         Returns:
             bool: True if export was successful
         """
         if not self.produces:
-            print("❌ No transaction data to export")
+            self._emit("export_empty", "error", "❌ No transaction data to export")
             return False
         try:
-            data = []
-            for txn in self.transactions:
-                txn_dict = txn.to_dict()
-                txn_dict['total_amount'] = float(txn.total_amount)
-                txn_dict['formatted_date'] = datetime.fromisoformat(txn.timestamp).strftime('%Y-%m-%d %H:%M:%S')
-                data.append(txn_dict)
-            success = self._export_to_csv(data, filepath)
+            success = self._export_to_csv(self._transaction_csv_rows(),
+                                          self.TRANSACTION_CSV_FIELDS, filepath, compress)
             if success:
-                print(f"✅ Transactions exported to {filepath}")
+                self._emit("exported", "success", f"✅ Transactions exported to {filepath}", path=filepath)
             return success
         except Exception as e:
-            print(f"❌ Failed to export transactions: {e}")
+            self._emit("export_failed", "error", f"❌ Failed to export transactions: {e}", path=filepath)
             return False
 
-    def export_full_report_to_csv(self, filepath: str) -> bool:
+    def _transaction_csv_rows(self) -> Iterator[Tuple]:
+        """Yield transaction rows in TRANSACTION_CSV_FIELDS order."""
+        for txn in self.transactions.iter_dicts():
+            timestamp = txn["timestamp"]
+            if len(timestamp) >= 19 and timestamp[10] in "T " and timestamp[13] == timestamp[16] == ":":
+                formatted_date = f"{timestamp[:10]} {timestamp[11:19]}"
+            else:
+                formatted_date = datetime.fromisoformat(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+            total_amount = float(to_decimal(txn["quantity"]) * to_decimal(txn["unit_price"]))
+            yield (formatted_date, txn["note"], txn["produce_name"], txn["quantity"],
+                   timestamp, total_amount, txn["type"], txn["unit_price"])
+
+    def export_full_report_to_csv(self, filepath: str, compress: bool = False) -> bool:
         """
         Export a comprehensive report to CSV file.
         
         Args:
             filepath: Path to save the CSV file
+            compress: Gzip the output (implied by a ".gz" filepath)
             
         Returns:
             bool: True if export was successful
         """
         try:
             report = self.get_inventory_report()
-            total_value, breakdown = self.get_inventory_value()
-            
-            data = []
-            for item in breakdown:
-                # Combine inventory and report data
-                item_data = {
-                    'item_name': item['name'],
-                    'quantity': item['quantity'],
-                    'price_per_unit': item['price'],
-                    'total_value': item['value'],
-                    'category': item['category'],
-                    'stock_status': 'Low Stock' if item['quantity'] <= 10 else 'Normal'
-                }
-                data.append(item_data)
-            
-            # Add summary row
-            summary_row = {
-                'item_name': 'SUMMARY',
-                'quantity': report['total_items'],
-                'price_per_unit': 0,
-                'total_value': report['total_value'],
-                'category': f"Total Revenue: ${report['total_revenue']:.2f}",
-                'stock_status': f"Low Stock Items: {report['low_stock_items']}"
-            }
-            data.append(summary_row)
-            
-            success = self._export_to_csv(data, filepath)
+
+            def rows():
+                for item in self.produces:
+                    # Combine inventory and report data
+                    yield (item.category, item.name, float(item.price_per_unit), item.quantity,
+                           'Low Stock' if self._low_stock.is_low(item) else 'Normal',
+                           float(self._item_value(item)))
+                # Summary row
+                yield (f"Total Revenue: ${report['total_revenue']:.2f}", 'SUMMARY', 0,
+                       report['total_items'], f"Low Stock Items: {report['low_stock_items']}",
+                       report['total_value'])
+
+            success = self._export_to_csv(rows(), self.REPORT_CSV_FIELDS, filepath, compress)
             if success:
-                print(f"✅ Full report exported to {filepath}")
+                self._emit("exported", "success", f"✅ Full report exported to {filepath}", path=filepath)
             return success
             
         except Exception as e:
-            print(f"❌ Failed to export report: {e}")
+            self._emit("export_failed", "error", f"❌ Failed to export report: {e}", path=filepath)
             return False
 
-    def _export_to_csv(self, data: List[Dict], filepath: str) -> bool:
+    def _export_to_csv(self, rows: Iterable[Tuple], fieldnames: Tuple[str, ...],
+                       filepath: str, compress: bool = False) -> bool:
         """
-        Export data to CSV file using Python's built-in csv module.
+        Stream rows to a CSV file using Python's built-in csv module.
+
+        Rows are pulled from the iterable and written in chunks of
+        CSV_CHUNK_ROWS, so the full row set is never held in memory.
         
         Args:
-            data: List of dictionaries to export
+            rows: Row tuples in `fieldnames` order
+            fieldnames: Header row
             filepath: Path to save the CSV file
+            compress: Gzip the output (implied by a ".gz" filepath)
             
         Returns:
             bool: True if export was successful
         """
-        import csv
-        
-        if not data:
-            print("❌ No data to export")
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            self._emit("export_empty", "error", "❌ No data to export")
             return False
         
         try:
             # Ensure directory exists
-            os.makedirs(os.path.dirname(filepath), exist_ok=True)
-            
-            # Get all possible field names from the data
-            fieldnames = set()
-            for item in data:
-                fieldnames.update(item.keys())
-            fieldnames = sorted(list(fieldnames))
+            directory = os.path.dirname(filepath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            if compress or filepath.endswith(".gz"):
+                csvfile = gzip.open(filepath, 'wt', newline='', encoding='utf-8')
+            else:
+                csvfile = open(filepath, 'w', newline='', encoding='utf-8', buffering=1 << 20)
             
-            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(data)
+            with csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(fieldnames)
+                writer.writerow(first)
+                while True:
+                    chunk = list(islice(rows, self.CSV_CHUNK_ROWS))
+                    if not chunk:
+                        break
+                    writer.writerows(chunk)
             
             return True
             
         except Exception as e:
-            print(f"❌ CSV export failed: {e}")
+            self._emit("export_failed", "error", f"❌ CSV export failed: {e}", path=filepath)
             return False
 
     def generate_summary_insights(self):
-        total_inventory_value = Decimal("0.00")
-        low_stock_items = []
-        category_counts = defaultdict(int)
-        sales_counter = Counter()
-        revenue_per_item = defaultdict(Decimal)
-        last_transaction_time = None
-
-        for item in self.produces:
-            item_value = Decimal(item.quantity) * Decimal(item.price_per_unit)
-            total_inventory_value += item_value
-
-            if item.quantity < 5:
-                low_stock_items.append(item)
-
-            category_counts[item.category] += 1
-
-        for txn in self.transactions:
-            if txn.type.lower() == "sale":
-                sales_counter[txn.produce_name] += int(txn.quantity)
-                revenue_per_item[txn.produce_name] += Decimal(str(txn.unit_price)) * Decimal(str(txn.quantity))
+        with self._state_lock, self._log_lock:
+            sales = self._get_sales_stats()
 
-                if not last_transaction_time or txn.timestamp > last_transaction_time:
-                    last_transaction_time = txn.timestamp
-
-        most_sold = sales_counter.most_common(1)
-        top_item = most_sold[0][0] if most_sold else None
-
-        most_profitable = sorted(revenue_per_item.items(), key=lambda x: x[1], reverse=True)
-        top_revenue_item = most_profitable[0][0] if most_profitable else None
-
-        summary = {
-            "total_inventory_value": total_inventory_value,
-            "total_revenue": sum(revenue_per_item.values()),
-            "low_stock_count": len(low_stock_items),
-            "top_selling_item": top_item,
-            "top_revenue_item": top_revenue_item,
-            "last_transaction_time": last_transaction_time,
-            "category_breakdown": dict(category_counts),
-            "total_items": len(self.produces)
-        }
+            summary = {
+                "total_inventory_value": self._stock_value,
+                "total_revenue": sales["total_revenue"],
+                "low_stock_count": self._low_stock.low_count,
+                "top_selling_item": sales["top_selling"],
+                "top_revenue_item": sales["top_revenue"],
+                "last_transaction_time": sales["last_sale"],
+                "category_breakdown": {k: v["items"] for k, v in self._category_stats.items()},
+                "total_items": len(self.produces)
+            }
 
         return summary
 
@@ -520,7 +1389,17 @@ class Inventory:
 
     def save_to_file(self, path: str) -> bool:
         """
-        Save inventory data to JSON file.
+        Save inventory data to JSON file, or to a binary snapshot when
+        `path` ends in ".snap".
+
+        The file is replaced atomically: the snapshot is written to a
+        temporary file, fsynced and renamed over `path`, so a crash
+        mid-save leaves the previous save intact. Every lock is held only
+        while the state is copied, not while the file is written.
+
+        When journaling to `path`, this only syncs the journal, plus a
+        checkpoint if one is due; likewise saving to an attached database
+        only syncs it.
         
         Args:
             path: File path to save to
@@ -528,48 +1407,216 @@ class Inventory:
         Returns:
             bool: True if saved successfully
         """
-        data = {
-            "produces": [item.to_dict() for item in self.produces],
+        with self._save_lock:
+            with self._all_locks():
+                if self._storage is not None and path == self._storage_path:
+                    try:
+                        self._storage.sync()
+                        if self._storage.checkpoint_due() and not self.checkpoint():
+                            return False
+                        self._mark_saved(None, self._change_count)
+                        self._emit("saved", "success", f"✅ Inventory saved to {path}", path=path)
+                        return True
+                    except Exception as e:
+                        self._emit("save_failed", "error", f"❌ Failed to save inventory: {e}", path=path)
+                        return False
+
+                previous = self._saved_file
+                if previous is not None and not previous.is_intact():
+                    previous = None
+                binary = path.lower().endswith(BinarySnapshot.SUFFIXES)
+                compact = self.compact
+                if (previous is not None and previous.path == path and not self.is_dirty()
+                        and (binary or previous.compact == compact)):
+                    self._emit("save_skipped", "info", f"💾 No changes to save to {path}", path=path)
+                    return True
+
+                change_count = self._change_count
+                if binary:
+                    data, history = self._snapshot_state()
+                    history, items, previous = history.clone(), None, None
+                else:
+                    if compact != self._fragments_compact:
+                        self._item_fragments = {}
+                        self._fragments_compact = compact
+                    data = self._snapshot_header()
+                    items = [(item, self._item_fragments.get(item)) for item in self.produces]
+                    items = [(item, fragment if fragment is not None and item not in self._dirty_items
+                              else item.to_dict()) for item, fragment in items]
+                    self._dirty_items = set()
+                    unsaved = self.unsaved_changes
+                    if previous is not None and previous.reusable(compact) and unsaved <= len(self._transactions):
+                        # Only the newest rows are missing from the last save
+                        history = self._transactions.clone(len(self._transactions) - unsaved)
+                        pending = self._pending_history
+                        if isinstance(pending, DeferredArray) and pending.path == path:
+                            # The new file will hold the pending rows, then every row in memory
+                            self._pending_rewrite = len(self._transactions)
+                    else:
+                        history, previous = self.transactions.clone(), None
+
+            fragments = {}
+            if items is not None:
+                for item, entry in items:
+                    fragments[item] = entry if isinstance(entry, str) else JSONSnapshot.encode_item(entry, compact)
+                items = list(fragments.values())
+            saved_file = self._write_snapshot(path, data, history, items, previous, compact)
+            if self._pending_rewrite is not None:
+                with self._log_lock:
+                    if saved_file is not None and self._pending_history is pending:
+                        # Keep the pending history pointed at the rows it had
+                        self._pending_history = DeferredArray(
+                            path, saved_file.history_start - 1, skip_last=self._pending_rewrite)
+                    self._pending_rewrite = None
+            if saved_file is None:
+                # Items encoded for this save may have changed again meanwhile
+                self._item_fragments = {}
+                return False
+
+            # A full snapshot supersedes any journal left next to it
+            journal_path = TransactionJournal.path_for(path)
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+            self._item_fragments = fragments
+            self._mark_saved(saved_file, change_count)
+        self._emit("saved", "success", f"✅ Inventory saved to {path}", path=path)
+        return True
+
+    def _mark_saved(self, saved_file: Optional[SavedFile], change_count: int) -> None:
+        """Record that everything up to `change_count` is in `saved_file` (or its storage)."""
+        self._saved_file = saved_file
+        self._saved_change_count = change_count
+
+    def _snapshot_header(self) -> Dict:
+        """Get the top-level snapshot values written after the items."""
+        return {
             "total_revenue": str(self._total_revenue),
-            "transactions": [txn.to_dict() for txn in self.transactions],
+            "journal_sequence": self._journal_sequence,
             "last_updated": datetime.now().isoformat()
         }
 
+    def _snapshot_state(self) -> Tuple[Dict, TransactionStore]:
+        """Get the top-level snapshot data and the history; the caller holds every lock."""
+        data = {"produces": [item.to_dict() for item in self.produces]}
+        data.update(self._snapshot_header())
+        return data, self.transactions
+
+    def _write_snapshot(self, path: str, data: Dict, history: TransactionStore,
+                        items: Optional[List[str]] = None, previous: Optional[SavedFile] = None,
+                        compact: Optional[bool] = None) -> Optional[SavedFile]:
+        """
+        Atomically write a JSON or binary snapshot of the given state.
+
+        Args:
+            path: File path to write
+            data: Top-level values, including "produces" unless `items` is given
+            history: Transactions to write, or those added since `previous`
+            items: Items already encoded by JSONSnapshot.encode_item
+            previous: Earlier JSON save whose transactions are copied first
+            compact: Write JSON without indentation; self.compact by default
+
+        Returns:
+            SavedFile describing the written file, or None if writing failed
+        """
         try:
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(path, "w") as file:
-                json.dump(data, file, indent=2)
-            print(f"✅ Inventory saved to {path}")
-            return True
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if path.lower().endswith(BinarySnapshot.SUFFIXES):
+                BinarySnapshot.write(path, data, history)
+                return SavedFile(path)
+            compact = self.compact if compact is None else compact
+            if items is None:
+                data = dict(data)
+                items = [JSONSnapshot.encode_item(item, compact) for item in data.pop("produces")]
+            return JSONSnapshot.write(path, data, items, history, previous, compact)
         except Exception as e:
-            print(f"❌ Failed to save inventory: {e}")
-            return False
-      
+            self._emit("save_failed", "error", f"❌ Failed to save inventory: {e}", path=path)
+            return None
 
-    def load_from_file(self, path: str) -> bool:
+    @_locks_all
+    def load_from_file(self, path: str, lazy_history: bool = True) -> bool:
         """
-        Load inventory data from JSON file.
+        Load inventory data from JSON file or binary snapshot.
+
+        Binary snapshots are recognized by their header whatever the file
+        is called, and load in one pass over a memory map. JSON files are
+        streamed: items and totals are parsed up front, while the
+        transactions array is by default left on disk and only parsed the
+        first time `transactions` is accessed. Any journal records
+        newer than the snapshot are replayed on top. Loading the path of
+        an attached database reloads from the database instead.
         
         Args:
             path: File path to load from
+            lazy_history: Defer parsing transaction history until needed
             
         Returns:
             bool: True if loaded successfully
         """
-        if not os.path.exists(path):
-            print(f"📁 No saved inventory found at {path}. Starting fresh.")
+        if isinstance(self._storage, DatabaseBackend) and path == self._storage_path:
+            try:
+                self._load_from_database(self._storage)
+                self._emit("loaded", "success", f"✅ Inventory loaded from {path}", path=path, replayed=0)
+                return True
+            except Exception as e:
+                self._emit("load_failed", "error", f"❌ Failed to load inventory: {e}", path=path)
+                return False
+
+        journal_path = TransactionJournal.path_for(path)
+        if not os.path.exists(path) and not os.path.exists(journal_path):
+            self._emit("load_skipped", "info", f"📁 No saved inventory found at {path}. Starting fresh.", path=path)
             return False
 
         try:
-            with open(path, "r") as file:
-                data = json.load(file)
+            if self._storage is not None:
+                self._storage.sync()
+
+            data, pending, history, saved_file = {}, None, None, None
+            if BinarySnapshot.is_snapshot(path):
+                data, history = BinarySnapshot.read(path)
+                saved_file = SavedFile(path)
+            elif os.path.exists(path):
+                data, pending = read_inventory_file(path, "transactions" if lazy_history else None)
+                if pending is not None and not self._header_complete(data, journal_path):
+                    # Files written with keys after the history need a full parse
+                    data, pending = read_inventory_file(path, None)
+                saved_file = (JSONSnapshot.locate(pending) if pending is not None else None) or SavedFile(path)
 
             self.produces = [ProduceItem.from_dict(item) for item in data.get("produces", [])]
+            self._rebuild_name_index()
             self._total_revenue = Decimal(data.get("total_revenue", "0.00"))
-            self.transactions = [Transaction.from_dict(txn) for txn in data.get("transactions", [])]
+            if history is None:
+                history = TransactionStore()
+                history.extend_dicts(data.get("transactions", []))
+            self.transactions = history
+            self._pending_history = pending
+            self._journal_sequence = data.get("journal_sequence", 0)
 
-            print(f"✅ Inventory loaded from {path}")
+            replayed = 0
+            for record in TransactionJournal.read(journal_path, self._journal_sequence):
+                self._apply_journal_record(record)
+                replayed += 1
+            self._rebuild_item_stats()
+            self._dirty_items = set()
+            self._item_fragments = {}
+            # Replayed journal records are not in the file itself
+            self._mark_saved(None if replayed else saved_file, self._change_count)
+
+            if replayed:
+                self._emit("loaded", "success",
+                           f"✅ Inventory loaded from {path} ({replayed} journal records replayed)",
+                           path=path, replayed=replayed)
+            else:
+                self._emit("loaded", "success", f"✅ Inventory loaded from {path}", path=path, replayed=0)
             return True
         except Exception as e:
-            print(f"❌ Failed to load inventory: {e}")
+            self._emit("load_failed", "error", f"❌ Failed to load inventory: {e}", path=path)
+            return False
+
+    @staticmethod
+    def _header_complete(data: Dict, journal_path: str) -> bool:
+        """Check that every key needed before the history has been read."""
+        if "produces" not in data or "total_revenue" not in data:
             return False
+        return "journal_sequence" in data or not os.path.exists(journal_path)
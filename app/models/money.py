@@ -0,0 +1,31 @@
+from decimal import Decimal
+from functools import lru_cache
+from typing import Union
+
+
+ZERO = Decimal('0.00')
+
+
+@lru_cache(maxsize=65536, typed=True)
+def to_decimal(value: Union[int, float]) -> Decimal:
+    """
+    Convert a quantity or price to the Decimal it is written as.
+
+    Money math is done on Decimal(str(value)), so a price of 0.1 counts
+    as exactly 0.10 rather than its binary float approximation. Prices
+    and quantities repeat endlessly across items and transactions, so
+    conversions are memoized. The cache is typed: 4 and 4.0 are kept
+    apart because their Decimals print differently.
+
+    Args:
+        value: Integer or float quantity or price
+
+    Returns:
+        Decimal: Exact decimal value
+    """
+    return Decimal(str(value))
+
+
+def amount(quantity: Union[int, float], unit_price: Union[int, float]) -> Decimal:
+    """Get the exact amount of `quantity` units at `unit_price` each."""
+    return to_decimal(quantity) * to_decimal(unit_price)
@@ -1,14 +1,45 @@
 
+import sys
+from decimal import Decimal
+from app.models.money import to_decimal
+
+
+def _intern(value):
+    """Intern a string so repeated names, categories and units share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
 class ProduceItem():
+    __slots__ = ("name", "quantity", "_price_per_unit", "_price", "category", "unit_of_measurement")
+
     def __init__(self, name, quantity, price_per_unit, category, unit_of_measurement):
         """
         Initialize a ProduceItem with name, quantity in stock, and price per unit.
         """
-        self.name = name
+        self.name = _intern(name)
         self.quantity = quantity
         self.price_per_unit = price_per_unit
-        self.category = category
-        self.unit_of_measurement = unit_of_measurement
+        self.category = _intern(category)
+        self.unit_of_measurement = _intern(unit_of_measurement)
+
+    @property
+    def price_per_unit(self):
+        return self._price_per_unit
+
+    @price_per_unit.setter
+    def price_per_unit(self, price_per_unit) -> None:
+        self._price_per_unit = price_per_unit
+        self._price = to_decimal(price_per_unit)
+
+    @property
+    def price(self) -> Decimal:
+        """Price per unit as an exact Decimal, converted once per price change."""
+        return self._price
+
+    @property
+    def stock_value(self) -> Decimal:
+        """Exact value of the stock on hand."""
+        return to_decimal(self.quantity) * self._price
 
     def update_quantity(self, new_quantity: int):
         if new_quantity >= 0:
@@ -0,0 +1,196 @@
+import heapq
+from itertools import count
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from app.models.produce import ProduceItem
+
+
+class LowStockTracker:
+    """
+    Items ordered by stock level, for low-stock queries and alerts.
+
+    Every item has a threshold: its own if one was set, else its
+    category's, else the default. An item is low while its quantity is
+    at or below its threshold.
+
+    Items sit in a binary heap keyed by quantity, with lazy deletion: a
+    quantity change pushes a fresh entry in O(log n) and marks the old
+    one dead, and the heap is rebuilt once dead entries outnumber live
+    ones. A query for items at or below some quantity only walks the part
+    of the heap under that bound, so it costs O(k) for k matching items
+    rather than a catalogue scan. Items low by their own thresholds are
+    kept in a set that changes only when an item crosses its threshold.
+
+    Subscribers are called with an event dict whenever an item crosses
+    its threshold in either direction, or is added already low.
+    """
+
+    DEFAULT_THRESHOLD = 10
+    # Dead entries tolerated before the heap is compacted
+    MIN_COMPACT = 64
+
+    def __init__(self, default_threshold: int = DEFAULT_THRESHOLD):
+        self.default_threshold = default_threshold
+        # Normalized item name / lower-cased category -> threshold
+        self._item_thresholds: Dict[str, int] = {}
+        self._category_thresholds: Dict[str, int] = {}
+        # Heap entries are [quantity, sequence, item, live]
+        self._heap: List[List] = []
+        # Item -> (heap entry, threshold, thresholds version)
+        self._state: Dict[ProduceItem, tuple] = {}
+        self._low = set()
+        # Bumped on every threshold change, so items can reuse their last
+        # threshold until then
+        self._thresholds_version = 0
+        self._sequence = count()
+        self._dead = 0
+        self._subscribers: List[Callable[[Dict], None]] = []
+
+    @property
+    def low_count(self) -> int:
+        """Number of items currently at or below their threshold."""
+        return len(self._low)
+
+    def subscribe(self, callback: Callable[[Dict], None]) -> None:
+        """
+        Call `callback` on every threshold crossing.
+
+        Events have "name", "category", "quantity", "threshold" and "low"
+        (True when the item dropped to its threshold, False when it rose
+        back above it).
+        """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict], None]) -> None:
+        """Stop calling a subscribed callback."""
+        self._subscribers.remove(callback)
+
+    def set_threshold(self, threshold: Optional[int], name: Optional[str] = None,
+                      category: Optional[str] = None) -> None:
+        """
+        Set the default threshold, or an item's or category's own.
+
+        Items are not re-checked here; the caller must `update` the items
+        the change applies to.
+
+        Args:
+            threshold: New threshold; None removes an item's or category's own
+            name: Item the threshold applies to
+            category: Category the threshold applies to
+        """
+        self._thresholds_version += 1
+        if name is not None:
+            overrides, key = self._item_thresholds, name.strip().lower()
+        elif category is not None:
+            overrides, key = self._category_thresholds, category.lower()
+        else:
+            self.default_threshold = threshold
+            return
+        if threshold is None:
+            overrides.pop(key, None)
+        else:
+            overrides[key] = threshold
+
+    def threshold_for(self, item: ProduceItem) -> int:
+        """Get the threshold that applies to an item."""
+        threshold = self._item_thresholds.get(item.name.strip().lower())
+        if threshold is None:
+            threshold = self._category_thresholds.get(item.category.lower(), self.default_threshold)
+        return threshold
+
+    def is_low(self, item: ProduceItem) -> bool:
+        """Check whether an item is at or below its threshold."""
+        if item in self._state:
+            return item in self._low
+        return item.quantity <= self.threshold_for(item)
+
+    def update(self, item: ProduceItem) -> None:
+        """Track an item's current quantity, notifying subscribers if it crossed its threshold."""
+        quantity = item.quantity
+        previous = self._state.get(item)
+        if previous is not None and previous[2] == self._thresholds_version:
+            entry, threshold, _ = previous
+            if entry[0] == quantity:
+                return
+        else:
+            threshold = self.threshold_for(item)
+        if previous is not None:
+            self._kill(previous[0])
+        self._push(item, quantity, threshold)
+
+        low = quantity <= threshold
+        if low == (item in self._low):
+            return
+        if low:
+            self._low.add(item)
+        else:
+            self._low.discard(item)
+        event = {"name": item.name, "category": item.category, "quantity": quantity,
+                 "threshold": threshold, "low": low}
+        for callback in list(self._subscribers):
+            callback(event)
+
+    def discard(self, item: ProduceItem) -> None:
+        """Stop tracking an item."""
+        state = self._state.pop(item, None)
+        if state is not None:
+            self._kill(state[0])
+            self._low.discard(item)
+
+    def rebuild(self, items: Iterable[ProduceItem]) -> None:
+        """Track exactly `items`, without notifying subscribers."""
+        self._heap = []
+        self._state = {}
+        self._low = set()
+        self._dead = 0
+        for item in items:
+            threshold = self.threshold_for(item)
+            self._push(item, item.quantity, threshold, heapify=False)
+            if item.quantity <= threshold:
+                self._low.add(item)
+        heapq.heapify(self._heap)
+
+    def items_at_or_below(self, quantity: float) -> List[ProduceItem]:
+        """Get items with at most `quantity` in stock, lowest stock first."""
+        return self._sorted(self._walk(quantity))
+
+    def low_items(self) -> List[ProduceItem]:
+        """Get items at or below their own thresholds, lowest stock first."""
+        return self._sorted(self._low)
+
+    @staticmethod
+    def _sorted(items: Iterable[ProduceItem]) -> List[ProduceItem]:
+        return sorted(items, key=lambda item: (item.quantity, item.name))
+
+    def _walk(self, bound: float) -> Iterator[ProduceItem]:
+        """Yield live items with quantity <= bound, pruning subtrees above it."""
+        heap = self._heap
+        stack = [0] if heap else []
+        while stack:
+            position = stack.pop()
+            entry = heap[position]
+            if entry[0] > bound:
+                continue
+            if entry[3]:
+                yield entry[2]
+            child = 2 * position + 1
+            if child < len(heap):
+                stack.append(child)
+                if child + 1 < len(heap):
+                    stack.append(child + 1)
+
+    def _push(self, item: ProduceItem, quantity: float, threshold: int, heapify: bool = True) -> None:
+        entry = [quantity, next(self._sequence), item, True]
+        if heapify:
+            heapq.heappush(self._heap, entry)
+        else:
+            self._heap.append(entry)
+        self._state[item] = (entry, threshold, self._thresholds_version)
+
+    def _kill(self, entry: List) -> None:
+        """Mark a heap entry dead, compacting the heap if too many are."""
+        entry[3] = False
+        self._dead += 1
+        if self._dead > self.MIN_COMPACT and self._dead > len(self._state):
+            self._heap = [entry for entry in self._heap if entry[3]]
+            heapq.heapify(self._heap)
+            self._dead = 0
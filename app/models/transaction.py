@@ -1,11 +1,22 @@
+import sys
 from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional, Dict
+from app.models.money import amount
 
 
 
 class Transaction:
-    """Enhanced transaction class with better validation and features."""
+    """
+    Enhanced transaction class with better validation and features.
+
+    Instances are slotted, and the type and produce name are interned, so
+    large lists of transactions stay compact. The timestamp is kept in
+    the form it was given (ISO string or datetime); the other form is
+    derived on first use and cached, as is the total amount.
+    """
+
+    __slots__ = ("type", "produce_name", "quantity", "unit_price", "note", "_timestamp", "_moment", "_amount")
     
     VALID_TYPES = {"sale", "purchase", "adjustment", "refund"}
     
@@ -31,22 +42,48 @@ class Transaction:
         if unit_price < 0:
             raise ValueError("Unit price cannot be negative")
         
-        self.type = type.lower()
-        self.produce_name = produce_name.strip()
+        self.type = sys.intern(type.lower())
+        self.produce_name = sys.intern(produce_name.strip())
         self.quantity = quantity
         self.unit_price = unit_price
         self.note = note.strip()
-        self.timestamp = timestamp or datetime.now().isoformat()
+        if timestamp:
+            self._timestamp = timestamp
+            self._moment = None
+        else:
+            self._timestamp = None
+            self._moment = datetime.now()
+        self._amount = None
+
+    @property
+    def timestamp(self) -> str:
+        """ISO timestamp, formatted from the parsed time on first use."""
+        if self._timestamp is None:
+            self._timestamp = self._moment.isoformat()
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, timestamp: str) -> None:
+        self._timestamp = timestamp
+        self._moment = None
+
+    @property
+    def moment(self) -> datetime:
+        """Timestamp as a datetime, parsed from the ISO string on first use."""
+        if self._moment is None:
+            self._moment = datetime.fromisoformat(self._timestamp)
+        return self._moment
 
     @property
     def total_amount(self) -> Decimal:
         """Calculate total transaction amount."""
-        return Decimal(str(self.quantity)) * Decimal(str(self.unit_price))
+        if self._amount is None:
+            self._amount = amount(self.quantity, self.unit_price)
+        return self._amount
 
     def __str__(self) -> str:
         """String representation of transaction."""
-        timestamp_dt = datetime.fromisoformat(self.timestamp)
-        formatted_time = timestamp_dt.strftime("%Y-%m-%d %H:%M")
+        formatted_time = self.moment.strftime("%Y-%m-%d %H:%M")
         
         return (f"[{formatted_time}] {self.type.upper()}: {self.quantity} {self.produce_name} "
                 f"@ ${self.unit_price:.2f} each (Total: ${self.total_amount:.2f})"
@@ -63,6 +100,27 @@ class Transaction:
             "timestamp": self.timestamp
         }
 
+    @classmethod
+    def from_trusted(cls, type: str, produce_name: str, quantity: float,
+                     unit_price: float, note: str, timestamp: Optional[str] = None,
+                     moment: Optional[datetime] = None) -> 'Transaction':
+        """
+        Create Transaction from already-validated fields, skipping validation.
+
+        Exactly one of `timestamp` (ISO string) and `moment` (datetime)
+        should be given.
+        """
+        txn = cls.__new__(cls)
+        txn.type = type
+        txn.produce_name = produce_name
+        txn.quantity = quantity
+        txn.unit_price = unit_price
+        txn.note = note
+        txn._timestamp = timestamp
+        txn._moment = moment
+        txn._amount = None
+        return txn
+
     @classmethod
     def from_dict(cls, data: Dict) -> 'Transaction':
         """Create Transaction from dictionary."""
@@ -0,0 +1,634 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import islice
+from json.encoder import encode_basestring_ascii
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from app.models.money import to_decimal
+from app.models.transaction import Transaction
+
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def to_micros(moment: datetime) -> int:
+    """Convert a naive datetime to microseconds since the (naive) epoch."""
+    return (moment - EPOCH) // MICROSECOND
+
+
+def from_micros(micros: int) -> datetime:
+    """Convert microseconds since the (naive) epoch back to a datetime."""
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def iso_formatter() -> Callable[[int], str]:
+    """
+    Get a function formatting micros as `from_micros(micros).isoformat()`.
+
+    The function builds the string by hand, caching each day's date and
+    the last minute it formatted, which is about twice as fast as going
+    through datetime for the long time-ordered runs of a history.
+    """
+    days: Dict[int, str] = {}
+    two_digits = [f"{number:02d}" for number in range(60)]
+    last_minute = None
+    minute_prefix = ""
+
+    def format_micros(micros: int) -> str:
+        nonlocal last_minute, minute_prefix
+        minute, micros = divmod(micros, 60_000_000)
+        if minute != last_minute:
+            day, minutes = divmod(minute, 1440)
+            date_part = days.get(day)
+            if date_part is None:
+                date_part = days[day] = (EPOCH + timedelta(days=day)).date().isoformat() + "T"
+            hour, minutes = divmod(minutes, 60)
+            last_minute = minute
+            minute_prefix = date_part + two_digits[hour] + ":" + two_digits[minutes] + ":"
+        second, fraction = divmod(micros, 1_000_000)
+        if fraction:
+            return minute_prefix + two_digits[second] + "." + str(1_000_000 + fraction)[1:]
+        return minute_prefix + two_digits[second]
+    return format_micros
+
+
+def timestamp_micros(timestamp: str) -> int:
+    """Convert an ISO timestamp to micros, taking aware times as local time."""
+    moment = datetime.fromisoformat(timestamp)
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(tz=None).replace(tzinfo=None)
+    return to_micros(moment)
+
+
+def _summarize_sales_shard(shard: Tuple) -> Tuple[Counter, Dict[str, Decimal], Optional[int]]:
+    """
+    Aggregate the sale rows of one shard of a TransactionStore.
+
+    Module-level so process pool workers can unpickle and run it.
+
+    Args:
+        shard: Columns as built by `TransactionStore._shard`
+
+    Returns:
+        Tuple of (units sold per produce name, revenue per produce name,
+        store position of the shard's latest sale or None), with names in
+        first-sale order
+    """
+    offset, types, names, name_table, quantities, prices, timestamps, float_quantities = shard
+    sale = TransactionStore.TYPE_CODES["sale"]
+    units = Counter()
+    revenue = defaultdict(Decimal)
+    last_index = None
+
+    for index, code in enumerate(types):
+        if code != sale:
+            continue
+        name = name_table[names[index]]
+        quantity = quantities[index]
+        price = prices[index]
+        units[name] += int(quantity)
+
+        if quantity.is_integer() and index not in float_quantities:
+            quantity = int(quantity)
+        revenue[name] += to_decimal(price) * to_decimal(quantity)
+
+        if last_index is None or timestamps[index] > timestamps[last_index]:
+            last_index = index
+
+    return units, revenue, None if last_index is None else offset + last_index
+
+
+class TransactionStore:
+    """
+    Compact, column-oriented transaction log.
+
+    Each field is held in a typed array: quantity, unit price and
+    timestamp (microseconds since the epoch) as machine numbers, and the
+    transaction type and produce name as codes into small string tables.
+    Notes are kept in a side table since most transactions have none.
+    Rows are exposed as `Transaction` views built on demand, and the
+    reporting helpers run directly over the columns.
+
+    Date-range queries use binary search. While rows arrive in time order
+    (the usual case) the timestamp column itself is searched; once an
+    out-of-order row shows up, a separate time-ordered index of row
+    positions is maintained instead.
+    """
+
+    TYPES = ("sale", "purchase", "adjustment", "refund")
+    TYPE_CODES = {name: code for code, name in enumerate(TYPES)}
+    # Keys of a serialized row, in `Transaction.to_dict` order
+    FIELDS = ("type", "produce_name", "quantity", "unit_price", "note", "timestamp")
+    # Smallest shard worth shipping to another process
+    PARALLEL_MIN_SHARD_ROWS = 50_000
+
+    def __init__(self, transactions: Iterable[Transaction] = ()):
+        self._types = array("B")
+        self._names = array("I")
+        self._quantities = array("d")
+        self._prices = array("d")
+        self._timestamps = array("q")
+        self._name_table: List[str] = []
+        self._name_codes: Dict[str, int] = {}
+        self._notes: Dict[int, str] = {}
+        # Rows whose quantity was given as an integral float, e.g. 5.0
+        self._float_quantities = set()
+        # Original timestamp strings that do not round-trip through micros
+        self._raw_timestamps: Dict[int, str] = {}
+        # Whether the timestamp column is non-decreasing in log order
+        self._in_time_order = True
+        # Time-ordered row positions and their timestamps, used (and built
+        # lazily) only once rows are out of order
+        self._time_order: Optional[array] = None
+        self._sorted_timestamps: Optional[array] = None
+        # Normalized produce name -> its row positions in log order; built
+        # on first use, then kept up to date as rows are appended
+        self._rows_by_name: Optional[Dict[str, array]] = None
+        self.extend(transactions)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        for index in range(len(self._types)):
+            yield self._view(index)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Transaction, List[Transaction]]:
+        if isinstance(key, slice):
+            return [self._view(index) for index in range(*key.indices(len(self)))]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("transaction index out of range")
+        return self._view(key)
+
+    def copy(self) -> List[Transaction]:
+        """Get all transactions as a list of views."""
+        return list(self)
+
+    def clone(self, start: int = 0) -> "TransactionStore":
+        """Get an independent copy of the store, or of its rows from `start` on."""
+        def rows_from(table: Dict) -> Dict:
+            if not start:
+                return table
+            return {index - start: value for index, value in table.items() if index >= start}
+
+        return TransactionStore.from_columns({
+            "types": self._types[start:],
+            "names": self._names[start:],
+            "quantities": self._quantities[start:],
+            "prices": self._prices[start:],
+            "timestamps": self._timestamps[start:],
+            "name_table": self._name_table,
+            "notes": rows_from(self._notes),
+            "float_quantities": rows_from(dict.fromkeys(self._float_quantities)),
+            "raw_timestamps": rows_from(self._raw_timestamps),
+            "in_time_order": self._in_time_order
+        })
+
+    def append(self, txn: Transaction) -> None:
+        """Append a transaction."""
+        self._append_row(txn.type, txn.produce_name, txn.quantity,
+                         txn.unit_price, txn.note, txn.timestamp)
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        """Append several transactions."""
+        for txn in transactions:
+            self.append(txn)
+
+    def append_dict(self, data: Dict) -> None:
+        """
+        Append a serialized transaction without building a Transaction.
+
+        Applies the same validation as `Transaction.__init__`.
+        """
+        quantity = data["quantity"]
+        unit_price = data["unit_price"]
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive")
+        if unit_price < 0:
+            raise ValueError("Unit price cannot be negative")
+        self._append_row(data["type"].lower(), data["produce_name"].strip(), quantity,
+                         unit_price, data.get("note", "").strip(),
+                         data.get("timestamp") or datetime.now().isoformat())
+
+    def extend_dicts(self, rows: Iterable[Dict]) -> None:
+        """Append several serialized transactions."""
+        for data in rows:
+            self.append_dict(data)
+
+    def extend_store(self, other: "TransactionStore") -> None:
+        """Append every row of another store, column by column."""
+        offset = len(self)
+        remap = [self._code_for(name) for name in other._name_table]
+        if not (self._in_time_order and other._in_time_order
+                and (not offset or not len(other) or other._timestamps[0] >= self._timestamps[-1])):
+            self._in_time_order = False
+            self._time_order = self._sorted_timestamps = None
+        self._rows_by_name = None
+        self._types.extend(other._types)
+        self._names.extend(array("I", (remap[code] for code in other._names)))
+        self._quantities.extend(other._quantities)
+        self._prices.extend(other._prices)
+        self._timestamps.extend(other._timestamps)
+        self._notes.update((offset + index, note) for index, note in other._notes.items())
+        self._float_quantities.update(offset + index for index in other._float_quantities)
+        self._raw_timestamps.update(
+            (offset + index, raw) for index, raw in other._raw_timestamps.items())
+
+    def columns(self) -> Dict:
+        """
+        Get the store's internal columns and side tables, for binary snapshots.
+
+        The returned objects are the live ones and must not be modified.
+        """
+        return {
+            "types": self._types,
+            "names": self._names,
+            "quantities": self._quantities,
+            "prices": self._prices,
+            "timestamps": self._timestamps,
+            "name_table": self._name_table,
+            "notes": self._notes,
+            "float_quantities": self._float_quantities,
+            "raw_timestamps": self._raw_timestamps,
+            "in_time_order": self._in_time_order
+        }
+
+    @classmethod
+    def from_columns(cls, columns: Dict) -> "TransactionStore":
+        """
+        Build a store directly from columns produced by `columns()`.
+
+        The data is trusted: nothing is validated or parsed, which is what
+        makes loading a binary snapshot fast.
+        """
+        store = cls()
+        store._types = columns["types"]
+        store._names = columns["names"]
+        store._quantities = columns["quantities"]
+        store._prices = columns["prices"]
+        store._timestamps = columns["timestamps"]
+        store._name_table = list(columns["name_table"])
+        store._name_codes = {name: code for code, name in enumerate(store._name_table)}
+        store._notes = dict(columns["notes"])
+        store._float_quantities = set(columns["float_quantities"])
+        store._raw_timestamps = dict(columns["raw_timestamps"])
+        store._in_time_order = columns["in_time_order"]
+        return store
+
+    def _code_for(self, name: str) -> int:
+        """Get (or allocate) the code of a produce name."""
+        code = self._name_codes.get(name)
+        if code is None:
+            code = len(self._name_table)
+            self._name_table.append(name)
+            self._name_codes[name] = code
+        return code
+
+    def _append_row(self, type: str, produce_name: str, quantity: float,
+                    unit_price: float, note: str, timestamp: str) -> None:
+        type_code = self.TYPE_CODES.get(type)
+        if type_code is None:
+            raise ValueError(f"Invalid transaction type '{type}'. Must be one of: {', '.join(self.TYPES)}")
+
+        moment = datetime.fromisoformat(timestamp)
+        index = len(self._types)
+        if moment.tzinfo is not None:
+            self._raw_timestamps[index] = timestamp
+            moment = moment.astimezone(tz=None).replace(tzinfo=None)
+        elif moment.isoformat() != timestamp:
+            self._raw_timestamps[index] = timestamp
+
+        if isinstance(quantity, float) and quantity.is_integer():
+            self._float_quantities.add(index)
+
+        micros = to_micros(moment)
+        if self._in_time_order and index and micros < self._timestamps[-1]:
+            self._in_time_order = False
+        elif self._time_order is not None:
+            position = bisect_right(self._sorted_timestamps, micros)
+            self._sorted_timestamps.insert(position, micros)
+            self._time_order.insert(position, index)
+
+        if self._rows_by_name is not None:
+            key = self.name_key(produce_name)
+            rows = self._rows_by_name.get(key)
+            if rows is None:
+                rows = self._rows_by_name[key] = array("I")
+            rows.append(index)
+
+        self._types.append(type_code)
+        self._names.append(self._code_for(produce_name))
+        self._quantities.append(quantity)
+        self._prices.append(unit_price)
+        self._timestamps.append(micros)
+        if note:
+            self._notes[index] = note
+
+    def _quantity(self, index: int) -> float:
+        quantity = self._quantities[index]
+        if quantity.is_integer() and index not in self._float_quantities:
+            return int(quantity)
+        return quantity
+
+    def timestamp(self, index: int) -> str:
+        """Get the ISO timestamp of a row."""
+        raw = self._raw_timestamps.get(index)
+        if raw is not None:
+            return raw
+        return from_micros(self._timestamps[index]).isoformat()
+
+    def _view(self, index: int) -> Transaction:
+        # Views carry the parsed time; the ISO string is only built if asked for
+        raw = self._raw_timestamps.get(index)
+        return Transaction.from_trusted(
+            type=self.TYPES[self._types[index]],
+            produce_name=self._name_table[self._names[index]],
+            quantity=self._quantity(index),
+            unit_price=self._prices[index],
+            note=self._notes.get(index, ""),
+            timestamp=raw,
+            moment=None if raw is not None else from_micros(self._timestamps[index])
+        )
+
+    def iter_dicts(self) -> Iterator[Dict]:
+        """Yield rows serialized like `Transaction.to_dict`, without views."""
+        types, names, table = self.TYPES, self._name_table, self._names
+        notes, raw_timestamps = self._notes, self._raw_timestamps
+        float_quantities, iso = self._float_quantities, iso_formatter()
+        type_codes, quantities, prices, timestamps = self._types, self._quantities, self._prices, self._timestamps
+        for index in range(len(type_codes)):
+            quantity = quantities[index]
+            if quantity.is_integer() and index not in float_quantities:
+                quantity = int(quantity)
+            raw = raw_timestamps.get(index)
+            yield {
+                "type": types[type_codes[index]],
+                "produce_name": names[table[index]],
+                "quantity": quantity,
+                "unit_price": prices[index],
+                "note": notes.get(index, ""),
+                "timestamp": raw if raw is not None else iso(timestamps[index])
+            }
+
+    def iter_json_fields(self, start: int = 0) -> Iterator[Tuple[str, ...]]:
+        """
+        Yield rows as tuples of JSON-encoded values, in FIELDS order.
+
+        Values are encoded straight from the columns, as `json.dumps`
+        would encode the `iter_dicts` rows, without building those dicts;
+        each produce name is encoded once.
+
+        Args:
+            start: First row to yield
+        """
+        types = [encode_basestring_ascii(name) for name in self.TYPES]
+        names = [encode_basestring_ascii(name) for name in self._name_table]
+        notes, raw_timestamps = self._notes, self._raw_timestamps
+        float_quantities = self._float_quantities
+        iso = iso_formatter()
+        type_codes, name_codes = self._types, self._names
+        quantities, prices, timestamps = self._quantities, self._prices, self._timestamps
+        for index in range(start, len(type_codes)):
+            quantity = quantities[index]
+            if quantity.is_integer() and index not in float_quantities:
+                quantity = int(quantity)
+            note = notes.get(index)
+            raw = raw_timestamps.get(index)
+            yield (
+                types[type_codes[index]],
+                names[name_codes[index]],
+                repr(quantity),
+                repr(prices[index]),
+                encode_basestring_ascii(note) if note else '""',
+                encode_basestring_ascii(raw) if raw is not None
+                else '"' + iso(timestamps[index]) + '"'
+            )
+
+    def select_type(self, type: str) -> List[Transaction]:
+        """Get all transactions of one type, in log order."""
+        code = self.TYPE_CODES.get(type.lower())
+        if code is None:
+            return []
+        return [self._view(index) for index, value in enumerate(self._types) if value == code]
+
+    def _time_index(self) -> Tuple[array, Optional[array]]:
+        """
+        Get (sorted timestamps, row positions) for binary search.
+
+        Positions are None while the log itself is in time order.
+        """
+        if self._in_time_order:
+            return self._timestamps, None
+        if self._time_order is None:
+            order = sorted(range(len(self._timestamps)), key=self._timestamps.__getitem__)
+            self._time_order = array("I", order)
+            self._sorted_timestamps = array("q", (self._timestamps[index] for index in order))
+        return self._sorted_timestamps, self._time_order
+
+    def indices_between(self, start_micros: int, end_micros: int) -> List[int]:
+        """Get row positions with start <= timestamp < end, in log order."""
+        timestamps, order = self._time_index()
+        low = bisect_left(timestamps, start_micros)
+        high = bisect_left(timestamps, end_micros, low)
+        if order is None:
+            return list(range(low, high))
+        return sorted(order[low:high])
+
+    def select_between(self, start_micros: int, end_micros: int) -> List[Transaction]:
+        """Get transactions with start <= timestamp < end, in log order."""
+        return [self._view(index) for index in self.indices_between(start_micros, end_micros)]
+
+    @staticmethod
+    def name_key(name: str) -> str:
+        """Normalize a produce name the way Inventory looks items up."""
+        return name.strip().lower()
+
+    def item_rows(self, name: str) -> array:
+        """
+        Get the positions of every row logged under a produce name, in log order.
+
+        Names are matched ignoring case and surrounding whitespace. The
+        index behind this is built from the name column on first use; the
+        returned array is live and must not be modified.
+        """
+        if self._rows_by_name is None:
+            keys = [self.name_key(table_name) for table_name in self._name_table]
+            rows_by_name: Dict[str, array] = {}
+            for index, code in enumerate(self._names):
+                key = keys[code]
+                rows = rows_by_name.get(key)
+                if rows is None:
+                    rows = rows_by_name[key] = array("I")
+                rows.append(index)
+            self._rows_by_name = rows_by_name
+        return self._rows_by_name.get(self.name_key(name), array("I"))
+
+    def item_history(self, name: str) -> List[Transaction]:
+        """Get every transaction logged under a produce name, in log order."""
+        return [self._view(index) for index in self.item_rows(name)]
+
+    def item_sales_summary(self, name: str, since_micros: int) -> Dict:
+        """
+        Aggregate the sale rows of one produce name, reading only its rows.
+
+        Args:
+            name: Produce name, matched ignoring case and surrounding whitespace
+            since_micros: Start of the recent window, in microseconds since the epoch
+
+        Returns:
+            Dict with "transactions" (rows logged under the name), "sales",
+            "units_sold", "revenue" (Decimal), "recent_units" (units sold
+            at or after `since_micros`) and "last_sale" (ISO timestamp or None)
+        """
+        rows = self.item_rows(name)
+        sale = self.TYPE_CODES["sale"]
+        types, timestamps = self._types, self._timestamps
+        sales = 0
+        units = 0
+        recent_units = 0
+        revenue = Decimal(0)
+        last_index = None
+        for index in rows:
+            if types[index] != sale:
+                continue
+            quantity = self._quantity(index)
+            sales += 1
+            units += quantity
+            revenue += to_decimal(self._prices[index]) * to_decimal(quantity)
+            if timestamps[index] >= since_micros:
+                recent_units += quantity
+            if last_index is None or timestamps[index] > timestamps[last_index]:
+                last_index = index
+        return {
+            "transactions": len(rows),
+            "sales": sales,
+            "units_sold": units,
+            "revenue": revenue,
+            "recent_units": recent_units,
+            "last_sale": None if last_index is None else self.timestamp(last_index)
+        }
+
+    def iter_positions_newest_first(self, before: Optional[int] = None, type: Optional[str] = None,
+                                    start_micros: Optional[int] = None,
+                                    end_micros: Optional[int] = None) -> Iterator[int]:
+        """
+        Yield row positions below `before`, newest (last logged) first.
+
+        Rows are read lazily, so taking a page only walks the rows it
+        returns (and, with a type filter, the rows it skips over).
+
+        Args:
+            before: Only yield positions below this one; None starts at the end
+            type: Only yield rows of this transaction type
+            start_micros: Only yield rows with timestamp >= this
+            end_micros: Only yield rows with timestamp < this
+        """
+        before = len(self._types) if before is None else min(max(before, 0), len(self._types))
+        if type is not None:
+            code = self.TYPE_CODES.get(type.lower())
+            if code is None:
+                return
+        if start_micros is None and end_micros is None:
+            positions = range(before - 1, -1, -1)
+        else:
+            timestamps, order = self._time_index()
+            low = 0 if start_micros is None else bisect_left(timestamps, start_micros)
+            high = len(timestamps) if end_micros is None else bisect_left(timestamps, end_micros, low)
+            if order is None:
+                positions = range(min(high, before) - 1, low - 1, -1)
+            else:
+                matches = sorted(order[low:high])
+                positions = reversed(matches[:bisect_left(matches, before)])
+        if type is None:
+            yield from positions
+            return
+        types = self._types
+        for index in positions:
+            if types[index] == code:
+                yield index
+
+    def page(self, limit: int, before: Optional[int] = None, offset: int = 0,
+             **filters) -> Tuple[List[Transaction], Optional[int]]:
+        """
+        Get one page of the log, newest first.
+
+        Args:
+            limit: Maximum number of transactions on the page
+            before: Cursor from a previous page; None starts at the newest row
+            offset: Number of matching rows to skip before the page starts
+            **filters: `type`, `start_micros` and `end_micros`, as for
+                `iter_positions_newest_first`
+
+        Returns:
+            (transaction views, cursor for the next page or None if this
+            was the last one)
+        """
+        positions = list(islice(self.iter_positions_newest_first(before, **filters),
+                                offset, offset + limit + 1))
+        has_more = len(positions) > limit
+        positions = positions[:limit]
+        next_cursor = positions[-1] if has_more else None
+        return [self._view(index) for index in positions], next_cursor
+
+    def count_after(self, micros: int) -> int:
+        """Count transactions strictly newer than a timestamp."""
+        timestamps, _ = self._time_index()
+        return len(timestamps) - bisect_right(timestamps, micros)
+
+    def sales_summary(self, workers: int = 1) -> Tuple[Counter, Dict[str, Decimal], Optional[str]]:
+        """
+        Aggregate sale rows over the columns.
+
+        With `workers` > 1 and enough rows, the log is split into that many
+        contiguous shards that are summarized in a process pool and merged
+        in log order, which gives exactly the serial result: the same
+        totals, and names in the same first-sale order (used to break ties
+        between equally ranked items).
+
+        Args:
+            workers: Number of processes to summarize shards in
+
+        Returns:
+            Tuple of (units sold per produce name, revenue per produce name,
+            ISO timestamp of the latest sale)
+        """
+        rows = len(self._types)
+        if workers > 1 and rows >= workers * self.PARALLEL_MIN_SHARD_ROWS:
+            bounds = [rows * shard // workers for shard in range(workers + 1)]
+            shards = [self._shard(start, end) for start, end in zip(bounds, bounds[1:])]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                partials = list(pool.map(_summarize_sales_shard, shards))
+        else:
+            partials = [_summarize_sales_shard(self._shard(0, rows))]
+
+        units = Counter()
+        revenue = defaultdict(Decimal)
+        last_index = None
+        for shard_units, shard_revenue, shard_last in partials:
+            for name, count in shard_units.items():
+                units[name] += count
+            for name, amount in shard_revenue.items():
+                revenue[name] += amount
+            # Shards are in log order, so strict > keeps the first of equal timestamps
+            if shard_last is not None and (
+                    last_index is None or self._timestamps[shard_last] > self._timestamps[last_index]):
+                last_index = shard_last
+
+        last_sale = self.timestamp(last_index) if last_index is not None else None
+        return units, revenue, last_sale
+
+    def _shard(self, start: int, end: int) -> Tuple:
+        """Get the columns of rows [start, end) in the form _summarize_sales_shard takes."""
+        if start == 0 and end == len(self._types):
+            float_quantities = self._float_quantities
+        else:
+            float_quantities = {index - start for index in self._float_quantities if start <= index < end}
+        return (start, self._types[start:end], self._names[start:end], self._name_table,
+                self._quantities[start:end], self._prices[start:end], self._timestamps[start:end],
+                float_quantities)
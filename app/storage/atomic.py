@@ -0,0 +1,51 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = "w", **open_args) -> Iterator[IO]:
+    """
+    Write a file so that a crash never leaves it half written.
+
+    The data goes to a temporary file in the same directory, which is
+    fsynced and then renamed over `path`; the directory is fsynced too so
+    the rename itself survives a power loss. If writing fails, the
+    temporary file is removed and `path` is left untouched.
+
+    Args:
+        path: File to write
+        mode: Write mode, "w" or "wb"
+        **open_args: Further arguments for `open`, e.g. encoding
+
+    Yields:
+        File object to write the new contents to
+    """
+    directory = os.path.dirname(path)
+    # Unique per thread, so concurrent writers never share a temporary file
+    temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, mode, **open_args) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory or ".")
+
+
+def _fsync_directory(directory: str) -> None:
+    """Flush a directory entry change to disk, where the platform allows it."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,121 @@
+import threading
+import time
+from typing import Optional
+from app.models.inventory import Inventory
+
+
+class AutoSaver:
+    """
+    Background thread saving an inventory while it has unsaved changes.
+
+    A save is due once the inventory has been dirty for `interval`
+    seconds, or as soon as `max_changes` mutations are unsaved. Changes
+    made while a save is running are picked up by the next one, so a
+    burst of mutations is coalesced into a single write rather than one
+    per change. Saves are atomic and hold the inventory's locks only
+    while its state is copied, so callers are never blocked on disk I/O.
+
+    After a failed save (a full disk, a read-only path) the next attempt
+    waits `interval` seconds, doubling with every further failure up to
+    MAX_RETRY_DELAY, rather than retrying on every poll.
+    """
+
+    # Longest wait, in seconds, before retrying a save that keeps failing
+    MAX_RETRY_DELAY = 300.0
+
+    def __init__(self, inventory: Inventory, path: str, interval: float = 30.0,
+                 max_changes: Optional[int] = 100, poll_interval: float = 0.25):
+        """
+        Args:
+            inventory: Inventory to save; must be thread-safe
+            path: File path to save to
+            interval: Seconds changes may stay unsaved
+            max_changes: Unsaved mutations that trigger a save right away;
+                None saves on the interval only
+            poll_interval: Seconds between checks for unsaved changes
+        """
+        if not inventory.thread_safe:
+            raise ValueError("Autosave needs a thread-safe inventory")
+        if interval <= 0 or poll_interval <= 0:
+            raise ValueError("Autosave intervals must be positive")
+        if max_changes is not None and max_changes <= 0:
+            raise ValueError("Autosave change limit must be positive")
+
+        self.inventory = inventory
+        self.path = path
+        self.interval = interval
+        self.max_changes = max_changes
+        self.poll_interval = poll_interval
+        self.saves = 0
+        # Saves failed in a row
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Monotonic time the inventory was first seen dirty since the last save
+        self._dirty_since: Optional[float] = None
+        # Monotonic time before which a failed save is not retried
+        self._retry_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the autosave thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start saving in the background."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._dirty_since = None
+        self._retry_at = None
+        self._thread = threading.Thread(target=self._run, name="inventory-autosave", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True) -> bool:
+        """
+        Stop the autosave thread.
+
+        Args:
+            flush: Save any changes still unsaved once the thread has stopped
+
+        Returns:
+            bool: False if the final save failed, True otherwise
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush and self.inventory.is_dirty():
+            return self._save()
+        return True
+
+    def save_due(self) -> bool:
+        """Check whether the unsaved changes should be written now."""
+        if not self.inventory.is_dirty():
+            self._dirty_since = None
+            return False
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        if self._retry_at is not None and now < self._retry_at:
+            return False
+        if self.max_changes is not None and self.inventory.unsaved_changes >= self.max_changes:
+            return True
+        return now - self._dirty_since >= self.interval
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            if self.save_due():
+                self._save()
+
+    def _save(self) -> bool:
+        saved = self.inventory.save_to_file(self.path)
+        if saved:
+            self.saves += 1
+            self.failures = 0
+            self._dirty_since = self._retry_at = None
+        else:
+            self.failures += 1
+            delay = min(self.interval * 2 ** (self.failures - 1), self.MAX_RETRY_DELAY)
+            self._retry_at = time.monotonic() + delay
+        return saved
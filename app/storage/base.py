@@ -0,0 +1,155 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class StorageBackend(ABC):
+    """
+    Write-through persistence for inventory mutations.
+
+    An Inventory with a backend attached hands it every transaction it
+    logs together with the state of the item the mutation touched.
+    Backends that can answer transaction queries themselves override the
+    query methods; returning None tells the Inventory to fall back to
+    its in-memory transaction log.
+    """
+
+    @abstractmethod
+    def append(self, txn: Dict, item: Optional[Dict] = None,
+               removed: Optional[str] = None) -> int:
+        """
+        Persist one mutation.
+
+        Args:
+            txn: Serialized transaction logged by the mutation
+            item: Item state after the mutation (for adds and updates)
+            removed: Name of the item removed by the mutation
+
+        Returns:
+            int: Sequence number of the persisted mutation
+        """
+
+    def append_batch(self, entries: List[Tuple[Dict, Dict]]) -> int:
+        """
+        Persist several item-updating mutations at once.
+
+        Args:
+            entries: (serialized transaction, item state after it) pairs
+
+        Returns:
+            int: Sequence number of the last mutation
+        """
+        sequence = 0
+        for txn, item in entries:
+            sequence = self.append(txn, item=item)
+        return sequence
+
+    def sync(self) -> None:
+        """Force persisted mutations to disk."""
+
+    def checkpoint_due(self) -> bool:
+        """Check whether the Inventory should write a full snapshot."""
+        return False
+
+    def close(self) -> None:
+        """Release the backend's files or connections."""
+
+    def transactions_by_type(self, transaction_type: str) -> Optional[List[Dict]]:
+        """
+        Query serialized transactions of one type, in log order.
+
+        Returns:
+            List of transaction dicts, or None if the backend cannot query
+        """
+        return None
+
+    def transactions_between(self, start_micros: int, end_micros: int) -> Optional[List[Dict]]:
+        """
+        Query serialized transactions with start <= timestamp < end, in log order.
+
+        Args:
+            start_micros: Lower bound, in microseconds since the epoch
+            end_micros: Upper bound (exclusive), in microseconds since the epoch
+
+        Returns:
+            List of transaction dicts, or None if the backend cannot query
+        """
+        return None
+
+    def transactions_for_item(self, name: str) -> Optional[List[Dict]]:
+        """
+        Query serialized transactions of one produce name, in log order.
+
+        Args:
+            name: Produce name, matched ignoring case and surrounding whitespace
+
+        Returns:
+            List of transaction dicts, or None if the backend cannot query
+        """
+        return None
+
+    def transactions_page(self, limit: int, before: Optional[int] = None, offset: int = 0,
+                          transaction_type: Optional[str] = None,
+                          start_micros: Optional[int] = None,
+                          end_micros: Optional[int] = None) -> Optional[List[Tuple[int, Dict]]]:
+        """
+        Query one page of serialized transactions, newest first.
+
+        Args:
+            limit: Maximum number of transactions to return
+            before: Only return transactions stored before this sequence
+                number; None starts at the newest
+            offset: Number of matching transactions to skip first
+            transaction_type: Only return transactions of this type
+            start_micros: Only return transactions with timestamp >= this
+            end_micros: Only return transactions with timestamp < this
+
+        Returns:
+            (sequence number, transaction dict) pairs, or None if the
+            backend cannot query
+        """
+        return None
+
+
+class DatabaseBackend(StorageBackend):
+    """
+    Backend that holds the complete inventory state itself.
+
+    Unlike the journal, which only records changes on top of a JSON
+    snapshot, a database backend can be loaded from on its own.
+    """
+
+    path: str
+
+    @abstractmethod
+    def is_empty(self) -> bool:
+        """Check whether the backend holds no inventory yet."""
+
+    @abstractmethod
+    def load_items(self) -> List[Dict]:
+        """Get all serialized produce items in insertion order."""
+
+    @abstractmethod
+    def load_total_revenue(self) -> str:
+        """Get the stored total revenue as a decimal string."""
+
+    @abstractmethod
+    def history(self):
+        """
+        Get the stored transaction log as a deferred history.
+
+        The returned object follows the DeferredArray protocol
+        (`is_stale()` and `iter_chunks()`) and only covers transactions
+        stored at the time of the call.
+        """
+
+    @abstractmethod
+    def replace_all(self, items: Iterable[Dict], total_revenue: str,
+                    transactions: Iterator[Dict]) -> None:
+        """
+        Replace everything stored with the given inventory state.
+
+        Args:
+            items: Serialized produce items
+            total_revenue: Total revenue as a decimal string
+            transactions: Serialized transactions in log order
+        """
@@ -0,0 +1,134 @@
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.storage import serialization
+from app.storage.base import StorageBackend
+
+
+class TransactionJournal(StorageBackend):
+    """
+    Append-only write-ahead log of inventory mutations.
+
+    Each mutation is written as one compact JSON line carrying a sequence
+    number, the transaction it logged and the resulting item state. The
+    journal lives next to a JSON snapshot; a checkpoint rewrites the
+    snapshot and truncates the journal, so startup only replays the tail.
+    """
+
+    SUFFIX = ".journal"
+
+    def __init__(self, path: str, sequence: int = 0, checkpoint_interval: int = 1000):
+        """
+        Open a journal for appending.
+
+        Args:
+            path: Journal file path
+            sequence: Last sequence number already applied
+            checkpoint_interval: Records to accumulate before a checkpoint is due
+        """
+        if checkpoint_interval <= 0:
+            raise ValueError("Checkpoint interval must be positive")
+
+        self.path = path
+        self.sequence = sequence
+        self.checkpoint_interval = checkpoint_interval
+        self.pending = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    @classmethod
+    def path_for(cls, snapshot_path: str) -> str:
+        """Get the journal path belonging to a snapshot file."""
+        return snapshot_path + cls.SUFFIX
+
+    def append(self, txn: Dict, item: Optional[Dict] = None,
+               removed: Optional[str] = None) -> int:
+        """
+        Append one mutation record.
+
+        Args:
+            txn: Serialized transaction logged by the mutation
+            item: Item state after the mutation (for adds and updates)
+            removed: Name of the item removed by the mutation
+
+        Returns:
+            int: Sequence number of the new record
+        """
+        self.sequence += 1
+        record = {"seq": self.sequence, "txn": txn}
+        if item is not None:
+            record["item"] = item
+        if removed is not None:
+            record["removed"] = removed
+        self._file.write(serialization.dumps(record) + "\n")
+        self._file.flush()
+        self.pending += 1
+        return self.sequence
+
+    def append_batch(self, entries: List[Tuple[Dict, Dict]]) -> int:
+        """
+        Append several item-updating mutations with a single write.
+
+        Args:
+            entries: (serialized transaction, item state after it) pairs
+
+        Returns:
+            int: Sequence number of the last record
+        """
+        lines = []
+        for txn, item in entries:
+            self.sequence += 1
+            lines.append(serialization.dumps({"seq": self.sequence, "txn": txn, "item": item}))
+        if lines:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            self.pending += len(lines)
+        return self.sequence
+
+    def sync(self) -> None:
+        """Force appended records to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def checkpoint_due(self) -> bool:
+        """Check whether enough records have accumulated for a checkpoint."""
+        return self.pending >= self.checkpoint_interval
+
+    def truncate(self) -> None:
+        """Drop all records; called once a snapshot covers them."""
+        self._file.seek(0)
+        self._file.truncate()
+        self.sync()
+        self.pending = 0
+
+    def close(self) -> None:
+        """Flush and close the journal file."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    @staticmethod
+    def read(path: str, after_sequence: int = 0) -> Iterator[Dict]:
+        """
+        Read journal records newer than a snapshot.
+
+        A torn final line (crash mid-append) is ignored.
+
+        Args:
+            path: Journal file path
+            after_sequence: Sequence number already covered by the snapshot
+
+        Yields:
+            Dict: Journal records in append order
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = serialization.loads(line)
+                except ValueError:
+                    break
+                if record["seq"] > after_sequence:
+                    yield record
@@ -0,0 +1,238 @@
+import json
+import os
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.models.transaction_store import TransactionStore
+from app.storage import serialization
+from app.storage.atomic import atomic_write
+from app.storage.streaming import DeferredArray
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """Get (size, mtime, inode) of a file, or None if it cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+
+class SavedFile:
+    """
+    An inventory file as it was last saved or loaded.
+
+    Remembers the file's signature, so a later save can tell whether the
+    file is still exactly what was written, and for JSON files the byte
+    range holding the elements of its transactions array, which a later
+    save can copy instead of encoding those transactions again.
+    """
+
+    __slots__ = ("path", "signature", "history_start", "history_end", "has_history", "compact")
+
+    def __init__(self, path: str, history_start: Optional[int] = None,
+                 history_end: Optional[int] = None, has_history: bool = False,
+                 signature: Optional[Tuple[int, int, int]] = None, compact: bool = False):
+        """
+        Args:
+            path: File path
+            history_start: Offset just past the transactions array's "["
+            history_end: Offset just past its last element
+            has_history: Whether the array has any elements
+            signature: File signature; read from the file by default
+            compact: Whether the history is written without whitespace
+        """
+        self.path = path
+        self.signature = signature if signature is not None else file_signature(path)
+        self.history_start = history_start
+        self.history_end = history_end
+        self.has_history = has_history
+        self.compact = compact
+
+    def reusable(self, compact: bool = False) -> bool:
+        """Whether the file's history can be copied into a new save in the given mode."""
+        if self.history_start is None:
+            return False
+        return not self.has_history or self.compact == compact
+
+    def is_intact(self) -> bool:
+        """Check that the file was not changed or replaced since."""
+        return self.signature is not None and file_signature(self.path) == self.signature
+
+
+class JSONSnapshot:
+    """
+    JSON inventory file writer that can reuse an earlier save's history.
+
+    Files are laid out exactly as `json.dump(data, indent=2)` lays them
+    out, or with no whitespace at all in compact mode, with the items
+    first and the transactions array last. Transactions are encoded
+    straight from the store's columns through a fixed row template, and
+    everything else through the fastest JSON library installed (see
+    app.storage.serialization).
+
+    Each write returns a SavedFile recording where the array's elements
+    sit, so the next save of a history that has only grown copies those
+    bytes verbatim and encodes just the new rows; item fragments are
+    encoded separately so unchanged items can be cached by the caller.
+    """
+
+    INDENT = 2
+    ROWS_PER_WRITE = 10000
+    COPY_CHUNK = 1 << 20
+
+    @staticmethod
+    def _row_template(indent: str, separator: str) -> str:
+        """Build the %-template of an encoded transaction at array depth."""
+        fields = [f'{indent * 3}"{field}"{separator}%s' for field in TransactionStore.FIELDS]
+        newline = "\n" if indent else ""
+        return "{" + newline + ("," + newline).join(fields) + newline + indent * 2 + "}"
+
+    @classmethod
+    def _layout(cls, compact: bool) -> Tuple[str, str, str]:
+        """Get the (indent, key separator, element prefix) of a layout."""
+        if compact:
+            return "", ":", ""
+        indent = " " * cls.INDENT
+        return indent, ": ", "\n" + indent * 2
+
+    @classmethod
+    def encode_item(cls, value: Dict, compact: bool = False) -> str:
+        """Encode one element of a top-level array, indented for its position."""
+        if compact:
+            return serialization.dumps(value)
+        return serialization.dumps(value, cls.INDENT).replace("\n", cls._layout(False)[2])
+
+    @classmethod
+    def write(cls, path: str, data: Dict, items: List[str], history: TransactionStore,
+              previous: Optional[SavedFile] = None, compact: bool = False) -> SavedFile:
+        """
+        Atomically write an inventory file.
+
+        Args:
+            path: File path to write
+            data: JSON-serializable top-level values other than the items
+                and transactions
+            items: Items already encoded with `encode_item` in the same mode
+            history: Transactions to write; only the rows added since
+                `previous` when it is given
+            previous: Earlier save in the same mode whose transactions are
+                copied ahead of `history`
+            compact: Write no whitespace instead of indenting
+
+        Returns:
+            SavedFile: The new file and the location of its history
+
+        Raises:
+            ValueError: If `previous` was changed since it was saved
+        """
+        indent, separator, element = cls._layout(compact)
+        newline = "\n" if indent else ""
+        close = newline + indent + "]"
+
+        produces = "[" + element + ("," + element).join(items) + close if items else "[]"
+        members = [f'{indent}"produces"{separator}{produces}']
+        for key, value in data.items():
+            text = serialization.dumps(value, None if compact else cls.INDENT)
+            members.append(f"{indent}{json.dumps(key)}{separator}" + text.replace("\n", newline + indent))
+        members.append(f'{indent}"transactions"{separator}[')
+
+        row_separator = "," + element
+        with atomic_write(path, "wb") as file:
+            file.write(("{" + newline + ("," + newline).join(members)).encode("utf-8"))
+            start = file.tell()
+            has_history = False
+            if previous is not None:
+                cls._copy_history(previous, file)
+                has_history = previous.has_history
+
+            for text in cls._encode_history(history, compact):
+                file.write(((row_separator if has_history else element) + text).encode("utf-8"))
+                has_history = True
+            end = file.tell()
+            file.write(((close if has_history else "]") + newline + "}").encode("utf-8"))
+        return SavedFile(path, start, end, has_history, compact=compact)
+
+    @classmethod
+    def _encode_history(cls, history: TransactionStore, compact: bool) -> Iterator[str]:
+        """
+        Encode transactions in chunks of elements joined by their separators.
+
+        Rows are formatted straight from the store's columns through a
+        row template, except with orjson, which encodes dicts so fast
+        that building them first is quicker still.
+        """
+        indent, separator, element = cls._layout(compact)
+        if serialization.encodes_dicts_fast():
+            rows = history.iter_dicts()
+            # Leading "[" plus element prefix, and the closing line, of an indented array
+            head, tail = (1, 1) if compact else (1 + len(element), len(indent) + 2)
+            while True:
+                chunk = list(islice(rows, cls.ROWS_PER_WRITE))
+                if not chunk:
+                    return
+                text = serialization.dumps(chunk, None if compact else cls.INDENT)
+                if not compact:
+                    text = text.replace("\n", "\n" + indent)
+                yield text[head:-tail]
+
+        template = cls._row_template(indent, separator)
+        row_separator = "," + element
+        rows = history.iter_json_fields()
+        while True:
+            chunk = [template % fields for fields in islice(rows, cls.ROWS_PER_WRITE)]
+            if not chunk:
+                return
+            yield row_separator.join(chunk)
+
+    @classmethod
+    def _copy_history(cls, previous: SavedFile, file) -> None:
+        """Copy the transactions of an earlier save into `file`."""
+        with open(previous.path, "rb") as source:
+            stat = os.fstat(source.fileno())
+            if (stat.st_size, stat.st_mtime_ns, stat.st_ino) != previous.signature:
+                raise ValueError(f"{previous.path} changed since it was saved")
+            source.seek(previous.history_start)
+            remaining = previous.history_end - previous.history_start
+            while remaining:
+                chunk = source.read(min(cls.COPY_CHUNK, remaining))
+                if not chunk:
+                    raise ValueError(f"{previous.path} is truncated")
+                file.write(chunk)
+                remaining -= len(chunk)
+
+    @classmethod
+    def locate(cls, deferred: DeferredArray) -> Optional[SavedFile]:
+        """
+        Find the extent of a deferred transactions array.
+
+        The array must close the file's top-level object, as it does in
+        every file this class writes.
+
+        Returns:
+            SavedFile for the array's file, or None if the array is not the
+            last value in it or the file changed since it was read
+        """
+        signature = file_signature(deferred.path)
+        if signature is None or deferred.is_stale():
+            return None
+        whitespace = b" \t\n\r"
+        with open(deferred.path, "rb") as file:
+            file.seek(deferred.byte_offset + 1)
+            # Indented files have whitespace before the first element
+            compact = file.read(1) not in whitespace
+            tail_start = max(deferred.byte_offset, signature[0] - cls.COPY_CHUNK)
+            file.seek(tail_start)
+            tail = file.read().rstrip(whitespace)
+        if not tail.endswith(b"}"):
+            return None
+        tail = tail[:-1].rstrip(whitespace)
+        if not tail.endswith(b"]"):
+            return None
+        body = tail[:-1].rstrip(whitespace)
+        if not body:
+            return None
+        last = tail_start + len(body) - 1
+        if last == deferred.byte_offset:
+            # Nothing but whitespace between the brackets
+            return SavedFile(deferred.path, last + 1, last + 1, False, signature)
+        return SavedFile(deferred.path, deferred.byte_offset + 1, last + 1, True, signature, compact)
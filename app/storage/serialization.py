@@ -0,0 +1,108 @@
+"""
+JSON encoding for inventory files, using a faster library when installed.
+
+orjson is preferred, then ujson, then the standard library. Whichever is
+used, output parses back to the same values, so files stay readable by
+every backend; only whitespace and the escaping of non-ASCII text may
+differ.
+"""
+import json
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+def _stdlib_dumps(value: Any, indent: Optional[int]) -> str:
+    if indent is None:
+        return json.dumps(value, separators=(",", ":"))
+    return json.dumps(value, indent=indent)
+
+
+def _orjson_dumps(value: Any, indent: Optional[int]) -> str:
+    if indent is None:
+        return orjson.dumps(value).decode("utf-8")
+    if indent == 2:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return _stdlib_dumps(value, indent)
+
+
+def _ujson_dumps(value: Any, indent: Optional[int]) -> str:
+    # ujson's indented layout differs from json.dump's, so only compact output uses it
+    if indent is None:
+        return ujson.dumps(value, ensure_ascii=False, escape_forward_slashes=False)
+    return _stdlib_dumps(value, indent)
+
+
+# Backend name -> (dumps, loads), for the backends importable here
+BACKENDS: Dict[str, Tuple[Callable[[Any, Optional[int]], str], Callable[[Union[str, bytes]], Any]]] = {}
+if orjson is not None:
+    BACKENDS["orjson"] = (_orjson_dumps, orjson.loads)
+if ujson is not None:
+    BACKENDS["ujson"] = (_ujson_dumps, ujson.loads)
+BACKENDS["json"] = (_stdlib_dumps, json.loads)
+
+_backend = next(iter(BACKENDS))
+_dumps, _loads = BACKENDS[_backend]
+
+
+def backend() -> str:
+    """Get the name of the JSON library in use."""
+    return _backend
+
+
+def encodes_dicts_fast() -> bool:
+    """
+    Whether the library in use encodes dicts fast enough that building
+    them beats formatting rows by hand (true of orjson only).
+    """
+    return _backend == "orjson"
+
+
+def set_backend(name: str) -> None:
+    """
+    Choose the JSON library to use.
+
+    Args:
+        name: "orjson", "ujson" or "json"
+
+    Raises:
+        ValueError: If the library is not installed
+    """
+    global _backend, _dumps, _loads
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend '{name}' is not available (installed: {', '.join(BACKENDS)})")
+    _backend = name
+    _dumps, _loads = BACKENDS[name]
+
+
+def dumps(value: Any, indent: Optional[int] = None) -> str:
+    """
+    Encode a value as JSON.
+
+    Args:
+        value: JSON-serializable value
+        indent: Spaces per nesting level; None for compact output with no
+            whitespace at all
+
+    Returns:
+        str: The encoded value
+    """
+    return _dumps(value, indent)
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """
+    Decode a JSON document.
+
+    Raises:
+        ValueError: If the text is not valid JSON
+    """
+    return _loads(text)
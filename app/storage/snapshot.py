@@ -0,0 +1,215 @@
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+from app.models.transaction_store import TransactionStore
+from app.storage.atomic import atomic_write
+
+
+class BinarySnapshot:
+    """
+    Compact binary inventory snapshot.
+
+    The file starts with a fixed header (magic bytes, format version,
+    flags, CRC-32 of the body and the body length), followed by
+    length-prefixed sections: a small JSON section with the items and
+    totals, a string table holding every produce name, note and
+    non-canonical timestamp once, and the raw bytes of each column of the
+    TransactionStore plus its sparse side tables.
+
+    Loading memory-maps the file, verifies the checksum and copies the
+    columns straight into arrays, without parsing or validating rows
+    one by one, so cold starts stay fast even with millions of
+    transactions.
+    """
+
+    MAGIC = b"FPINVSNP"
+    VERSION = 1
+    SUFFIXES = (".snap",)
+    # magic, version, flags, CRC-32 of the body, body length
+    HEADER = struct.Struct("<8sHHIQ")
+    SECTION = struct.Struct("<Q")
+    # Set when the columns were written on a big-endian machine
+    FLAG_BIG_ENDIAN = 1
+
+    # Typecodes of the sections following the JSON and string text sections
+    ARRAY_SECTIONS = (
+        ("string_offsets", "Q"),
+        ("types", "B"),
+        ("names", "I"),
+        ("quantities", "d"),
+        ("prices", "d"),
+        ("timestamps", "q"),
+        ("name_ids", "I"),
+        ("note_rows", "I"),
+        ("note_ids", "I"),
+        ("raw_timestamp_rows", "I"),
+        ("raw_timestamp_ids", "I"),
+        ("float_quantity_rows", "I"),
+    )
+
+    @classmethod
+    def is_snapshot(cls, path: str) -> bool:
+        """Check whether a file starts with the snapshot magic bytes."""
+        try:
+            with open(path, "rb") as file:
+                return file.read(len(cls.MAGIC)) == cls.MAGIC
+        except OSError:
+            return False
+
+    @classmethod
+    def write(cls, path: str, data: Dict, store: TransactionStore) -> None:
+        """
+        Write a snapshot, atomically replacing any existing file.
+
+        Args:
+            path: File path to write
+            data: JSON-serializable top-level data (items, totals, ...)
+            store: Transaction history to write column by column
+        """
+        columns = store.columns()
+        strings: List[str] = []
+        string_ids: Dict[str, int] = {}
+
+        def ids_of(values: Iterable[str]) -> array:
+            ids = array("I")
+            for value in values:
+                code = string_ids.get(value)
+                if code is None:
+                    code = string_ids[value] = len(strings)
+                    strings.append(value)
+                ids.append(code)
+            return ids
+
+        notes = columns["notes"]
+        raw_timestamps = columns["raw_timestamps"]
+        arrays = {
+            "types": columns["types"],
+            "names": columns["names"],
+            "quantities": columns["quantities"],
+            "prices": columns["prices"],
+            "timestamps": columns["timestamps"],
+            "name_ids": ids_of(columns["name_table"]),
+            "note_rows": array("I", notes),
+            "note_ids": ids_of(notes.values()),
+            "raw_timestamp_rows": array("I", raw_timestamps),
+            "raw_timestamp_ids": ids_of(raw_timestamps.values()),
+            "float_quantity_rows": array("I", sorted(columns["float_quantities"])),
+        }
+        # Offsets are in characters, so the text decodes in one call
+        offsets = arrays["string_offsets"] = array("Q", [0])
+        for value in strings:
+            offsets.append(offsets[-1] + len(value))
+
+        meta = dict(data, rows=len(store), in_time_order=columns["in_time_order"])
+        sections = [json.dumps(meta).encode("utf-8"), "".join(strings).encode("utf-8")]
+        sections.extend(arrays[name] for name, _ in cls.ARRAY_SECTIONS)
+
+        checksum = 0
+        body_length = 0
+        prefixes = []
+        for section in sections:
+            size = memoryview(section).nbytes
+            prefix = cls.SECTION.pack(size)
+            checksum = zlib.crc32(section, zlib.crc32(prefix, checksum))
+            body_length += len(prefix) + size
+            prefixes.append(prefix)
+
+        flags = cls.FLAG_BIG_ENDIAN if sys.byteorder == "big" else 0
+        with atomic_write(path, "wb") as file:
+            file.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, flags, checksum, body_length))
+            for prefix, section in zip(prefixes, sections):
+                file.write(prefix)
+                file.write(section)
+
+    @classmethod
+    def read(cls, path: str) -> Tuple[Dict, TransactionStore]:
+        """
+        Read a snapshot through a memory map.
+
+        Args:
+            path: Snapshot file path
+
+        Returns:
+            Tuple of (top-level data, transaction history)
+
+        Raises:
+            ValueError: If the file is not a snapshot, has an unsupported
+                version, is truncated or fails its checksum
+        """
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < cls.HEADER.size:
+                raise ValueError("Snapshot is truncated")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    return cls._decode(view)
+                finally:
+                    view.release()
+
+    @classmethod
+    def _decode(cls, view: memoryview) -> Tuple[Dict, TransactionStore]:
+        magic, version, flags, checksum, body_length = cls.HEADER.unpack_from(view)
+        if magic != cls.MAGIC:
+            raise ValueError("Not an inventory snapshot")
+        if version > cls.VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}")
+        end = cls.HEADER.size + body_length
+        if end > len(view):
+            raise ValueError("Snapshot is truncated")
+        with view[cls.HEADER.size:end] as body:
+            if zlib.crc32(body) != checksum:
+                raise ValueError("Snapshot checksum mismatch")
+
+        swap = bool(flags & cls.FLAG_BIG_ENDIAN) != (sys.byteorder == "big")
+        sections = cls._sections(view, cls.HEADER.size, end)
+        with next(sections) as section:
+            meta = json.loads(bytes(section))
+        with next(sections) as section:
+            text = str(section, "utf-8")
+        arrays = {}
+        for name, typecode in cls.ARRAY_SECTIONS:
+            values = array(typecode)
+            with next(sections) as section:
+                values.frombytes(section)
+            if swap:
+                values.byteswap()
+            arrays[name] = values
+
+        offsets = arrays["string_offsets"]
+        strings = [text[start:stop] for start, stop in zip(offsets, offsets[1:])]
+        rows = meta.pop("rows")
+        if any(len(arrays[name]) != rows for name in ("types", "names", "quantities", "prices", "timestamps")):
+            raise ValueError("Snapshot columns do not match its row count")
+
+        store = TransactionStore.from_columns({
+            "types": arrays["types"],
+            "names": arrays["names"],
+            "quantities": arrays["quantities"],
+            "prices": arrays["prices"],
+            "timestamps": arrays["timestamps"],
+            "name_table": [sys.intern(strings[code]) for code in arrays["name_ids"]],
+            "notes": zip(arrays["note_rows"], (strings[code] for code in arrays["note_ids"])),
+            "float_quantities": arrays["float_quantity_rows"],
+            "raw_timestamps": zip(arrays["raw_timestamp_rows"],
+                                  (strings[code] for code in arrays["raw_timestamp_ids"])),
+            "in_time_order": meta.pop("in_time_order")
+        })
+        return meta, store
+
+    @classmethod
+    def _sections(cls, view: memoryview, start: int, end: int) -> Iterator[memoryview]:
+        """Yield each length-prefixed section of the body as a view."""
+        position = start
+        while position < end:
+            (length,) = cls.SECTION.unpack_from(view, position)
+            position += cls.SECTION.size
+            if position + length > end:
+                raise ValueError("Snapshot is truncated")
+            yield view[position:position + length]
+            position += length
+        raise ValueError("Snapshot is missing sections")
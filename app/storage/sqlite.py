@@ -0,0 +1,354 @@
+import os
+import sqlite3
+import threading
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from app.models.money import amount
+from app.models.transaction_store import timestamp_micros
+from app.storage.base import DatabaseBackend
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS produce_items (
+    id INTEGER PRIMARY KEY,
+    name_key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    quantity NOT NULL,
+    price_per_unit REAL NOT NULL,
+    category TEXT NOT NULL,
+    unit_of_measurement TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS produce_items_category ON produce_items (category);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    produce_name TEXT NOT NULL,
+    quantity NOT NULL,
+    unit_price REAL NOT NULL,
+    note TEXT NOT NULL DEFAULT '',
+    timestamp TEXT NOT NULL,
+    moment INTEGER NOT NULL,
+    name_key TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS transactions_type ON transactions (type, id);
+CREATE INDEX IF NOT EXISTS transactions_moment ON transactions (moment);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+# Created once the name_key column is known to exist, which databases
+# written before it was added only have after `_migrate`
+NAME_INDEX = "CREATE INDEX IF NOT EXISTS transactions_name ON transactions (name_key, id)"
+
+# Statements are fixed strings so sqlite3's per-connection cache compiles
+# each one once; only the bound parameters change between calls.
+INSERT_TRANSACTION = (
+    "INSERT INTO transactions (type, produce_name, quantity, unit_price, note, timestamp, moment, name_key) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+UPSERT_ITEM = (
+    "INSERT INTO produce_items (name_key, name, quantity, price_per_unit, category, unit_of_measurement) "
+    "VALUES (?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (name_key) DO UPDATE SET name = excluded.name, quantity = excluded.quantity, "
+    "price_per_unit = excluded.price_per_unit, category = excluded.category, "
+    "unit_of_measurement = excluded.unit_of_measurement"
+)
+DELETE_ITEM = "DELETE FROM produce_items WHERE name_key = ?"
+SET_META = "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)"
+GET_META = "SELECT value FROM meta WHERE key = ?"
+TRANSACTION_COLUMNS = "type, produce_name, quantity, unit_price, note, timestamp"
+SELECT_BY_TYPE = f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE type = ? ORDER BY id"
+SELECT_BY_NAME = f"SELECT {TRANSACTION_COLUMNS} FROM transactions WHERE name_key = ? ORDER BY id"
+SELECT_BETWEEN = (
+    f"SELECT {TRANSACTION_COLUMNS} FROM transactions "
+    "WHERE moment >= ? AND moment < ? ORDER BY id"
+)
+SELECT_CHUNK = (
+    f"SELECT id, {TRANSACTION_COLUMNS} FROM transactions "
+    "WHERE id > ? AND id <= ? ORDER BY id LIMIT ?"
+)
+SELECT_PAGE = (
+    f"SELECT id, {TRANSACTION_COLUMNS} FROM transactions "
+    "WHERE {conditions} ORDER BY id DESC LIMIT ? OFFSET ?"
+)
+SQLITE_MAX_INTEGER = 2 ** 63 - 1
+SELECT_ITEMS = (
+    "SELECT name, quantity, price_per_unit, category, unit_of_measurement "
+    "FROM produce_items ORDER BY id"
+)
+
+
+class SQLiteStorage(DatabaseBackend):
+    """
+    Inventory storage in a SQLite database.
+
+    Items and transactions live in indexed tables, so the transaction
+    filters run as index lookups instead of scans of the in-memory log.
+    Each mutation is written in its own transaction (a bulk sale in one
+    transaction), and the database runs in WAL mode so readers never
+    block the writer. A single connection is shared by all threads and
+    guarded by a lock.
+    """
+
+    # File extensions the CLI and API open as SQLite databases
+    SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a database.
+
+        Args:
+            path: Database file path
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL makes NORMAL crash-safe; sync() forces a durable checkpoint
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._total_revenue = Decimal(self._get_meta("total_revenue") or "0.00")
+
+    def _migrate(self) -> None:
+        """Add the transactions' name_key column to databases written without it."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(transactions)")}
+        if "name_key" not in columns:
+            with self._conn:
+                self._conn.execute("ALTER TABLE transactions ADD COLUMN name_key TEXT NOT NULL DEFAULT ''")
+                names = self._conn.execute("SELECT DISTINCT produce_name FROM transactions").fetchall()
+                self._conn.executemany("UPDATE transactions SET name_key = ? WHERE produce_name = ?",
+                                       [(self._name_key(name), name) for name, in names])
+        self._conn.execute(NAME_INDEX)
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute(GET_META, (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _name_key(name: str) -> str:
+        """Normalize a name the way Inventory's name index does."""
+        return name.strip().lower()
+
+    @staticmethod
+    def _item_row(item: Dict) -> Tuple:
+        return (SQLiteStorage._name_key(item["name"]), item["name"], item["quantity"],
+                item["price_per_unit"], item.get("category", "Uncategorized"),
+                item.get("unit_of_measurement", "unit"))
+
+    @staticmethod
+    def _transaction_row(txn: Dict) -> Tuple:
+        return (txn["type"], txn["produce_name"], txn["quantity"], txn["unit_price"],
+                txn.get("note", ""), txn["timestamp"], timestamp_micros(txn["timestamp"]),
+                SQLiteStorage._name_key(txn["produce_name"]))
+
+    @staticmethod
+    def _transaction_dict(row: Tuple) -> Dict:
+        return {
+            "type": row[0],
+            "produce_name": row[1],
+            "quantity": row[2],
+            "unit_price": row[3],
+            "note": row[4],
+            "timestamp": row[5]
+        }
+
+    def _write_transactions(self, cursor: sqlite3.Cursor, txns: List[Dict]) -> Tuple[int, Decimal]:
+        """Insert transactions and store the new total revenue; returns (last row id, revenue)."""
+        revenue = self._total_revenue
+        for txn in txns:
+            cursor.execute(INSERT_TRANSACTION, self._transaction_row(txn))
+            if txn["type"] == "sale":
+                revenue += amount(txn["quantity"], txn["unit_price"])
+        if revenue != self._total_revenue:
+            cursor.execute(SET_META, ("total_revenue", str(revenue)))
+        return cursor.lastrowid, revenue
+
+    def append(self, txn: Dict, item: Optional[Dict] = None,
+               removed: Optional[str] = None) -> int:
+        """
+        Write one mutation in a single database transaction.
+
+        Args:
+            txn: Serialized transaction logged by the mutation
+            item: Item state after the mutation (for adds and updates)
+            removed: Name of the item removed by the mutation
+
+        Returns:
+            int: Row id of the stored transaction
+        """
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.cursor()
+                row_id, revenue = self._write_transactions(cursor, [txn])
+                if item is not None:
+                    cursor.execute(UPSERT_ITEM, self._item_row(item))
+                if removed is not None:
+                    cursor.execute(DELETE_ITEM, (self._name_key(removed),))
+            self._total_revenue = revenue
+        return row_id
+
+    def append_batch(self, entries: List[Tuple[Dict, Dict]]) -> int:
+        """
+        Write several item-updating mutations in a single database transaction.
+
+        Args:
+            entries: (serialized transaction, item state after it) pairs
+
+        Returns:
+            int: Row id of the last stored transaction
+        """
+        with self._lock:
+            with self._conn:
+                cursor = self._conn.cursor()
+                row_id, revenue = self._write_transactions(cursor, [txn for txn, _ in entries])
+                # Only the final state of each item matters
+                items = {self._name_key(item["name"]): item for _, item in entries}
+                cursor.executemany(UPSERT_ITEM, [self._item_row(item) for item in items.values()])
+            self._total_revenue = revenue
+        return row_id
+
+    def sync(self) -> None:
+        """Checkpoint the write-ahead log into the database file."""
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def close(self) -> None:
+        """Checkpoint and close the connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.close()
+                self._conn = None
+
+    def transactions_by_type(self, transaction_type: str) -> List[Dict]:
+        """Query serialized transactions of one type through the type index."""
+        with self._lock:
+            rows = self._conn.execute(SELECT_BY_TYPE, (transaction_type.lower(),)).fetchall()
+        return [self._transaction_dict(row) for row in rows]
+
+    def transactions_between(self, start_micros: int, end_micros: int) -> List[Dict]:
+        """Query serialized transactions with start <= timestamp < end through the time index."""
+        with self._lock:
+            rows = self._conn.execute(SELECT_BETWEEN, (start_micros, end_micros)).fetchall()
+        return [self._transaction_dict(row) for row in rows]
+
+    def transactions_for_item(self, name: str) -> List[Dict]:
+        """Query serialized transactions of one produce name through the name index."""
+        with self._lock:
+            rows = self._conn.execute(SELECT_BY_NAME, (self._name_key(name),)).fetchall()
+        return [self._transaction_dict(row) for row in rows]
+
+    def transactions_page(self, limit: int, before: Optional[int] = None, offset: int = 0,
+                          transaction_type: Optional[str] = None,
+                          start_micros: Optional[int] = None,
+                          end_micros: Optional[int] = None) -> List[Tuple[int, Dict]]:
+        """Query one page of serialized transactions, newest first, keyed by row id."""
+        conditions = ["id < ?"]
+        params = [SQLITE_MAX_INTEGER if before is None else before]
+        if transaction_type is not None:
+            conditions.append("type = ?")
+            params.append(transaction_type.lower())
+        if start_micros is not None:
+            conditions.append("moment >= ?")
+            params.append(start_micros)
+        if end_micros is not None:
+            conditions.append("moment < ?")
+            params.append(end_micros)
+        # Only a handful of condition combinations exist, so each statement
+        # still compiles once per connection
+        query = SELECT_PAGE.format(conditions=" AND ".join(conditions))
+        with self._lock:
+            rows = self._conn.execute(query, (*params, limit, offset)).fetchall()
+        return [(row[0], self._transaction_dict(row[1:])) for row in rows]
+
+    def is_empty(self) -> bool:
+        """Check whether the database holds no items, transactions or revenue."""
+        with self._lock:
+            has_items = self._conn.execute("SELECT 1 FROM produce_items LIMIT 1").fetchone()
+            has_txns = self._conn.execute("SELECT 1 FROM transactions LIMIT 1").fetchone()
+        return not has_items and not has_txns and not self._total_revenue
+
+    def load_items(self) -> List[Dict]:
+        """Get all serialized produce items in insertion order."""
+        with self._lock:
+            rows = self._conn.execute(SELECT_ITEMS).fetchall()
+        return [{
+            "name": name,
+            "quantity": quantity,
+            "price_per_unit": price,
+            "category": category,
+            "unit_of_measurement": unit
+        } for name, quantity, price, category, unit in rows]
+
+    def load_total_revenue(self) -> str:
+        """Get the stored total revenue as a decimal string."""
+        return str(self._total_revenue)
+
+    def history(self) -> "SQLiteHistory":
+        """Get the transactions stored so far as a deferred history."""
+        with self._lock:
+            last_id = self._conn.execute("SELECT MAX(id) FROM transactions").fetchone()[0]
+        return SQLiteHistory(self, last_id or 0)
+
+    def iter_transaction_chunks(self, last_id: int, chunk_size: int = 10000) -> Iterator[List[Dict]]:
+        """
+        Read stored transactions up to a row id, in chunks.
+
+        Args:
+            last_id: Highest row id to include
+            chunk_size: Number of transactions per yielded list
+
+        Yields:
+            List of serialized transactions
+        """
+        after = 0
+        while after < last_id:
+            with self._lock:
+                rows = self._conn.execute(SELECT_CHUNK, (after, last_id, chunk_size)).fetchall()
+            if not rows:
+                return
+            after = rows[-1][0]
+            yield [self._transaction_dict(row[1:]) for row in rows]
+
+    def replace_all(self, items: Iterable[Dict], total_revenue: str,
+                    transactions: Iterator[Dict]) -> None:
+        """
+        Replace everything stored with the given inventory state, atomically.
+
+        Args:
+            items: Serialized produce items
+            total_revenue: Total revenue as a decimal string
+            transactions: Serialized transactions in log order
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM produce_items")
+                self._conn.execute("DELETE FROM transactions")
+                self._conn.executemany(UPSERT_ITEM, (self._item_row(item) for item in items))
+                self._conn.executemany(INSERT_TRANSACTION,
+                                       (self._transaction_row(txn) for txn in transactions))
+                self._conn.execute(SET_META, ("total_revenue", total_revenue))
+            self._total_revenue = Decimal(total_revenue)
+
+
+class SQLiteHistory:
+    """Transactions already in the database when it was loaded, read on demand."""
+
+    def __init__(self, storage: SQLiteStorage, last_id: int):
+        self.storage = storage
+        self.last_id = last_id
+
+    def is_stale(self) -> bool:
+        """Rows up to `last_id` never change, so the history cannot go stale."""
+        return False
+
+    def iter_chunks(self, chunk_size: int = 10000) -> Iterator[List[Dict]]:
+        """Read the history in chunks of serialized transactions."""
+        return self.storage.iter_transaction_chunks(self.last_id, chunk_size)
@@ -0,0 +1,231 @@
+import codecs
+import json
+import os
+import re
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+_SEPARATOR = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+# Characters that can continue a number cut short at the end of the buffer
+_NUMBER_TAIL = frozenset(".eE+-0123456789")
+
+
+class JSONStreamReader:
+    """
+    Incremental reader for a JSON document stored in a file.
+
+    Text is decoded in chunks and values are parsed with
+    `json.JSONDecoder.raw_decode`, so arrays can be consumed element by
+    element without loading the whole file. The reader tracks the byte
+    offset of its position so parsing can later resume from a saved point.
+    """
+
+    WHITESPACE = " \t\n\r"
+
+    def __init__(self, file, chunk_size: int = 1 << 20, byte_offset: int = 0):
+        """
+        Args:
+            file: File object opened in binary mode, positioned at `byte_offset`
+            chunk_size: Number of bytes read per chunk
+            byte_offset: Offset of the file position within the document
+        """
+        self._file = file
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._buffer_offset = byte_offset
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk, discarding consumed text. Returns False at EOF."""
+        if self._eof:
+            return False
+        if self._pos:
+            consumed = self._buffer[:self._pos]
+            self._buffer_offset += len(consumed.encode("utf-8"))
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            self._buffer += self._decoder.decode(b"", final=True)
+            return False
+        self._buffer += self._decoder.decode(chunk)
+        return True
+
+    def byte_offset(self) -> int:
+        """Get the byte offset of the current position within the file."""
+        return self._buffer_offset + len(self._buffer[:self._pos].encode("utf-8"))
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self.WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of `chars`."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} at byte {self.byte_offset()}, got {char!r}")
+        self._pos += 1
+        return char
+
+    def read_value(self) -> Any:
+        """Parse the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if self._truncated(value, end):
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def _truncated(self, value: Any, end: int) -> bool:
+        """
+        Check whether a value decoded up to `end` may be a cut-off number.
+
+        A number split at the chunk edge decodes as its prefix ("1." or
+        "3e" as 1 and 3), so it may continue in the next chunk whenever
+        the buffer ends there or the next character could extend it.
+        """
+        if self._eof or not isinstance(value, (int, float)) or isinstance(value, bool):
+            return False
+        return end == len(self._buffer) or self._buffer[end] in _NUMBER_TAIL
+
+    def iter_array(self) -> Iterator[Any]:
+        """Yield the elements of the array starting at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        raw_decode = self._json.raw_decode
+        separator = _SEPARATOR.match
+        while True:
+            # Fast path: element and separator both inside the buffer
+            try:
+                value, end = raw_decode(self._buffer, self._pos)
+                match = None if self._truncated(value, end) else separator(self._buffer, end)
+            except json.JSONDecodeError:
+                match = None
+            if match is None:
+                value = self.read_value()
+                char = self.expect(",]")
+            else:
+                self._pos = match.end()
+                char = match.group(1)
+            yield value
+            if char == "]":
+                return
+            if match is None or self._pos == len(self._buffer):
+                # Skip to the next element, refilling if the buffer ran out
+                self.peek()
+
+
+def _drop_last(elements: Iterator[Any], count: int) -> Iterator[Any]:
+    """Yield all but the last `count` elements of an iterator."""
+    held = deque()
+    for element in elements:
+        held.append(element)
+        if len(held) > count:
+            yield held.popleft()
+
+
+class DeferredArray:
+    """Reference to a JSON array inside a file, parsed only when iterated."""
+
+    def __init__(self, path: str, byte_offset: int, skip_last: int = 0):
+        """
+        Args:
+            path: File holding the array
+            byte_offset: Offset of the array's opening bracket
+            skip_last: Number of trailing elements to leave out, e.g. rows
+                a save appended that are also held in memory
+        """
+        self.path = path
+        self.byte_offset = byte_offset
+        self.skip_last = skip_last
+        stat = os.stat(path)
+        self._signature = (stat.st_size, stat.st_mtime_ns)
+
+    def is_stale(self) -> bool:
+        """Check whether the file changed since the array was located."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True
+        return (stat.st_size, stat.st_mtime_ns) != self._signature
+
+    def iter_chunks(self, chunk_size: int = 10000) -> Iterator[List[Any]]:
+        """
+        Parse the array in chunks.
+
+        Args:
+            chunk_size: Number of elements per yielded list
+
+        Yields:
+            List of decoded elements
+        """
+        with open(self.path, "rb") as file:
+            file.seek(self.byte_offset)
+            reader = JSONStreamReader(file, byte_offset=self.byte_offset)
+            elements = reader.iter_array()
+            if self.skip_last:
+                elements = _drop_last(elements, self.skip_last)
+            chunk = []
+            for element in elements:
+                chunk.append(element)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+
+def read_inventory_file(path: str, defer_key: Optional[str] = "transactions"
+                        ) -> Tuple[Dict[str, Any], Optional[DeferredArray]]:
+    """
+    Stream the top-level object of an inventory file.
+
+    Keys are parsed in file order until `defer_key` is reached; its array is
+    returned as a DeferredArray instead of being parsed, and the keys that
+    follow it are not read. Callers that need those keys can pass
+    `defer_key=None` to parse the whole document.
+
+    Args:
+        path: Inventory JSON file
+        defer_key: Top-level key whose array should be deferred
+
+    Returns:
+        Tuple of (parsed top-level keys, deferred array or None)
+    """
+    with open(path, "rb") as file:
+        reader = JSONStreamReader(file)
+        data: Dict[str, Any] = {}
+        reader.expect("{")
+        if reader.peek() == "}":
+            return data, None
+        while True:
+            key = reader.read_value()
+            reader.expect(":")
+            if key == defer_key and reader.peek() == "[":
+                return data, DeferredArray(path, reader.byte_offset())
+            if reader.peek() == "[":
+                data[key] = list(reader.iter_array())
+            else:
+                data[key] = reader.read_value()
+            if reader.expect(",}") == "}":
+                return data, None
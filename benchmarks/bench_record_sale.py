@@ -0,0 +1,52 @@
+"""
+Benchmark record_sale throughput against catalogue size.
+
+With the name index in place, the cost of a sale should stay flat as the
+number of items in the inventory grows.
+
+Usage:
+    python -m benchmarks.bench_record_sale
+"""
+import random
+import time
+
+from app.models.inventory import Inventory
+
+
+CATALOGUE_SIZES = (100, 1_000, 10_000, 50_000)
+SALES_PER_RUN = 5_000
+
+
+def build_inventory(size: int) -> Inventory:
+    """Create an inventory holding `size` distinct items."""
+    inventory = Inventory(quiet=True)
+    for i in range(size):
+        inventory.add_item(f"Item {i:06d}", 1_000_000, 1.25, "Bench", "unit")
+    return inventory
+
+
+def time_sales(inventory: Inventory, size: int, sales: int) -> float:
+    """Record `sales` random sales and return the elapsed seconds."""
+    rng = random.Random(size)
+    names = [f"item {rng.randrange(size):06d}" for _ in range(sales)]
+    start = time.perf_counter()
+    for name in names:
+        inventory.record_sale(name, 1)
+    return time.perf_counter() - start
+
+
+def main():
+    results = []
+    for size in CATALOGUE_SIZES:
+        inventory = build_inventory(size)
+        elapsed = time_sales(inventory, size, SALES_PER_RUN)
+        results.append((size, SALES_PER_RUN / elapsed))
+
+    print(f"{'items':>10} | {'sales/sec':>12}")
+    print("-" * 25)
+    for size, throughput in results:
+        print(f"{size:>10} | {throughput:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
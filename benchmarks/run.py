@@ -0,0 +1,356 @@
+"""
+Benchmark suite for core Inventory operations.
+
+Each benchmark builds a synthetic inventory (see benchmarks.synthetic),
+times one operation with time.perf_counter and, in a second identical
+run under tracemalloc, records its peak memory. Results are printed as a
+table and can be written as JSON and compared against an earlier run.
+
+Usage:
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1000 1000000 --output results.json
+    python -m benchmarks.run --compare baseline.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.models.inventory import Inventory
+from app.storage import serialization
+from benchmarks import synthetic
+
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+SALES_PER_RUN = 10_000
+QUERIES_PER_RUN = 100
+
+# name -> setup(size, workdir) returning (operation to time, operations it performs)
+BENCHMARKS: Dict[str, Callable[[int, str], Tuple[Callable[[], None], int]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark setup function under `name`."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _data_file(size: int, workdir: str) -> str:
+    """Get a synthetic inventory file of `size` items and transactions, writing it once."""
+    path = os.path.join(workdir, f"inventory_{size}.json")
+    if not os.path.exists(path):
+        synthetic.write_inventory_file(path, size, size)
+    return path
+
+
+@benchmark("add_item")
+def bench_add_item(size: int, workdir: str):
+    items = synthetic.generate_items(size)
+    inventory = Inventory(quiet=True)
+
+    def run():
+        for item in items:
+            inventory.add_item(item["name"], item["quantity"], item["price_per_unit"],
+                               item["category"], item["unit_of_measurement"])
+    return run, size
+
+
+@benchmark("record_sale")
+def bench_record_sale(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+    names = [synthetic.item_name(index % size) for index in range(SALES_PER_RUN)]
+    for name in set(names):
+        inventory.adjust_item(name, SALES_PER_RUN)
+
+    def run():
+        for name in names:
+            inventory.record_sale(name, 1)
+    return run, SALES_PER_RUN
+
+
+@benchmark("record_sale (thread_safe, 4 threads)")
+def bench_record_sale_threaded(size: int, workdir: str):
+    inventory = Inventory(quiet=True, thread_safe=True)
+    for item in synthetic.generate_items(size):
+        inventory.add_item(item["name"], item["quantity"] + SALES_PER_RUN, item["price_per_unit"],
+                           item["category"], item["unit_of_measurement"])
+    names = [synthetic.item_name(index % size) for index in range(SALES_PER_RUN)]
+
+    def sell(share):
+        for name in share:
+            inventory.record_sale(name, 1)
+
+    def run():
+        threads = [threading.Thread(target=sell, args=(names[start::4],)) for start in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return run, SALES_PER_RUN
+
+
+@benchmark("filter_transactions_by_date")
+def bench_filter_by_date(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+    first_day = (synthetic.HISTORY_END - timedelta(days=synthetic.HISTORY_DAYS)).date()
+    windows = [(first_day + timedelta(days=offset), first_day + timedelta(days=offset + 30))
+               for offset in range(0, synthetic.HISTORY_DAYS, synthetic.HISTORY_DAYS // QUERIES_PER_RUN)]
+
+    def run():
+        for start, end in windows:
+            inventory.filter_transactions_by_date(start, end)
+    return run, len(windows)
+
+
+@benchmark("get_transactions_page (sales, 5 pages)")
+def bench_transactions_page(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+
+    def run():
+        for _ in range(QUERIES_PER_RUN):
+            cursor = None
+            for _ in range(5):
+                cursor = inventory.get_transactions_page(20, after=cursor,
+                                                         transaction_type="sale")["next_cursor"]
+    return run, QUERIES_PER_RUN
+
+
+@benchmark("get_item_stats")
+def bench_item_stats(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+    names = [item.name for item in inventory.produces[:QUERIES_PER_RUN]]
+
+    def run():
+        for name in names:
+            inventory.get_item_stats(name)
+    return run, len(names)
+
+
+@benchmark("get_inventory_report")
+def bench_inventory_report(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+
+    def run():
+        for _ in range(QUERIES_PER_RUN):
+            inventory.get_inventory_report()
+    return run, QUERIES_PER_RUN
+
+
+@benchmark("generate_summary_insights (cold)")
+def bench_insights_cold(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+    return inventory.generate_summary_insights, 1
+
+
+@benchmark("generate_summary_insights (cold, 4 processes)")
+def bench_insights_cold_parallel(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+    inventory.report_workers = 4
+    return inventory.generate_summary_insights, 1
+
+
+@benchmark("generate_summary_insights (warm)")
+def bench_insights_warm(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+    inventory.generate_summary_insights()
+
+    def run():
+        for _ in range(QUERIES_PER_RUN):
+            inventory.generate_summary_insights()
+    return run, QUERIES_PER_RUN
+
+
+@benchmark("save_to_file")
+def bench_save(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+    path = os.path.join(workdir, "save.json")
+    return (lambda: inventory.save_to_file(path)), 1
+
+
+@benchmark("save_to_file (compact)")
+def bench_save_compact(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+    inventory.compact = True
+    path = os.path.join(workdir, "save_compact.json")
+    return (lambda: inventory.save_to_file(path)), 1
+
+
+@benchmark("save_to_file (compact, stdlib json)")
+def bench_save_compact_stdlib(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+    inventory.compact = True
+    path = os.path.join(workdir, "save_compact_stdlib.json")
+
+    def run():
+        previous = serialization.backend()
+        serialization.set_backend("json")
+        try:
+            inventory.save_to_file(path)
+        finally:
+            serialization.set_backend(previous)
+    return run, 1
+
+
+@benchmark("save_to_file (after 10 sales)")
+def bench_save_delta(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+    path = os.path.join(workdir, "save_delta.json")
+    inventory.save_to_file(path)
+    names = [synthetic.item_name(index % size) for index in range(10)]
+
+    def run():
+        for name in names:
+            inventory.record_sale(name, 1)
+        inventory.save_to_file(path)
+    return run, 1
+
+
+@benchmark("load_from_file")
+def bench_load(size: int, workdir: str):
+    path = _data_file(size, workdir)
+    return (lambda: Inventory(quiet=True).load_from_file(path)), 1
+
+
+@benchmark("load_from_file + history")
+def bench_load_history(size: int, workdir: str):
+    path = _data_file(size, workdir)
+
+    def run():
+        inventory = Inventory(quiet=True)
+        inventory.load_from_file(path)
+        len(inventory.transactions)
+    return run, 1
+
+
+@benchmark("load_from_file + history (.snap)")
+def bench_load_binary(size: int, workdir: str):
+    path = os.path.join(workdir, f"inventory_{size}.snap")
+    if not os.path.exists(path):
+        source = Inventory(quiet=True)
+        source.load_from_file(_data_file(size, workdir))
+        source.save_to_file(path)
+
+    def run():
+        inventory = Inventory(quiet=True)
+        inventory.load_from_file(path)
+        len(inventory.transactions)
+    return run, 1
+
+
+@benchmark("export_inventory_to_csv")
+def bench_export_inventory(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, 0)
+    path = os.path.join(workdir, "inventory.csv")
+    return (lambda: inventory.export_inventory_to_csv(path)), 1
+
+
+@benchmark("export_transactions_to_csv")
+def bench_export_transactions(size: int, workdir: str):
+    inventory = synthetic.build_inventory(size, size)
+    path = os.path.join(workdir, "transactions.csv")
+    return (lambda: inventory.export_transactions_to_csv(path)), 1
+
+
+def measure(name: str, size: int, workdir: str, memory: bool) -> Dict:
+    """Run one benchmark at one size and collect its metrics."""
+    setup = BENCHMARKS[name]
+
+    gc.collect()
+    operation, ops = setup(size, workdir)
+    start = time.perf_counter()
+    operation()
+    seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        operation, _ = setup(size, workdir)
+        gc.collect()
+        tracemalloc.start()
+        operation()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "benchmark": name,
+        "size": size,
+        "ops": ops,
+        "seconds": seconds,
+        "ops_per_sec": ops / seconds if seconds else None,
+        "peak_memory_bytes": peak
+    }
+
+
+def print_results(results: List[Dict], baseline: Optional[Dict] = None) -> None:
+    """Print results as a table, with speedups against a baseline run."""
+    header = f"{'benchmark':<38} {'size':>9} {'ops/sec':>14} {'seconds':>10} {'peak MiB':>9}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        peak = result["peak_memory_bytes"]
+        line = (f"{result['benchmark']:<38} {result['size']:>9} {result['ops_per_sec']:>14,.1f} "
+                f"{result['seconds']:>10.4f} {peak / 2**20 if peak is not None else float('nan'):>9.1f}")
+        if baseline:
+            before = baseline.get((result["benchmark"], result["size"]))
+            line += f" {before['seconds'] / result['seconds']:>7.2f}x" if before else f" {'-':>8}"
+        print(line)
+
+
+def load_baseline(path: str) -> Dict:
+    """Load an earlier JSON results file keyed by (benchmark, size)."""
+    with open(path) as file:
+        data = json.load(file)
+    return {(result["benchmark"], result["size"]): result for result in data["results"]}
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark core Inventory operations")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="catalogue and history sizes to run (default: %(default)s)")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), metavar="NAME",
+                        help="run only these benchmarks")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc pass that measures peak memory")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+
+    names = args.only or list(BENCHMARKS)
+    workdir = tempfile.mkdtemp(prefix="inventory-bench-")
+    results = []
+    try:
+        for size in args.sizes:
+            for name in names:
+                results.append(measure(name, size, workdir, not args.no_memory))
+                print(f"  {name} @ {size}: {results[-1]['seconds']:.4f}s", file=sys.stderr)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_results(results, load_baseline(args.compare) if args.compare else None)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "created": datetime.now().isoformat(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "sizes": args.sizes,
+                "results": results
+            }, file, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Synthetic inventory data for benchmarks.
+
+Data is generated from a seeded RNG so every run sees the same catalogue
+and history for a given size.
+"""
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterator, List
+
+from app.models.inventory import Inventory
+from app.models.transaction_store import TransactionStore
+
+
+CATEGORIES = ("Vegetable", "Fruit", "Grain", "Herb", "Dairy", "Legume", "Tuber", "Nut")
+UNITS = ("kg", "crate", "bunch", "unit", "bag")
+HISTORY_DAYS = 730
+# Fixed reference point so generated timestamps do not depend on the run date
+HISTORY_END = datetime(2024, 6, 30, 18, 0, 0)
+
+
+def item_name(index: int) -> str:
+    """Get the name of the synthetic item at `index`."""
+    return f"Produce {index:07d}"
+
+
+def generate_items(count: int, seed: int = 0) -> List[Dict]:
+    """Generate serialized produce items."""
+    rng = random.Random(seed)
+    return [{
+        "name": item_name(index),
+        "quantity": rng.randint(1, 1000),
+        "price_per_unit": round(rng.uniform(0.1, 25.0), 2),
+        "category": rng.choice(CATEGORIES),
+        "unit_of_measurement": rng.choice(UNITS)
+    } for index in range(count)]
+
+
+def generate_transactions(count: int, items: List[Dict], seed: int = 0) -> Iterator[Dict]:
+    """
+    Generate serialized transactions in time order over HISTORY_DAYS.
+
+    Roughly 70% sales, 20% purchases and 10% adjustments, at the item's price.
+    """
+    rng = random.Random(seed + 1)
+    start = HISTORY_END - timedelta(days=HISTORY_DAYS)
+    step = timedelta(days=HISTORY_DAYS) / max(count, 1)
+    for index in range(count):
+        item = items[rng.randrange(len(items))]
+        roll = rng.random()
+        txn_type = "sale" if roll < 0.7 else "purchase" if roll < 0.9 else "adjustment"
+        yield {
+            "type": txn_type,
+            "produce_name": item["name"],
+            "quantity": rng.randint(1, 20),
+            "unit_price": item["price_per_unit"],
+            "note": "market stall" if rng.random() < 0.1 else "",
+            "timestamp": (start + step * index).isoformat()
+        }
+
+
+def write_inventory_file(path: str, items: int, transactions: int, seed: int = 0) -> None:
+    """Write a synthetic inventory file in the format used by save_to_file."""
+    produces = generate_items(items, seed)
+    history = list(generate_transactions(transactions, produces, seed))
+    revenue = sum((Decimal(str(txn["quantity"])) * Decimal(str(txn["unit_price"]))
+                   for txn in history if txn["type"] == "sale"), Decimal("0.00"))
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as file:
+        json.dump({
+            "produces": produces,
+            "total_revenue": str(revenue),
+            "journal_sequence": 0,
+            "last_updated": HISTORY_END.isoformat(),
+            "transactions": history
+        }, file, indent=2)
+
+
+def build_inventory(items: int, transactions: int, seed: int = 0) -> Inventory:
+    """Build an in-memory synthetic inventory without touching disk."""
+    inventory = Inventory(quiet=True)
+    produces = generate_items(items, seed)
+    # Synthetic history goes straight into the store; it does not move stock
+    history = TransactionStore()
+    history.extend_dicts(generate_transactions(transactions, produces, seed))
+    inventory.transactions = history
+    for item in produces:
+        inventory.add_item(item["name"], item["quantity"], item["price_per_unit"],
+                           item["category"], item["unit_of_measurement"])
+    return inventory
@@ -1,18 +1,69 @@
+import argparse
+import cProfile
 import sys
 import os
+import threading
 from datetime import datetime, date
 from typing import Optional
 from app.models.inventory import Inventory, InventoryError
+from app.storage.autosave import AutoSaver
+from app.storage.sqlite import SQLiteStorage
 
 
 class InventoryCLI:
     
-    def __init__(self, file_path: str):
+    # Transactions shown per page of the history and filter screens
+    PAGE_SIZE = 20
+    
+    def __init__(self, file_path: str, journal: bool = False, metrics_path: Optional[str] = None,
+                 autosave: Optional[float] = None, compact: bool = False):
         self.file_path = file_path
-        self.inventory = Inventory()
-        self.inventory.load_from_file(file_path)
+        self.metrics_path = metrics_path
+        # Autosaving needs the inventory shared with a background thread
+        self.inventory = Inventory(event_sink=self.render_event, thread_safe=autosave is not None,
+                                   compact=compact)
+        if metrics_path:
+            self.inventory.enable_metrics()
+        if file_path.lower().endswith(SQLiteStorage.SUFFIXES):
+            self.inventory.open_database(file_path)
+        elif journal:
+            self.inventory.enable_journal(file_path)
+        else:
+            self.inventory.load_from_file(file_path)
+        self.inventory.subscribe_low_stock(self.render_low_stock)
+        self.autosaver = None
+        # Last autosave failure shown, so repeats of it stay quiet
+        self._autosave_error: Optional[str] = None
+        if autosave is not None:
+            self.autosaver = AutoSaver(self.inventory, file_path, interval=autosave)
+            self.autosaver.start()
         self.running = True
         
+    def render_event(self, event: dict):
+        """Render a status event reported by the inventory."""
+        if event["kind"] == "low_stock":
+            # Threshold crossings are shown by render_low_stock instead
+            return
+        if threading.current_thread() is not threading.main_thread():
+            # Autosaves stay quiet rather than interrupting the prompt, and
+            # report a failure once rather than on every retry
+            if event["kind"] == "saved":
+                self._autosave_error = None
+                return
+            if event["kind"] == "save_failed":
+                if event["message"] == self._autosave_error:
+                    return
+                self._autosave_error = event["message"]
+        print(event["message"])
+
+    def render_low_stock(self, event: dict):
+        """Alert when an item crosses its low stock threshold."""
+        if event["low"]:
+            print(f"⚠️  LOW STOCK ALERT: {event['name']} is down to {event['quantity']} "
+                  f"(threshold: {event['threshold']})")
+        else:
+            print(f"✅ {event['name']} is back above its low stock threshold ({event['quantity']} in stock)")
+
     def display_menu(self):
         """Display the main menu."""
         print("\n" + "="*50)
@@ -105,6 +156,17 @@ class InventoryCLI:
             except ValueError:
                 print("❌ Invalid date format. Please use YYYY-MM-DD (e.g., 2024-01-15)")
     
+    def write_metrics(self) -> bool:
+        """Dump the inventory's metrics to the metrics file, if one was given."""
+        if not self.metrics_path:
+            return False
+        try:
+            self.inventory.metrics.write_prometheus(self.metrics_path)
+            return True
+        except OSError as e:
+            print(f"❌ Failed to write metrics: {e}")
+            return False
+
     def show_low_stock_alert(self):
         """Show low stock alert if any items are running low."""
         low_stock_items = self.inventory.check_low_stock()
@@ -139,7 +201,6 @@ class InventoryCLI:
         
         try:
             self.inventory.add_item(name, qty, price, category, unit)
-            self.show_low_stock_alert()
         except InventoryError as e:
             print(f"❌ Error: {e}")
     
@@ -157,9 +218,7 @@ class InventoryCLI:
         note = input("Enter customer note (optional): ").strip()
         
         try:
-            success = self.inventory.record_sale(name, qty, note)
-            if success:
-                self.show_low_stock_alert()
+            self.inventory.record_sale(name, qty, note)
         except InventoryError as e:
             print(f"❌ Error: {e}")
     
@@ -190,26 +249,44 @@ class InventoryCLI:
         note = input("Reason for adjustment (optional): ").strip()
         
         try:
-            success = self.inventory.adjust_item(name, qty_change, note)
-            if success:
-                self.show_low_stock_alert()
+            self.inventory.adjust_item(name, qty_change, note)
         except InventoryError as e:
             print(f"❌ Error: {e}")
     
     def handle_view_transactions(self):
         """Handle viewing transaction history."""
-        transactions = self.inventory.get_transaction_history()
-        if not transactions:
-            print("📄 No transactions found")
+        self.page_transactions("TRANSACTION HISTORY", 80, "📄 No transactions found")
+    
+    def page_transactions(self, title: str, width: int, empty_message: str, **filters):
+        """
+        Print transactions a page at a time, newest first.
+
+        Args:
+            title: Heading printed above the first page
+            width: Width of the heading's rule
+            empty_message: Message printed if nothing matches
+            **filters: Passed on to Inventory.get_transactions_page
+        """
+        page = self.inventory.get_transactions_page(self.PAGE_SIZE, **filters)
+        if not page["transactions"]:
+            print(empty_message)
             return
         
-        print(f"\n📄 TRANSACTION HISTORY ({len(transactions)} transactions)")
-        print("-" * 80)
-        for txn in transactions[-20:]:  # Show last 20 transactions
-            print(f"  {txn}")
-        
-        if len(transactions) > 20:
-            print(f"\n... showing last 20 of {len(transactions)} transactions")
+        print(f"\n📄 {title} (newest first)")
+        print("-" * width)
+        shown = 0
+        while True:
+            for txn in page["transactions"]:
+                print(f"  {txn}")
+            shown += len(page["transactions"])
+            if page["next_cursor"] is None:
+                print(f"\n... end of list ({shown} shown)")
+                return
+            
+            choice = input(f"\n... {shown} shown. Press Enter for older transactions or 'q' to stop: ")
+            if choice.strip().lower() == "q":
+                return
+            page = self.inventory.get_transactions_page(self.PAGE_SIZE, after=page["next_cursor"], **filters)
     
     def handle_inventory_value(self):
         """Handle showing inventory value summary."""
@@ -226,14 +303,27 @@ class InventoryCLI:
     
     def handle_low_stock_report(self):
         """Handle showing low stock report."""
-        threshold = self.get_positive_int("Enter stock threshold (default 10): ")
+        while True:
+            value = input("Enter stock threshold (press Enter to use each item's own): ").strip()
+            if not value:
+                threshold = None
+                break
+            try:
+                threshold = int(value)
+                if threshold < 0:
+                    raise ValueError
+                break
+            except ValueError:
+                print("❌ Please enter a non-negative whole number")
         low_stock_items = self.inventory.check_low_stock(threshold)
+        label = "per item" if threshold is None else threshold
         
         if not low_stock_items:
-            print(f"✅ No items below {threshold} units")
+            print("✅ No items at or below their low stock threshold" if threshold is None
+                  else f"✅ No items below {threshold} units")
             return
         
-        print(f"\n⚠️  LOW STOCK REPORT (threshold: {threshold})")
+        print(f"\n⚠️  LOW STOCK REPORT (threshold: {label})")
         print("-" * 40)
         for item in low_stock_items:
             print(f"  • {item.name}: {item.quantity} {item.unit_of_measurement} (${item.price_per_unit:.2f}/unit)")
@@ -247,16 +337,8 @@ class InventoryCLI:
         print("  • refund")
         
         txn_type = input("Enter transaction type: ").strip()
-        filtered = self.inventory.filter_transactions_by_type(txn_type)
-        
-        if not filtered:
-            print(f"📄 No {txn_type} transactions found")
-            return
-        
-        print(f"\n📄 {txn_type.upper()} TRANSACTIONS ({len(filtered)} found)")
-        print("-" * 60)
-        for txn in filtered:
-            print(f"  {txn}")
+        self.page_transactions(f"{txn_type.upper()} TRANSACTIONS", 60,
+                               f"📄 No {txn_type} transactions found", transaction_type=txn_type)
     
     def handle_filter_transactions_by_date(self):
         """Handle filtering transactions by date range."""
@@ -270,16 +352,9 @@ class InventoryCLI:
             print("❌ Start date must be before end date")
             return
         
-        filtered = self.inventory.filter_transactions_by_date(start_date, end_date)
-        
-        if not filtered:
-            print(f"📄 No transactions found between {start_date} and {end_date}")
-            return
-        
-        print(f"\n📄 TRANSACTIONS FROM {start_date} TO {end_date} ({len(filtered)} found)")
-        print("-" * 70)
-        for txn in filtered:
-            print(f"  {txn}")
+        self.page_transactions(f"TRANSACTIONS FROM {start_date} TO {end_date}", 70,
+                               f"📄 No transactions found between {start_date} and {end_date}",
+                               start=start_date, end=end_date)
     
     def handle_comprehensive_report(self):
         """Handle showing comprehensive inventory report."""
@@ -325,6 +400,10 @@ class InventoryCLI:
         """Handle viewing items by category."""
         print("\n📦 VIEW ITEMS BY CATEGORY")
         print("-" * 40)
+
+        categories = self.inventory.get_categories()
+        if categories:
+            print("Categories: " + ", ".join(f"{name} ({count})" for name, count in categories.items()))
         
         category = input("Enter category name (or press Enter for all): ").strip()
         show_low_stock = input("Show only low stock items? (y/N): ").strip().lower() == 'y'
@@ -361,11 +440,11 @@ class InventoryCLI:
         print("\n📈 EXPORT INVENTORY TO CSV")
         print("-" * 40)
         
-        filename = input("Enter filename (press Enter for auto-generated): ").strip()
+        filename = input("Enter filename (.csv, or .csv.gz to compress; press Enter for auto-generated): ").strip()
         if not filename:
             filename = f"inventory_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
-        if not filename.endswith('.csv'):
+        if not filename.endswith(('.csv', '.csv.gz')):
             filename += '.csv'
         
         success = self.inventory.export_inventory_to_csv(filename)
@@ -377,11 +456,11 @@ class InventoryCLI:
         print("\n📋 EXPORT TRANSACTIONS TO CSV")
         print("-" * 40)
         
-        filename = input("Enter filename (press Enter for auto-generated): ").strip()
+        filename = input("Enter filename (.csv, or .csv.gz to compress; press Enter for auto-generated): ").strip()
         if not filename:
             filename = f"transactions_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
-        if not filename.endswith('.csv'):
+        if not filename.endswith(('.csv', '.csv.gz')):
             filename += '.csv'
         
         success = self.inventory.export_transactions_to_csv(filename)
@@ -393,11 +472,11 @@ class InventoryCLI:
         print("\n📄 EXPORT FULL REPORT TO CSV")
         print("-" * 40)
         
-        filename = input("Enter filename (press Enter for auto-generated): ").strip()
+        filename = input("Enter filename (.csv, or .csv.gz to compress; press Enter for auto-generated): ").strip()
         if not filename:
             filename = f"full_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
-        if not filename.endswith('.csv'):
+        if not filename.endswith(('.csv', '.csv.gz')):
             filename += '.csv'
         
         success = self.inventory.export_full_report_to_csv(filename)
@@ -492,6 +571,7 @@ class InventoryCLI:
                 elif choice == 8:
                     self.running = False
                 
+                self.write_metrics()
                 if choice != 6 and choice != 7 and choice != 8:  # Don't pause for submenus
                     input("\nPress Enter to continue...")
                     
@@ -503,33 +583,79 @@ class InventoryCLI:
                 input("Press Enter to continue...")
         
         # Save before exiting
+        if self.autosaver:
+            self.autosaver.stop(flush=False)
         print("\n💾 Saving inventory before exit...")
         success = self.inventory.save_to_file(self.file_path)
         if success:
             print("✅ Inventory saved successfully")
+        self.inventory.close_storage()
+        if self.write_metrics():
+            print(f"📊 Metrics written to {self.metrics_path}")
         
         print("👋 Thank you for using Farm Produce Inventory Tracker!")
 
 
+def positive_float(value: str) -> float:
+    """Parse a command-line number that must be greater than zero."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a number")
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
 def main():
     """Main entry point."""
     if len(sys.argv) < 2:
         print("❌ Please provide a file path to store your inventory.")
-        print("Usage: python main.py data/inventory.json")
+        print("Usage: python main.py data/inventory.json [--journal]")
+        print("       python main.py data/inventory.snap [--journal]")
+        print("       python main.py data/inventory.db")
         sys.exit(1)
+
+    parser = argparse.ArgumentParser(description="Farm Produce Inventory Tracker")
+    parser.add_argument("file_path",
+                        help="JSON file used to store the inventory, a .snap file for a "
+                             "binary snapshot, or a .db/.sqlite file to use a SQLite database")
+    parser.add_argument("--journal", action="store_true",
+                        help="append each change to a journal instead of rewriting the file")
+    parser.add_argument("--metrics", metavar="PATH",
+                        help="time inventory operations and keep a Prometheus text dump at PATH")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="profile the session with cProfile and write the stats to PATH")
+    parser.add_argument("--compact", action="store_true",
+                        help="save JSON without indentation, for smaller files and faster saves")
+    parser.add_argument("--autosave", metavar="SECONDS", type=positive_float,
+                        help="save unsaved changes in the background at most SECONDS after they are made")
+    args = parser.parse_args()
     
-    file_path = sys.argv[1]
+    file_path = args.file_path
     
     # Create directory if it doesn't exist
     try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
     except Exception as e:
         print(f"❌ Error creating directory: {e}")
         sys.exit(1)
     
     # Initialize and run CLI
-    cli = InventoryCLI(file_path)
-    cli.run()
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    try:
+        cli = InventoryCLI(file_path, journal=args.journal, metrics_path=args.metrics,
+                           autosave=args.autosave, compact=args.compact)
+        cli.run()
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"📊 Profile written to {args.profile} (view with: python -m pstats {args.profile})")
 
 
 if __name__ == "__main__":
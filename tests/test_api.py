@@ -0,0 +1,168 @@
+import unittest
+import asyncio
+import json
+import os
+import tempfile
+from app.api.endpoints import InventoryAPI
+from app.api.server import start_server
+from app.api.service import InventoryService
+
+
+class TestInventoryAPI(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "inventory.json")
+        self.service = InventoryService(self.path)
+        await self.service.start()
+        self.server = await start_server(InventoryAPI(self.service), "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        await self.service.stop()
+        self.temp_dir.cleanup()
+
+    async def request(self, method, path, body=None):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        payload = json.dumps(body).encode() if body is not None else b""
+        writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+                     f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+
+    async def test_item_lifecycle(self):
+        status, body = await self.request("POST", "/items", {"name": "Tomato", "quantity": 10, "price": 1.5})
+        self.assertEqual(status, 201)
+        self.assertEqual(body["item"]["quantity"], 10)
+
+        status, body = await self.request("GET", "/items/tomato")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["item"]["name"], "Tomato")
+
+        status, body = await self.request("POST", "/items/Tomato/adjustments", {"quantity_change": -3})
+        self.assertEqual(status, 201)
+        self.assertEqual(body["item"]["quantity"], 7)
+
+        status, body = await self.request("POST", "/items/Tomato/adjustments", {"quantity_change": -30})
+        self.assertEqual(status, 409)
+        self.assertEqual(body["error"], "invalid_adjustment")
+
+        status, _ = await self.request("DELETE", "/items/Tomato")
+        self.assertEqual(status, 200)
+        status, body = await self.request("GET", "/items/Tomato")
+        self.assertEqual(status, 404)
+
+    async def test_sales_and_reports(self):
+        await self.request("POST", "/items", {"name": "Tomato", "quantity": 20, "price": 1.5})
+        status, body = await self.request("POST", "/sales", {"name": "Tomato", "quantity": 4})
+        self.assertEqual(status, 201)
+        self.assertEqual(body["amount"], "6.0")
+        self.assertEqual(body["remaining"], 16)
+
+        status, body = await self.request("POST", "/sales", {"name": "Tomato", "quantity": 40})
+        self.assertEqual(status, 409)
+        status, body = await self.request("POST", "/sales", {"name": "Tomato", "quantity": -1})
+        self.assertEqual(status, 400)
+
+        status, body = await self.request("GET", "/reports/inventory")
+        self.assertEqual(status, 200)
+        self.assertEqual(body["report"]["total_revenue"], 6.0)
+        status, body = await self.request("GET", "/reports/summary")
+        self.assertEqual(body["summary"]["top_selling_item"], "Tomato")
+
+    async def test_concurrent_sales_are_batched_without_overselling(self):
+        await self.request("POST", "/items", {"name": "Tomato", "quantity": 50, "price": 1.0})
+        responses = await asyncio.gather(*(
+            self.request("POST", "/sales", {"name": "Tomato", "quantity": 1}) for _ in range(80)))
+
+        self.assertEqual(sum(1 for status, _ in responses if status == 201), 50)
+        self.assertEqual(sum(1 for status, _ in responses if status == 409), 30)
+        _, body = await self.request("GET", "/items/Tomato")
+        self.assertEqual(body["item"]["quantity"], 0)
+        # Far fewer snapshots than sales means sales were grouped into batches
+        self.assertLess(body["version"], 80)
+
+    async def test_unknown_routes_and_bad_bodies(self):
+        status, body = await self.request("GET", "/nowhere")
+        self.assertEqual(status, 404)
+        status, body = await self.request("PUT", "/sales", {})
+        self.assertEqual(status, 405)
+        status, body = await self.request("POST", "/items", {"name": "Tomato"})
+        self.assertEqual(status, 400)
+
+    async def test_non_string_fields_are_rejected_before_writing(self):
+        await self.request("POST", "/items", {"name": "Tomato", "quantity": 10, "price": 1.5})
+        for method, path, body in (("POST", "/sales", {"name": "Tomato", "quantity": 2, "note": 5}),
+                                   ("POST", "/items/Tomato/adjustments", {"quantity_change": -2, "note": []}),
+                                   ("POST", "/items", {"name": "Kale", "quantity": 1, "price": 1.0, "unit": 3})):
+            with self.subTest(path=path):
+                status, response = await self.request(method, path, body)
+                self.assertEqual(status, 400)
+                self.assertEqual(response["error"], "invalid_request")
+        self.assertEqual(self.service.inventory.get_item("Tomato").quantity, 10)
+        self.assertEqual(self.service.inventory.get_total_revenue(), 0)
+        self.assertIsNone(self.service.inventory.get_item("Kale"))
+
+    async def test_failed_write_still_publishes_its_changes(self):
+        await self.request("POST", "/items", {"name": "Tomato", "quantity": 10, "price": 1.5})
+        inventory = self.service.inventory
+        adjust = inventory.adjust_item
+
+        def adjust_then_fail(name, *args):
+            adjust(name, *args)
+            raise RuntimeError("disk unplugged")
+
+        inventory.adjust_item = adjust_then_fail
+        status, _ = await self.request("POST", "/items/Tomato/adjustments", {"quantity_change": -4})
+        self.assertEqual(status, 500)
+        status, body = await self.request("GET", "/items/Tomato")
+        self.assertEqual(body["item"]["quantity"], 6)
+
+    async def test_low_stock_filter_uses_item_thresholds(self):
+        self.service.inventory.set_low_stock_threshold(15, name="tomato")
+        await self.request("POST", "/items", {"name": "Tomato", "quantity": 12, "price": 1.5})
+        await self.request("POST", "/items", {"name": "Kale", "quantity": 12, "price": 2.0})
+
+        status, body = await self.request("GET", "/items?low_stock=1")
+        self.assertEqual(status, 200)
+        self.assertEqual([(item["name"], item["low_stock_threshold"]) for item in body["items"]],
+                         [("Tomato", 15)])
+        status, body = await self.request("GET", "/items?low_stock=1&threshold=12")
+        self.assertEqual([item["name"] for item in body["items"]], ["Kale", "Tomato"])
+
+    async def test_snapshots_share_unchanged_item_views(self):
+        for index in range(300):
+            await self.service.submit("add", f"Item {index}", 10, 1.0)
+        first = self.service.snapshot
+        await self.service.submit("sale", "item 7", 4)
+        await self.service.submit("remove", "Item 8")
+        await self.service.submit("add", "Kale", 3, 2.0)
+        latest = self.service.snapshot
+
+        # The batch only copied what it changed; older snapshots are untouched
+        self.assertIs(latest.items._base, first.items._base)
+        self.assertLessEqual(len(latest.items._changes), len(first.items._changes) + 3)
+        self.assertEqual(first.get_item("Item 7")["quantity"], 10)
+        self.assertIsNotNone(first.get_item("Item 8"))
+        self.assertIsNone(first.get_item("Kale"))
+        self.assertEqual(len(first.items), 300)
+
+        self.assertEqual(latest.get_item("Item 7")["quantity"], 6)
+        self.assertIsNone(latest.get_item("item 8"))
+        self.assertEqual(len(latest.items), 300)
+        self.assertEqual([item["name"] for item in latest.list_items()],
+                         sorted(item.name for item in self.service.inventory.produces))
+
+    async def test_stop_saves_inventory(self):
+        await self.request("POST", "/items", {"name": "Tomato", "quantity": 5, "price": 1.0})
+        await self.service.stop()
+        with open(self.path) as file:
+            self.assertEqual(json.load(file)["produces"][0]["name"], "Tomato")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+import tempfile
+import os
+import threading
+import time
+from unittest import mock
+from app.models.inventory import Inventory
+from app.storage.autosave import AutoSaver
+
+
+class TestAtomicSave(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "inventory.json")
+        self.inventory = Inventory(quiet=True)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_failed_write_keeps_previous_file(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.assertTrue(self.inventory.save_to_file(self.path))
+        self.inventory.add_item("Kale", 3, 2.0)
+
+        with mock.patch("app.storage.atomic.os.fsync", side_effect=OSError("disk full")):
+            self.assertFalse(self.inventory.save_to_file(self.path))
+
+        loaded = Inventory(quiet=True)
+        self.assertTrue(loaded.load_from_file(self.path))
+        self.assertEqual([item.name for item in loaded.produces], ["Tomato"])
+        self.assertEqual(os.listdir(self.temp_dir.name), ["inventory.json"])
+        self.assertTrue(self.inventory.is_dirty())
+
+    def test_dirty_tracking(self):
+        self.assertFalse(self.inventory.is_dirty())
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.record_sale("Tomato", 2)
+        self.assertEqual(self.inventory.unsaved_changes, 2)
+
+        self.inventory.save_to_file(self.path)
+        self.assertFalse(self.inventory.is_dirty())
+        self.inventory.record_sales_bulk([("Tomato", 1), ("Tomato", 1)])
+        self.assertEqual(self.inventory.unsaved_changes, 2)
+
+        self.inventory.load_from_file(self.path)
+        self.assertFalse(self.inventory.is_dirty())
+
+    def test_writes_during_save_are_not_lost(self):
+        inventory = Inventory(quiet=True, thread_safe=True)
+        inventory.add_item("Tomato", 100, 1.5)
+        started, release = threading.Event(), threading.Event()
+        write_snapshot = inventory._write_snapshot
+
+        def slow_write(*args):
+            started.set()
+            release.wait(5)
+            return write_snapshot(*args)
+
+        with mock.patch.object(inventory, "_write_snapshot", slow_write):
+            saver = threading.Thread(target=inventory.save_to_file, args=(self.path,))
+            saver.start()
+            self.assertTrue(started.wait(5))
+            # Item locks are free while the file is written
+            self.assertTrue(inventory.record_sale("Tomato", 5))
+            release.set()
+            saver.join()
+
+        self.assertEqual(inventory.unsaved_changes, 1)
+        loaded = Inventory(quiet=True)
+        loaded.load_from_file(self.path)
+        self.assertEqual(loaded.get_item("Tomato").quantity, 100)
+
+
+class TestAutoSaver(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "inventory.json")
+        self.inventory = Inventory(quiet=True, thread_safe=True)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _wait_for(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            if time.monotonic() > deadline:
+                self.fail("Timed out waiting for autosave")
+            time.sleep(0.01)
+
+    def test_requires_thread_safe_inventory(self):
+        with self.assertRaises(ValueError):
+            AutoSaver(Inventory(quiet=True), self.path)
+
+    def test_burst_is_coalesced_into_one_save(self):
+        saver = AutoSaver(self.inventory, self.path, interval=3600, max_changes=50, poll_interval=0.01)
+        self.inventory.add_item("Tomato", 1000, 1.5)
+        saver.start()
+        try:
+            self.inventory.record_sales_bulk([("Tomato", 1)] * 60)
+            self._wait_for(lambda: saver.saves)
+            time.sleep(0.05)
+        finally:
+            saver.stop(flush=False)
+
+        self.assertEqual(saver.saves, 1)
+        self.assertFalse(self.inventory.is_dirty())
+        loaded = Inventory(quiet=True)
+        loaded.load_from_file(self.path)
+        self.assertEqual(loaded.get_item("Tomato").quantity, 940)
+
+    def test_saves_after_interval_and_flushes_on_stop(self):
+        saver = AutoSaver(self.inventory, self.path, interval=0.05, max_changes=None, poll_interval=0.01)
+        saver.start()
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self._wait_for(lambda: saver.saves)
+
+        saves = saver.saves
+        saver.stop(flush=False)
+        self.inventory.record_sale("Tomato", 4)
+        self.assertTrue(saver.stop())
+        self.assertEqual(saver.saves, saves + 1)
+        self.assertFalse(self.inventory.is_dirty())
+
+    def test_failing_saves_back_off(self):
+        saver = AutoSaver(self.inventory, self.path, interval=0.2, max_changes=1, poll_interval=0.01)
+        self.inventory.add_item("Tomato", 10, 1.5)
+        with mock.patch.object(self.inventory, "save_to_file", return_value=False) as save:
+            saver.start()
+            try:
+                self._wait_for(lambda: save.call_count)
+                time.sleep(0.5)
+            finally:
+                saver.stop(flush=False)
+        # Retried after 0.2s and then 0.4s, not on every 0.01s poll
+        self.assertLessEqual(save.call_count, 3)
+        self.assertEqual(saver.failures, save.call_count)
+
+        self.assertTrue(saver.stop())
+        self.assertEqual(saver.failures, 0)
+        self.assertFalse(self.inventory.is_dirty())
+
+
+if __name__ == '__main__':
+    unittest.main()
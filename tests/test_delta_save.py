@@ -0,0 +1,123 @@
+import unittest
+import tempfile
+import json
+import os
+from unittest import mock
+from app.models.inventory import Inventory
+from app.storage.json_snapshot import JSONSnapshot
+
+
+class TestDeltaSave(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "inventory.json")
+        self.events = []
+        self.inventory = Inventory(event_sink=self.events.append)
+        self.inventory.add_item("Tomato", 100, 1.5, "Vegetables")
+        self.inventory.add_item("Apple", 50, 0.5, "Fruits")
+        self.inventory.record_sale("Tomato", 10)
+        self.assertTrue(self.inventory.save_to_file(self.path))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _read(self):
+        with open(self.path) as file:
+            text = file.read()
+        data = json.loads(text)
+        # Same layout as json.dump(data, indent=2)
+        self.assertEqual(text, json.dumps(data, indent=2))
+        return data
+
+    def test_save_without_changes_is_a_no_op(self):
+        before = os.stat(self.path)
+        self.assertTrue(self.inventory.save_to_file(self.path))
+
+        after = os.stat(self.path)
+        self.assertEqual((before.st_ino, before.st_mtime_ns), (after.st_ino, after.st_mtime_ns))
+        self.assertEqual(self.events[-1]["kind"], "save_skipped")
+
+    def test_save_after_edits_appends_new_transactions(self):
+        self.inventory.record_sale("Apple", 5, "market")
+        self.inventory.adjust_item("Tomato", -2, "spoiled")
+        self.inventory.remove_item("Apple")
+        with mock.patch.object(JSONSnapshot, "encode_item", wraps=JSONSnapshot.encode_item) as encode:
+            self.assertTrue(self.inventory.save_to_file(self.path))
+
+        # Only the changed item is encoded again
+        encode.assert_called_once()
+        data = self._read()
+        self.assertEqual([item["name"] for item in data["produces"]], ["Tomato"])
+        self.assertEqual(data["produces"][0]["quantity"], 88)
+        self.assertEqual([txn["type"] for txn in data["transactions"]],
+                         ["purchase", "purchase", "sale", "sale", "adjustment", "adjustment"])
+        self.assertEqual(data["transactions"][3]["note"], "market")
+
+    def test_lazy_load_then_save_keeps_history_on_disk(self):
+        loaded = Inventory(quiet=True)
+        loaded.load_from_file(self.path)
+        loaded.record_sale("Tomato", 1)
+        self.assertTrue(loaded.save_to_file(self.path))
+
+        self.assertTrue(loaded.has_pending_history())
+        data = self._read()
+        self.assertEqual(len(data["transactions"]), 4)
+        self.assertEqual(data["produces"][0]["quantity"], 89)
+
+    def test_history_read_after_saving_over_lazy_file_has_no_duplicates(self):
+        loaded = Inventory(quiet=True)
+        loaded.load_from_file(self.path)
+        loaded.record_sale("Tomato", 1)
+        self.assertTrue(loaded.save_to_file(self.path))
+        loaded.record_sale("Tomato", 2)
+        self.assertTrue(loaded.save_to_file(self.path))
+        loaded.record_sale("Apple", 1)
+
+        self.assertEqual([(txn.type, txn.quantity) for txn in loaded.transactions],
+                         [("purchase", 100), ("purchase", 50), ("sale", 10),
+                          ("sale", 1), ("sale", 2), ("sale", 1)])
+        self.assertEqual(loaded.generate_summary_insights()["total_revenue"],
+                         float(loaded.get_total_revenue()))
+
+    def test_history_read_while_file_is_replaced_has_no_duplicates(self):
+        loaded = Inventory(quiet=True)
+        loaded.load_from_file(self.path)
+        loaded.record_sale("Tomato", 1)
+        write = loaded._write_snapshot
+
+        def write_then_read(*args):
+            saved_file = write(*args)
+            # Another reader parses the history before the save finishes
+            self.assertEqual(len(loaded.transactions), 4)
+            return saved_file
+
+        with mock.patch.object(loaded, "_write_snapshot", side_effect=write_then_read):
+            self.assertTrue(loaded.save_to_file(self.path))
+        self.assertFalse(loaded.has_pending_history())
+        self.assertEqual(len(loaded.transactions), 4)
+
+    def test_externally_changed_file_is_rewritten_in_full(self):
+        with open(self.path) as file:
+            data = json.load(file)
+        data["transactions"] = []
+        with open(self.path, "w") as file:
+            json.dump(data, file)
+
+        self.inventory.record_sale("Apple", 1)
+        self.assertTrue(self.inventory.save_to_file(self.path))
+        self.assertEqual(len(self._read()["transactions"]), 4)
+
+    def test_delta_from_binary_snapshot_is_not_attempted(self):
+        snap_path = os.path.join(self.temp_dir.name, "inventory.snap")
+        self.assertTrue(self.inventory.save_to_file(snap_path))
+        self.assertTrue(self.inventory.save_to_file(snap_path))
+        self.assertEqual(self.events[-1]["kind"], "save_skipped")
+
+        self.inventory.record_sale("Apple", 1)
+        self.assertTrue(self.inventory.save_to_file(self.path))
+        self.assertEqual(len(self._read()["transactions"]), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
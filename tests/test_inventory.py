@@ -1,7 +1,12 @@
 import unittest
+import contextlib
+import io
 import tempfile
 import os
 import json
+import csv
+import gzip
+from decimal import Decimal
 from app.models.inventory import Inventory
 from app.models.produce import ProduceItem
 
@@ -71,6 +76,202 @@ class TestInventory(unittest.TestCase):
             # Clean up the temp file
             os.remove(temp_path)
 
+    def test_lookup_is_case_insensitive(self):
+        self.inventory.add_item("Sweet Potato", 10, 2.0)
+        self.assertIs(self.inventory._find_item_by_name("  sweet POTATO "),
+                      self.inventory.produces[0])
+
+    def test_removed_item_is_dropped_from_lookup(self):
+        self.inventory.add_item("Kale", 10, 2.0)
+        self.inventory.remove_item("kale")
+        self.assertIsNone(self.inventory._find_item_by_name("Kale"))
+        self.assertFalse(self.inventory.record_sale("Kale", 1))
+
+    def test_lookup_after_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "inventory.json")
+            self.inventory.add_item("Garlic", 10, 3.0, "Spice", "bulb")
+            self.inventory.save_to_file(path)
+
+            new_inventory = Inventory()
+            new_inventory.add_item("Stale", 1, 1.0)
+            new_inventory.load_from_file(path)
+            self.assertIsNone(new_inventory._find_item_by_name("Stale"))
+            self.assertTrue(new_inventory.record_sale("garlic", 4))
+            self.assertEqual(new_inventory.produces[0].quantity, 6)
+
+    def test_load_defers_transaction_history(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "inventory.json")
+            self.inventory.add_item("Garlic", 10, 3.0)
+            self.inventory.record_sale("Garlic", 2)
+            self.inventory.save_to_file(path)
+
+            new_inventory = Inventory()
+            new_inventory.load_from_file(path)
+            self.assertTrue(new_inventory.has_pending_history())
+            self.assertEqual(new_inventory.produces[0].quantity, 8)
+
+            new_inventory.record_sale("Garlic", 1, "after load")
+            self.assertTrue(new_inventory.has_pending_history())
+
+            history = new_inventory.get_transaction_history()
+            self.assertFalse(new_inventory.has_pending_history())
+            self.assertEqual([txn.type for txn in history], ["purchase", "sale", "sale"])
+            self.assertEqual(history[-1].note, "after load")
+
+    def _populate(self):
+        self.inventory.add_item("Tomato", 50, 1.5, "Vegetable")
+        self.inventory.add_item("Apple", 40, 0.75, "Fruit")
+        self.inventory.add_item("Kale", 20, 2.1, "Vegetable")
+        self.inventory.record_sale("Apple", 10)
+        self.inventory.record_sale("Tomato", 5)
+        self.inventory.record_sale("Kale", 2)
+        self.inventory.add_item("Tomato", 10, 1.6)
+        self.inventory.adjust_item("Apple", -3, "Bruised")
+        self.inventory.remove_item("Kale")
+
+    def test_report_aggregates_follow_mutations(self):
+        self._populate()
+        report = self.inventory.get_inventory_report()
+        self.assertEqual(report["total_value"], 55 * 1.6 + 27 * 0.75)
+        self.assertEqual(report["categories"], {
+            "Vegetable": {"items": 1, "total_value": 88.0},
+            "Fruit": {"items": 1, "total_value": 20.25},
+        })
+
+    def test_summary_insights_follow_sales(self):
+        self._populate()
+        summary = self.inventory.generate_summary_insights()
+        self.assertEqual(summary["total_revenue"], Decimal("19.2"))
+        self.assertEqual(summary["top_selling_item"], "Apple")
+        self.assertEqual(summary["top_revenue_item"], "Apple")
+
+        self.inventory.record_sale("Tomato", 5)
+        summary = self.inventory.generate_summary_insights()
+        self.assertEqual(summary["top_selling_item"], "Apple")
+        self.assertEqual(summary["top_revenue_item"], "Tomato")
+        self.assertEqual(summary["category_breakdown"], {"Vegetable": 1, "Fruit": 1})
+
+    def test_category_index_follows_mutations(self):
+        self._populate()
+        self.inventory.add_item("Pear", 4, 2.0, "fruit")
+        self.assertEqual([item.name for item in self.inventory.get_items(category="FRUIT")],
+                         ["Apple", "Pear"])
+        self.assertEqual(self.inventory.get_categories(), {"Fruit": 1, "Vegetable": 1, "fruit": 1})
+        self.assertEqual(self.inventory.get_category_stats("Fruit"),
+                         {"items": 2, "total_value": Decimal("28.25")})
+
+        self.inventory.remove_item("Apple")
+        self.assertEqual([item.name for item in self.inventory.get_items(category="fruit")], ["Pear"])
+        self.inventory.remove_item("Pear")
+        self.assertEqual(self.inventory.get_items(category="fruit"), [])
+        self.assertIsNone(self.inventory.get_category_stats("fruit"))
+
+    def test_aggregates_rebuilt_after_load(self):
+        self._populate()
+        expected_report = self.inventory.get_inventory_report()
+        expected_summary = self.inventory.generate_summary_insights()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "inventory.json")
+            self.inventory.save_to_file(path)
+            new_inventory = Inventory()
+            new_inventory.load_from_file(path)
+            self.assertEqual(new_inventory.get_inventory_report(), expected_report)
+            summary = new_inventory.generate_summary_insights()
+            self.assertEqual(summary, expected_summary)
+            self.assertEqual([item.name for item in new_inventory.get_items(category="vegetable")],
+                             ["Tomato"])
+
+    def test_record_sales_bulk_applies_batch(self):
+        self.inventory.add_item("Tomato", 20, 1.5)
+        self.inventory.add_item("Apple", 30, 0.5)
+        result = self.inventory.record_sales_bulk([
+            ("Tomato", 5, "stall 1"), ("apple", 10), ("Tomato", 7)
+        ])
+        self.assertTrue(result["applied"])
+        self.assertEqual(result["total_amount"], Decimal("23.0"))
+        self.assertEqual(result["low_stock"], ["Tomato"])
+        self.assertEqual([row["remaining"] for row in result["rows"]], [15, 20, 8])
+        self.assertEqual(self.inventory.get_total_revenue(), Decimal("23.0"))
+        sales = self.inventory.filter_transactions_by_type("sale")
+        self.assertEqual([txn.quantity for txn in sales], [5, 10, 7])
+        self.assertEqual(sales[0].note, "stall 1")
+
+    def test_record_sales_bulk_is_atomic(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        result = self.inventory.record_sales_bulk([
+            ("Tomato", 6), ("Tomato", 6), ("Cabbage", 1), ("Tomato", 0)
+        ])
+        self.assertFalse(result["applied"])
+        self.assertFalse(any(row["ok"] for row in result["rows"]))
+        self.assertIsNone(result["rows"][0]["error"])
+        self.assertIn("Current stock: 4", result["rows"][1]["error"])
+        self.assertEqual(self.inventory.produces[0].quantity, 10)
+        self.assertEqual(len(self.inventory.transactions), 1)
+
+    def test_record_sales_bulk_partial(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        result = self.inventory.record_sales_bulk([("Tomato", 6), ("Tomato", 6), ("Tomato", 4)],
+                                                  atomic=False)
+        self.assertTrue(result["applied"])
+        self.assertEqual([row["ok"] for row in result["rows"]], [True, False, True])
+        self.assertEqual(self.inventory.produces[0].quantity, 0)
+
+    def test_record_sales_bulk_rejects_malformed_rows_before_applying(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.add_item("Kale", 10, 2.0)
+        for rows in ([("Tomato", 2, "ok"), ("Kale", 3, None)], [("Tomato", 2), ("Kale",)],
+                     [("Tomato", 2), 7], [("Tomato", 2), (None, 1)]):
+            with self.subTest(rows=rows):
+                result = self.inventory.record_sales_bulk(rows)
+                self.assertFalse(result["applied"])
+                self.assertIsNotNone(result["rows"][1]["error"])
+        self.assertEqual([item.quantity for item in self.inventory.produces], [10, 10])
+        self.assertEqual(self.inventory.get_total_revenue(), Decimal("0"))
+        self.assertEqual(len(self.inventory.transactions), 2)
+
+        result = self.inventory.record_sales_bulk([("Tomato", 2, "ok"), ("Kale", 3, None)], atomic=False)
+        self.assertEqual([row["ok"] for row in result["rows"]], [True, False])
+        self.assertEqual([item.quantity for item in self.inventory.produces], [8, 10])
+        self.assertEqual(len(self.inventory.filter_transactions_by_type("sale")), 1)
+
+    def test_quiet_mode_writes_nothing(self):
+        inventory = Inventory(quiet=True)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            inventory.add_item("Tomato", 12, 1.5)
+            inventory.record_sale("Tomato", 5)
+            inventory.record_sale("Cabbage", 1)
+            inventory.list_items()
+        self.assertEqual(output.getvalue(), "")
+
+    def test_event_sink_receives_structured_events(self):
+        events = []
+        inventory = Inventory(event_sink=events.append)
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            inventory.add_item("Tomato", 12, 1.5)
+            inventory.record_sale("Tomato", 5)
+            inventory.adjust_item("Tomato", -10)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual([event["kind"] for event in events],
+                         ["item_added", "sale_recorded", "low_stock", "invalid_adjustment"])
+        self.assertEqual(events[1]["amount"], Decimal("7.5"))
+        self.assertEqual(events[2]["level"], "warning")
+        self.assertEqual(events[2]["quantity"], 7)
+
+    def test_export_transactions_streams_fixed_schema(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.record_sale("Tomato", 2, "market, stall 3")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "exports", "transactions.csv.gz")
+            self.assertTrue(self.inventory.export_transactions_to_csv(path))
+            with gzip.open(path, "rt", newline="") as file:
+                rows = list(csv.DictReader(file))
+        self.assertEqual(tuple(rows[0].keys()), Inventory.TRANSACTION_CSV_FIELDS)
+        self.assertEqual([row["type"] for row in rows], ["purchase", "sale"])
+        self.assertEqual(rows[1]["note"], "market, stall 3")
+        self.assertEqual(rows[1]["total_amount"], "3.0")
+
 
 if __name__ == '__main__':
     unittest.main()
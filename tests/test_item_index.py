@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.models.inventory import Inventory, InventoryError
+from app.models.transaction import Transaction
+from app.models.transaction_store import TransactionStore
+
+
+class TestItemIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = Inventory(quiet=True)
+        self.inventory.add_item("Tomato", 100, 1.5)
+        self.inventory.add_item("Kale", 50, 2.0)
+        self.inventory.record_sale("tomato", 4)
+        self.inventory.record_sale("Kale", 1)
+        self.inventory.record_sale(" TOMATO ", 2)
+
+    def test_history_matches_names_ignoring_case(self):
+        history = self.inventory.get_item_history("TOMATO")
+        self.assertEqual([(txn.type, txn.quantity) for txn in history],
+                         [("purchase", 100), ("sale", 4), ("sale", 2)])
+        expected = [txn.to_dict() for txn in self.inventory.transactions
+                    if txn.produce_name.strip().lower() == "tomato"]
+        self.assertEqual([txn.to_dict() for txn in history], expected)
+        self.assertEqual(self.inventory.get_item_history("Onion"), [])
+
+    def test_index_follows_appends_once_built(self):
+        self.inventory.get_item_history("Kale")
+        self.inventory.record_sale("KALE", 3)
+        self.inventory.add_item("Onion", 5, 0.5)
+        self.assertEqual([txn.quantity for txn in self.inventory.get_item_history("kale")], [50, 1, 3])
+        self.assertEqual(len(self.inventory.get_item_history("onion")), 1)
+
+    def test_stats_match_full_scan(self):
+        old = (datetime.now() - timedelta(days=40)).isoformat()
+        self.inventory.transactions.append(Transaction("sale", "Tomato", 10, 1.5, "", old))
+        stats = self.inventory.get_item_stats("tomato", days=30)
+
+        sales = [txn for txn in self.inventory.transactions
+                 if txn.type == "sale" and txn.produce_name.strip().lower() == "tomato"]
+        self.assertEqual(stats["name"], "Tomato")
+        self.assertTrue(stats["in_stock"])
+        self.assertEqual(stats["transactions"], 4)
+        self.assertEqual(stats["sales"], 3)
+        self.assertEqual(stats["units_sold"], 16)
+        self.assertEqual(stats["revenue"], sum((txn.total_amount for txn in sales), Decimal(0)))
+        self.assertAlmostEqual(stats["sales_velocity"], 6 / 30)
+        self.assertEqual(stats["last_sale"], self.inventory.get_item_history("tomato")[-2].timestamp)
+        self.assertIsNone(self.inventory.get_item_stats("Onion"))
+        with self.assertRaises(InventoryError):
+            self.inventory.get_item_stats("Tomato", days=0)
+
+    def test_removed_item_keeps_its_history(self):
+        self.inventory.get_item_history("tomato")
+        self.inventory.remove_item("TOMATO")
+        history = self.inventory.get_item_history("Tomato")
+        self.assertEqual(history[-1].note, "Item removed from inventory")
+        stats = self.inventory.get_item_stats("Tomato")
+        self.assertFalse(stats["in_stock"])
+        self.assertEqual(stats["units_sold"], 6)
+
+        # Other items' rows are untouched by the removal
+        self.assertEqual([txn.quantity for txn in self.inventory.get_item_history("kale")], [50, 1])
+        self.inventory.add_item("Tomato", 5, 1.0)
+        self.assertEqual(len(self.inventory.get_item_history("tomato")), 5)
+        self.assertTrue(self.inventory.get_item_stats("tomato")["in_stock"])
+
+    def test_index_is_rebuilt_after_history_changes(self):
+        merged = TransactionStore()
+        merged.append(Transaction("sale", "kale", 2, 2.0, "", "2024-01-01T00:00:00"))
+        self.assertEqual(len(merged.item_rows("kale")), 1)
+        merged.extend_store(self.inventory.transactions)
+        self.assertEqual([txn.quantity for txn in merged.item_history("Kale")], [2, 50, 1])
+
+        self.inventory.transactions = [Transaction("sale", "Kale", 7, 2.0)]
+        self.assertEqual([txn.quantity for txn in self.inventory.get_item_history("kale")], [7])
+        self.assertEqual(self.inventory.get_item_history("tomato"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
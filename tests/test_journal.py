@@ -0,0 +1,84 @@
+import unittest
+import tempfile
+import os
+from app.models.inventory import Inventory
+from app.storage.journal import TransactionJournal
+
+
+class TestJournaledInventory(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "inventory.json")
+        self.journal_path = TransactionJournal.path_for(self.path)
+        self.inventory = Inventory()
+        self.inventory.enable_journal(self.path, checkpoint_interval=100)
+
+    def tearDown(self):
+        self.inventory.disable_journal()
+        self.temp_dir.cleanup()
+
+    def _count_records(self):
+        with open(self.journal_path) as file:
+            return sum(1 for _ in file)
+
+    def test_save_appends_instead_of_rewriting(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.record_sale("Tomato", 4)
+        self.assertTrue(self.inventory.save_to_file(self.path))
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self._count_records(), 2)
+
+    def test_load_replays_journal(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.record_sale("tomato", 4)
+        self.inventory.add_item("Kale", 3, 2.0)
+        self.inventory.remove_item("Kale")
+        self.inventory.save_to_file(self.path)
+
+        loaded = Inventory()
+        self.assertTrue(loaded.load_from_file(self.path))
+        self.assertEqual([item.name for item in loaded.produces], ["Tomato"])
+        self.assertEqual(loaded.produces[0].quantity, 6)
+        self.assertEqual(loaded.get_total_revenue(), self.inventory.get_total_revenue())
+        self.assertEqual(len(loaded.transactions), 4)
+
+    def test_checkpoint_truncates_journal_and_keeps_state(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.checkpoint()
+        self.assertEqual(self._count_records(), 0)
+
+        self.inventory.record_sale("Tomato", 2)
+        self.inventory.save_to_file(self.path)
+
+        loaded = Inventory()
+        loaded.load_from_file(self.path)
+        self.assertEqual(loaded.produces[0].quantity, 8)
+        self.assertEqual(len(loaded.transactions), 2)
+
+    def test_bulk_sales_are_journaled(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.record_sales_bulk([("Tomato", 2), ("Tomato", 3)])
+        self.inventory.save_to_file(self.path)
+        self.assertEqual(self._count_records(), 3)
+
+        loaded = Inventory()
+        loaded.load_from_file(self.path)
+        self.assertEqual(loaded.produces[0].quantity, 5)
+        self.assertEqual(loaded.get_total_revenue(), self.inventory.get_total_revenue())
+
+    def test_torn_final_record_is_ignored(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.save_to_file(self.path)
+        with open(self.journal_path, "a") as file:
+            file.write('{"seq": 2, "txn": {"ty')
+
+        loaded = Inventory()
+        loaded.load_from_file(self.path)
+        self.assertEqual(loaded.produces[0].quantity, 10)
+        self.assertEqual(len(loaded.transactions), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
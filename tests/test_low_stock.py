@@ -0,0 +1,84 @@
+import unittest
+import random
+from app.models.inventory import Inventory, InventoryError
+from app.models.produce import ProduceItem
+from app.models.stock_tracker import LowStockTracker
+
+
+class TestLowStock(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = Inventory(quiet=True)
+        self.events = []
+        self.inventory.subscribe_low_stock(self.events.append)
+        self.inventory.add_item("Tomato", 30, 1.5, "Vegetable")
+        self.inventory.add_item("Kale", 8, 2.0, "Vegetable")
+        self.inventory.add_item("Apple", 12, 0.5, "Fruit")
+
+    def _crossings(self):
+        crossings = [(event["name"], event["low"]) for event in self.events]
+        self.events.clear()
+        return crossings
+
+    def test_subscribers_see_threshold_crossings_only(self):
+        self.assertEqual(self._crossings(), [("Kale", True)])
+        self.inventory.record_sale("Apple", 1)
+        self.assertEqual(self._crossings(), [])
+        self.inventory.record_sale("Apple", 1)
+        self.inventory.record_sale("Apple", 1)
+        self.assertEqual(self._crossings(), [("Apple", True)])
+        self.inventory.adjust_item("Apple", 20)
+        self.assertEqual(self._crossings(), [("Apple", False)])
+
+    def test_thresholds_by_item_and_category(self):
+        self._crossings()
+        self.inventory.set_low_stock_threshold(12, category="fruit")
+        self.assertEqual(self._crossings(), [("Apple", True)])
+        self.inventory.set_low_stock_threshold(5, name="kale")
+        self.assertEqual(self._crossings(), [("Kale", False)])
+        self.inventory.set_low_stock_threshold(40)
+        self.assertEqual(self._crossings(), [("Tomato", True)])
+        self.assertEqual([item.name for item in self.inventory.check_low_stock()], ["Apple", "Tomato"])
+
+        self.inventory.set_low_stock_threshold(None, category="Fruit")
+        self.assertEqual([item.name for item in self.inventory.check_low_stock()], ["Apple", "Tomato"])
+        self.assertEqual(self.inventory.get_inventory_report()["low_stock_items"], 2)
+        self.assertEqual(self.inventory.generate_summary_insights()["low_stock_count"], 2)
+        with self.assertRaises(InventoryError):
+            self.inventory.set_low_stock_threshold(-1, name="Kale")
+
+    def test_explicit_threshold_and_removal(self):
+        self.assertEqual([item.name for item in self.inventory.check_low_stock(12)], ["Kale", "Apple"])
+        self.inventory.remove_item("Kale")
+        self.assertEqual(self.inventory.check_low_stock(), [])
+        self.assertEqual(self.inventory.get_inventory_report()["low_stock_items"], 0)
+        self.assertEqual([item.name for item in self.inventory.get_items(show_low_stock=True, threshold=12)],
+                         ["Apple"])
+
+    def test_tracker_matches_scan_through_compactions(self):
+        rng = random.Random(7)
+        items = [ProduceItem(f"Item {index}", rng.randint(0, 50), 1.0, f"C{index % 3}", "unit")
+                 for index in range(40)]
+        tracker = LowStockTracker()
+        tracker.rebuild(items)
+        tracker.set_threshold(20, category="C1")
+        for item in items:
+            tracker.update(item)
+        for _ in range(2000):
+            item = rng.choice(items)
+            item.quantity = rng.randint(0, 50)
+            tracker.update(item)
+        live = items[5:]
+        for item in items[:5]:
+            tracker.discard(item)
+
+        bound = rng.randint(0, 50)
+        self.assertEqual(set(tracker.items_at_or_below(bound)),
+                         {item for item in live if item.quantity <= bound})
+        low = {item for item in live if item.quantity <= tracker.threshold_for(item)}
+        self.assertEqual(set(tracker.low_items()), low)
+        self.assertEqual(tracker.low_count, len(low))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+import tempfile
+from app.metrics import LatencyHistogram
+from app.models.inventory import Inventory, InventoryError
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.inventory = Inventory(quiet=True)
+        self.metrics = self.inventory.enable_metrics()
+
+    def test_operations_are_counted_by_outcome(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.record_sale("Tomato", 2)
+        self.inventory.record_sale("Tomato", 50)
+        with self.assertRaises(InventoryError):
+            self.inventory.record_sale("Tomato", -1)
+        self.inventory.filter_transactions_by_type("sale")
+
+        snapshot = self.metrics.snapshot()
+        sales = snapshot["operations"]["record_sale"]
+        self.assertEqual((sales["calls"], sales["ok"], sales["failed"], sales["error"]), (3, 1, 1, 1))
+        self.assertGreater(sales["total_seconds"], 0)
+        self.assertEqual(snapshot["operations"]["filter_transactions_by_type"]["calls"], 1)
+        self.assertEqual(snapshot["gauges"], {"items": 1, "transactions": 2})
+
+    def test_disabled_metrics_restore_plain_methods(self):
+        self.inventory.disable_metrics()
+        self.assertIsNone(self.inventory.metrics)
+        self.assertEqual(self.inventory.record_sale.__func__, Inventory.record_sale)
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.assertEqual(self.metrics.snapshot()["operations"], {})
+
+    def test_prometheus_dump(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "metrics.prom")
+            self.metrics.write_prometheus(path)
+            with open(path) as file:
+                text = file.read()
+        self.assertIn('inventory_operations_total{operation="add_item",outcome="ok"} 1', text)
+        self.assertIn('inventory_operation_seconds_bucket{operation="add_item",le="+Inf"} 1', text)
+        self.assertIn('inventory_operation_seconds_count{operation="add_item"} 1', text)
+        self.assertIn("# TYPE inventory_items gauge\ninventory_items 1", text)
+
+    def test_histogram_quantiles(self):
+        histogram = LatencyHistogram()
+        for seconds in (0.00002,) * 98 + (0.3, 20.0):
+            histogram.observe(seconds)
+        self.assertEqual(histogram.quantile(0.5), 0.000025)
+        self.assertEqual(histogram.quantile(0.99), 0.5)
+        self.assertEqual(histogram.quantile(1.0), float("inf"))
+        self.assertIsNone(LatencyHistogram().quantile(0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import tempfile
+import os
+from datetime import date
+from unittest import mock
+from app.models.inventory import Inventory, InventoryError
+from app.models.transaction import Transaction
+from app.storage.sqlite import SQLiteStorage
+
+
+class TestTransactionPages(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [{"type": "purchase", "produce_name": name, "quantity": 100, "unit_price": 1.0,
+                      "note": "", "timestamp": "2024-03-01T09:00:00"} for name in ("Tomato", "Kale")]
+        self.rows += [{"type": "sale", "produce_name": name, "quantity": day, "unit_price": 1.0,
+                       "note": "", "timestamp": f"2024-03-{day:02d}T12:00:00"}
+                      for day in range(1, 11) for name in ("Tomato", "Kale")]
+        self.inventory = Inventory(quiet=True)
+        self.inventory.add_item("Tomato", 100, 1.5)
+        self.inventory.transactions = [Transaction.from_dict(row) for row in self.rows]
+
+    def _walk(self, inventory: Inventory, limit: int, **filters):
+        pages = []
+        page = inventory.get_transactions_page(limit, **filters)
+        pages.append(page["transactions"])
+        while page["next_cursor"] is not None:
+            page = inventory.get_transactions_page(limit, after=page["next_cursor"], **filters)
+            pages.append(page["transactions"])
+        return pages
+
+    def test_pages_cover_the_log_newest_first(self):
+        pages = self._walk(self.inventory, 7)
+        self.assertEqual([len(page) for page in pages], [7, 7, 7, 1])
+        walked = [txn.to_dict() for page in pages for txn in page]
+        self.assertEqual(walked, [txn.to_dict() for txn in reversed(self.inventory.transactions.copy())])
+
+    def test_full_last_page_has_no_cursor(self):
+        pages = self._walk(self.inventory, 11)
+        self.assertEqual([len(page) for page in pages], [11, 11])
+
+    def test_filters_match_the_full_queries(self):
+        sales = self._walk(self.inventory, 3, transaction_type="SALE")
+        self.assertEqual([txn.to_dict() for page in sales for txn in page],
+                         [txn.to_dict() for txn in reversed(self.inventory.filter_transactions_by_type("sale"))])
+
+        start, end = date(2024, 3, 4), date(2024, 3, 6)
+        window = self._walk(self.inventory, 4, start=start, end=end)
+        self.assertEqual([txn.to_dict() for page in window for txn in page],
+                         [txn.to_dict() for txn in reversed(self.inventory.filter_transactions_by_date(start, end))])
+        self.assertEqual(self.inventory.get_transactions_page(transaction_type="refund"),
+                         {"transactions": [], "next_cursor": None})
+
+    def test_out_of_order_rows_page_in_log_order(self):
+        self.inventory.transactions.append(Transaction("sale", "Kale", 1, 1.0, "", "2024-03-05T00:00:00"))
+        page = self.inventory.get_transactions_page(2, start=date(2024, 3, 5), end=date(2024, 3, 5))
+        self.assertEqual([txn.timestamp for txn in page["transactions"]],
+                         ["2024-03-05T00:00:00", "2024-03-05T12:00:00"])
+        rest = self.inventory.get_transactions_page(2, after=page["next_cursor"],
+                                                    start=date(2024, 3, 5), end=date(2024, 3, 5))
+        self.assertEqual([txn.produce_name for txn in rest["transactions"]], ["Tomato"])
+        self.assertIsNone(rest["next_cursor"])
+
+    def test_cursor_is_stable_across_new_transactions(self):
+        first = self.inventory.get_transactions_page(5)
+        expected = self.inventory.get_transactions_page(5, after=first["next_cursor"])
+        self.inventory.record_sale("Tomato", 1)
+        after = self.inventory.get_transactions_page(5, after=first["next_cursor"])
+        self.assertEqual([txn.to_dict() for txn in after["transactions"]],
+                         [txn.to_dict() for txn in expected["transactions"]])
+
+    def test_offset_skips_matching_rows(self):
+        page = self.inventory.get_transactions_page(3, offset=4, transaction_type="sale")
+        sales = list(reversed(self.inventory.filter_transactions_by_type("sale")))
+        self.assertEqual([txn.to_dict() for txn in page["transactions"]],
+                         [txn.to_dict() for txn in sales[4:7]])
+
+    def test_pages_do_not_copy_the_log(self):
+        with mock.patch.object(Transaction, "from_trusted", wraps=Transaction.from_trusted) as views:
+            self.inventory.get_transactions_page(5)
+        self.assertEqual(views.call_count, 5)
+
+    def test_rejects_invalid_limits(self):
+        with self.assertRaises(InventoryError):
+            self.inventory.get_transactions_page(0)
+        with self.assertRaises(InventoryError):
+            self.inventory.get_transactions_page(5, offset=-1)
+
+    def test_database_pages_match_memory(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = SQLiteStorage(os.path.join(temp_dir, "inventory.db"))
+            for row in self.rows:
+                storage.append(row)
+            stored = Inventory(quiet=True)
+            stored.attach_storage(storage)
+            try:
+                for filters in ({}, {"transaction_type": "purchase"},
+                                {"start": date(2024, 3, 2), "end": date(2024, 3, 8)}):
+                    with self.subTest(filters=filters):
+                        expected = [[txn.to_dict() for txn in page]
+                                    for page in self._walk(self.inventory, 4, **filters)]
+                        walked = [[txn.to_dict() for txn in page]
+                                  for page in self._walk(stored, 4, **filters)]
+                        self.assertEqual(walked, expected)
+                # Answered by the database without parsing the history
+                self.assertTrue(stored.has_pending_history())
+            finally:
+                stored.close_storage()
+
+
+if __name__ == '__main__':
+    unittest.main()
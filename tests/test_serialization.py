@@ -0,0 +1,107 @@
+import unittest
+import tempfile
+import json
+import os
+from app.models.inventory import Inventory
+from app.models.transaction import Transaction
+from app.models.transaction_store import TransactionStore, from_micros, iso_formatter
+from app.storage import serialization
+from app.storage.journal import TransactionJournal
+
+
+class TestSerialization(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.backend = serialization.backend()
+
+    def tearDown(self):
+        serialization.set_backend(self.backend)
+        self.temp_dir.cleanup()
+
+    def _build(self, compact: bool) -> Inventory:
+        inventory = Inventory(quiet=True, compact=compact)
+        inventory.add_item("Tomato", 100, 1.5, "Vegetables")
+        inventory.add_item("Jalapeño \"hot\"", 20, 0.25, "Peppers")
+        inventory.record_sale("Tomato", 3, "first\nline")
+        inventory.record_sale("Jalapeño \"hot\"", 2.5)
+        inventory.transactions.append(
+            Transaction("purchase", "Tomato", 5.0, 1.0, "", "2024-03-01T10:00:00+02:00"))
+        return inventory
+
+    def test_iter_json_fields_matches_iter_dicts(self):
+        store = self._build(False).transactions
+        rows = [dict(zip(TransactionStore.FIELDS, map(json.loads, fields)))
+                for fields in store.iter_json_fields()]
+        self.assertEqual(rows, list(store.iter_dicts()))
+        self.assertEqual(len(list(store.iter_json_fields(3))), len(store) - 3)
+
+    def test_iso_formatter_matches_isoformat(self):
+        iso = iso_formatter()
+        for micros in (0, 1, 999_999, 1_000_000, -1, -86_400_000_001, 1_700_000_000_123_456,
+                       1_700_000_000_000_000):
+            self.assertEqual(iso(micros), from_micros(micros).isoformat())
+
+    def test_round_trip_with_every_backend(self):
+        for backend in serialization.BACKENDS:
+            for compact in (False, True):
+                with self.subTest(backend=backend, compact=compact):
+                    serialization.set_backend(backend)
+                    inventory = self._build(compact)
+                    path = os.path.join(self.temp_dir.name, f"{backend}-{compact}.json")
+                    self.assertTrue(inventory.save_to_file(path))
+
+                    with open(path, encoding="utf-8") as file:
+                        text = file.read()
+                    self.assertEqual("\n" in text, not compact)
+                    loaded = Inventory(quiet=True)
+                    self.assertTrue(loaded.load_from_file(path))
+                    self.assertEqual([item.to_dict() for item in loaded.produces],
+                                     [item.to_dict() for item in inventory.produces])
+                    self.assertEqual(list(loaded.transactions.iter_dicts()),
+                                     list(inventory.transactions.iter_dicts()))
+
+    def test_compact_save_appends_after_lazy_load(self):
+        path = os.path.join(self.temp_dir.name, "inventory.json")
+        self._build(True).save_to_file(path)
+        loaded = Inventory(quiet=True, compact=True)
+        loaded.load_from_file(path)
+        loaded.record_sale("Tomato", 1)
+        self.assertTrue(loaded.save_to_file(path))
+
+        self.assertTrue(loaded.has_pending_history())
+        with open(path, encoding="utf-8") as file:
+            data = json.loads(file.read())
+        self.assertEqual(len(data["transactions"]), 6)
+        self.assertEqual(data["produces"][0]["quantity"], 96)
+
+    def test_switching_layout_rewrites_history(self):
+        path = os.path.join(self.temp_dir.name, "inventory.json")
+        inventory = self._build(False)
+        inventory.save_to_file(path)
+        inventory.compact = True
+        self.assertTrue(inventory.save_to_file(path))
+
+        with open(path, encoding="utf-8") as file:
+            text = file.read()
+        self.assertNotIn("\n  ", text)
+        self.assertEqual(len(json.loads(text)["transactions"]), 5)
+
+    def test_journal_uses_backend(self):
+        path = os.path.join(self.temp_dir.name, "inventory.json")
+        for backend in serialization.BACKENDS:
+            with self.subTest(backend=backend):
+                serialization.set_backend(backend)
+                journal = TransactionJournal(TransactionJournal.path_for(path))
+                journal.append({"type": "sale"}, item={"name": "Jalapeño"})
+                journal.close()
+                records = list(TransactionJournal.read(journal.path))
+                self.assertEqual(records[-1]["item"], {"name": "Jalapeño"})
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            serialization.set_backend("simdjson")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import os
+import tempfile
+from decimal import Decimal
+from app.models.inventory import Inventory
+from app.models.transaction import Transaction
+from app.storage.snapshot import BinarySnapshot
+
+
+class TestBinarySnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "inventory.snap")
+        self.inventory = Inventory(quiet=True)
+        self.inventory.add_item("Tomato", 100, 1.25, "Vegetable", "kg")
+        self.inventory.add_item("Apple", 50, 0.5, "Fruit")
+        self.inventory.record_sale("Tomato", 4, "Market ✓")
+        self.inventory.record_sale("Apple", 2.0)
+        # Out of order, with a timezone and a non-canonical timestamp
+        self.inventory.transactions.append(
+            Transaction("sale", "Apple", 1, 0.5, "", "2024-01-16T11:00:00+02:00"))
+        self.inventory.transactions.append(
+            Transaction("refund", "Tomato", 1, 1.25, "", "2024-01-15T10:00:00.000"))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_round_trip_preserves_everything(self):
+        self.assertTrue(self.inventory.save_to_file(self.path))
+        self.assertTrue(BinarySnapshot.is_snapshot(self.path))
+
+        loaded = Inventory(quiet=True)
+        self.assertTrue(loaded.load_from_file(self.path))
+        self.assertFalse(loaded.has_pending_history())
+        self.assertEqual([item.to_dict() for item in loaded.produces],
+                         [item.to_dict() for item in self.inventory.produces])
+        self.assertEqual(loaded.get_total_revenue(), self.inventory.get_total_revenue())
+        self.assertEqual(list(loaded.transactions.iter_dicts()),
+                         list(self.inventory.transactions.iter_dicts()))
+        self.assertEqual(len(loaded.filter_transactions_by_type("sale")), 3)
+        self.assertEqual(loaded.generate_summary_insights(), self.inventory.generate_summary_insights())
+
+        loaded.record_sale("Tomato", 1)
+        self.assertEqual(loaded.get_item("Tomato").quantity, 95)
+
+    def test_snapshot_is_detected_by_header(self):
+        self.inventory.save_to_file(self.path)
+        renamed = os.path.join(self.temp_dir.name, "inventory.json")
+        os.rename(self.path, renamed)
+        loaded = Inventory(quiet=True)
+        self.assertTrue(loaded.load_from_file(renamed))
+        self.assertEqual(len(loaded.transactions), len(self.inventory.transactions))
+
+    def test_corrupt_snapshot_fails_to_load(self):
+        self.inventory.save_to_file(self.path)
+        with open(self.path, "r+b") as file:
+            file.seek(-3, os.SEEK_END)
+            file.write(b"\xff\xff\xff")
+        with self.assertRaisesRegex(ValueError, "checksum"):
+            BinarySnapshot.read(self.path)
+        self.assertFalse(Inventory(quiet=True).load_from_file(self.path))
+
+        with open(self.path, "r+b") as file:
+            file.truncate(40)
+        with self.assertRaisesRegex(ValueError, "truncated"):
+            BinarySnapshot.read(self.path)
+
+    def test_journal_replays_on_top_of_snapshot(self):
+        inventory = Inventory(quiet=True)
+        inventory.enable_journal(self.path, checkpoint_interval=3)
+        inventory.add_item("Tomato", 100, 1.5)
+        for _ in range(3):
+            inventory.record_sale("Tomato", 1)
+        # The checkpoint is due, so this writes the binary snapshot
+        inventory.save_to_file(self.path)
+        inventory.record_sale("Tomato", 1)
+        inventory.disable_journal()
+        self.assertTrue(BinarySnapshot.is_snapshot(self.path))
+
+        loaded = Inventory(quiet=True)
+        loaded.load_from_file(self.path)
+        self.assertEqual(loaded.get_item("Tomato").quantity, 96)
+        self.assertEqual(loaded.get_total_revenue(), Decimal("6.0"))
+        self.assertEqual(len(loaded.transactions), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
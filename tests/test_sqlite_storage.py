@@ -0,0 +1,166 @@
+import unittest
+import tempfile
+import os
+import sqlite3
+from datetime import date, datetime, timedelta
+from app.models.inventory import Inventory
+from app.models.transaction_store import to_micros
+from app.storage.base import DatabaseBackend
+from app.storage.sqlite import SQLiteStorage
+
+
+class TestSQLiteStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "inventory.db")
+        self.inventory = Inventory(quiet=True)
+        self.assertFalse(self.inventory.open_database(self.path))
+
+    def tearDown(self):
+        self.inventory.close_storage()
+        self.temp_dir.cleanup()
+
+    def _reopen(self):
+        loaded = Inventory(quiet=True)
+        self.assertTrue(loaded.open_database(self.path))
+        self.addCleanup(loaded.close_storage)
+        return loaded
+
+    def test_mutations_are_written_through(self):
+        self.inventory.add_item("Tomato", 10, 1.5, "Vegetable", "kg")
+        self.inventory.add_item("Kale", 3, 2.0)
+        self.inventory.record_sale("tomato", 4)
+        self.inventory.adjust_item("Tomato", -1, "Spoiled")
+        self.inventory.remove_item("Kale")
+
+        loaded = self._reopen()
+        self.assertEqual([item.name for item in loaded.produces], ["Tomato"])
+        self.assertEqual(loaded.produces[0].quantity, 5)
+        self.assertEqual(loaded.produces[0].unit_of_measurement, "kg")
+        self.assertEqual(loaded.get_total_revenue(), self.inventory.get_total_revenue())
+        self.assertTrue(loaded.has_pending_history())
+        self.assertEqual([txn.to_dict() for txn in loaded.transactions],
+                         [txn.to_dict() for txn in self.inventory.transactions])
+
+    def test_history_is_kept_ahead_of_new_transactions(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        loaded = self._reopen()
+        loaded.record_sale("Tomato", 2)
+
+        self.assertEqual([txn.type for txn in loaded.transactions], ["purchase", "sale"])
+        self.assertEqual(loaded.produces[0].quantity, 8)
+
+    def test_bulk_sales_are_written_in_one_transaction(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.add_item("Onion", 5, 0.5)
+        self.inventory.record_sales_bulk([("Tomato", 2), ("Onion", 1), ("Tomato", 3)])
+
+        loaded = self._reopen()
+        quantities = {item.name: item.quantity for item in loaded.produces}
+        self.assertEqual(quantities, {"Tomato": 5, "Onion": 4})
+        self.assertEqual(loaded.get_total_revenue(), self.inventory.get_total_revenue())
+
+    def test_filters_use_indexed_queries(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.record_sale("Tomato", 2)
+        loaded = self._reopen()
+
+        sales = loaded.filter_transactions_by_type("SALE")
+        self.assertEqual([(txn.produce_name, txn.quantity) for txn in sales], [("Tomato", 2)])
+        today = date.today()
+        self.assertEqual(len(loaded.filter_transactions_by_date(today, today)), 2)
+        self.assertEqual(loaded.filter_transactions_by_date(today + timedelta(days=1),
+                                                            today + timedelta(days=2)), [])
+        # Answered by the database without parsing the history
+        self.assertTrue(loaded.has_pending_history())
+
+    def test_item_queries_use_name_index(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.inventory.add_item("Kale", 5, 2.0)
+        self.inventory.record_sale(" tomato ", 2)
+        self.inventory.record_sale("Kale", 1)
+        loaded = self._reopen()
+
+        history = loaded.get_item_history("TOMATO")
+        self.assertEqual([(txn.type, txn.quantity) for txn in history], [("purchase", 10), ("sale", 2)])
+        stats = loaded.get_item_stats("tomato")
+        self.assertEqual((stats["sales"], stats["units_sold"]), (1, 2))
+        self.assertEqual(stats["revenue"], self.inventory.get_item_stats("Tomato")["revenue"])
+        self.assertIsNone(loaded.get_item_stats("Onion"))
+        self.assertTrue(loaded.has_pending_history())
+        with sqlite3.connect(self.path) as conn:
+            plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM transactions "
+                                "WHERE name_key = 'tomato' ORDER BY id").fetchall()
+        self.assertIn("transactions_name", " ".join(str(step) for step in plan))
+
+    def test_database_without_name_column_is_migrated(self):
+        path = os.path.join(self.temp_dir.name, "old.db")
+        with sqlite3.connect(path) as conn:
+            conn.execute("CREATE TABLE transactions (id INTEGER PRIMARY KEY, type TEXT NOT NULL, "
+                         "produce_name TEXT NOT NULL, quantity NOT NULL, unit_price REAL NOT NULL, "
+                         "note TEXT NOT NULL DEFAULT '', timestamp TEXT NOT NULL, moment INTEGER NOT NULL)")
+            conn.execute("INSERT INTO transactions (type, produce_name, quantity, unit_price, note, "
+                         "timestamp, moment) VALUES ('sale', ' Tomato', 3, 1.5, '', "
+                         "'2024-01-01T00:00:00', 0)")
+        conn.close()
+
+        storage = SQLiteStorage(path)
+        self.addCleanup(storage.close)
+        self.assertEqual([txn["quantity"] for txn in storage.transactions_for_item("tomato")], [3])
+
+    def test_incomplete_backend_fails_when_created(self):
+        class AppendOnly(DatabaseBackend):
+            def append(self, txn, item=None, removed=None):
+                return 1
+
+        with self.assertRaises(TypeError):
+            AppendOnly()
+
+    def test_date_filter_matches_in_memory_filter(self):
+        storage = SQLiteStorage(self.path + ".other")
+        self.addCleanup(storage.close)
+        start = datetime(2024, 1, 1, 23, 30)
+        for hours in range(0, 72, 5):
+            storage.append({"type": "purchase", "produce_name": "Tomato", "quantity": 1,
+                            "unit_price": 1.0, "note": "",
+                            "timestamp": (start + timedelta(hours=hours)).isoformat()})
+
+        loaded = Inventory(quiet=True)
+        loaded.attach_storage(storage)
+        queried = loaded.filter_transactions_by_date(date(2024, 1, 2), date(2024, 1, 3))
+        scanned = loaded.transactions.select_between(to_micros(datetime(2024, 1, 2)),
+                                                     to_micros(datetime(2024, 1, 4)))
+        self.assertEqual([txn.to_dict() for txn in queried], [txn.to_dict() for txn in scanned])
+        self.assertEqual(len(queried), 9)
+
+    def test_existing_state_is_copied_into_new_database(self):
+        inventory = Inventory(quiet=True)
+        inventory.add_item("Tomato", 10, 1.5)
+        inventory.record_sale("Tomato", 1)
+        path = os.path.join(self.temp_dir.name, "copy.db")
+        self.assertFalse(inventory.open_database(path))
+        inventory.close_storage()
+
+        loaded = Inventory(quiet=True)
+        self.assertTrue(loaded.open_database(path))
+        self.addCleanup(loaded.close_storage)
+        self.assertEqual(loaded.produces[0].quantity, 9)
+        self.assertEqual(len(loaded.transactions), 2)
+
+    def test_save_syncs_database_and_reload_reads_it(self):
+        self.inventory.add_item("Tomato", 10, 1.5)
+        self.assertTrue(self.inventory.save_to_file(self.path))
+        self.assertTrue(self.inventory.load_from_file(self.path))
+        self.assertEqual(self.inventory.produces[0].quantity, 10)
+
+    def test_database_uses_wal_and_indexes(self):
+        with sqlite3.connect(self.path) as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM transactions "
+                                "WHERE type = 'sale' ORDER BY id").fetchall()
+        self.assertIn("transactions_type", " ".join(str(step) for step in plan))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import tempfile
+import os
+import io
+import json
+from app.storage.streaming import JSONStreamReader, read_inventory_file
+
+
+class TestJSONStreamReader(unittest.TestCase):
+
+    def test_iter_array_across_small_chunks(self):
+        elements = [{"name": "Jalapeño", "qty": 12345}, 678, "é" * 10, [1, 2]]
+        raw = json.dumps(elements, ensure_ascii=False).encode("utf-8")
+        reader = JSONStreamReader(io.BytesIO(raw), chunk_size=3)
+        self.assertEqual(list(reader.iter_array()), elements)
+
+    def test_numbers_split_at_every_chunk_edge(self):
+        elements = [{"unit_price": 1.25}, 3.75, 12.5, -0.5, 1e-07, 2.5E+30, 42, True, 6.0]
+        doc = json.dumps(elements).replace("1e-07", "1e-7").replace("2.5e+30", "2.5E+30")
+        raw = doc.encode("utf-8")
+        for chunk_size in range(1, len(raw) + 1):
+            with self.subTest(chunk_size=chunk_size):
+                reader = JSONStreamReader(io.BytesIO(raw), chunk_size=chunk_size)
+                self.assertEqual(list(reader.iter_array()), elements)
+                reader = JSONStreamReader(io.BytesIO(b"-12.5e3"), chunk_size=chunk_size)
+                self.assertEqual(reader.read_value(), -12.5e3)
+
+    def test_byte_offset_after_multibyte_text(self):
+        raw = '{"café": 1, "items": [1]}'.encode("utf-8")
+        reader = JSONStreamReader(io.BytesIO(raw), chunk_size=4)
+        reader.expect("{")
+        reader.read_value()
+        reader.expect(":")
+        reader.read_value()
+        reader.expect(",")
+        reader.read_value()
+        reader.expect(":")
+        reader.peek()
+        self.assertEqual(raw[reader.byte_offset():], b"[1]}")
+
+
+class TestReadInventoryFile(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "inventory.json")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, data):
+        with open(self.path, "w") as file:
+            json.dump(data, file, indent=2)
+
+    def test_defers_transactions_array(self):
+        txns = [{"type": "sale", "n": i} for i in range(25)]
+        self._write({"produces": [{"name": "Tomato"}], "total_revenue": "1.50",
+                     "transactions": txns, "last_updated": "never"})
+
+        data, pending = read_inventory_file(self.path)
+        self.assertEqual(data, {"produces": [{"name": "Tomato"}], "total_revenue": "1.50"})
+        chunks = list(pending.iter_chunks(chunk_size=10))
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+        self.assertEqual([txn for chunk in chunks for txn in chunk], txns)
+
+    def test_full_parse_without_defer_key(self):
+        self._write({"transactions": [{"n": 1}], "last_updated": "never"})
+        data, pending = read_inventory_file(self.path, None)
+        self.assertIsNone(pending)
+        self.assertEqual(data, {"transactions": [{"n": 1}], "last_updated": "never"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import sys
+import threading
+from decimal import Decimal
+from app.models.inventory import Inventory
+
+
+class TestThreadSafeInventory(unittest.TestCase):
+
+    THREADS = 8
+
+    def setUp(self):
+        # Switch threads as often as possible to provoke races
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.inventory = Inventory(quiet=True, thread_safe=True)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def _run_threads(self, target, *args):
+        barrier = threading.Barrier(self.THREADS)
+        results = []
+
+        def worker(index):
+            barrier.wait()
+            results.append(target(index, *args))
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_contended_item_is_never_oversold(self):
+        self.inventory.add_item("Tomato", 500, 1.25)
+
+        def sell(index):
+            return sum(1 for _ in range(200) if self.inventory.record_sale("Tomato", 1))
+
+        sold = sum(self._run_threads(sell))
+        item = self.inventory.get_item("Tomato")
+        self.assertEqual(sold, 500)
+        self.assertEqual(item.quantity, 0)
+        self.assertEqual(self.inventory.get_total_revenue(), Decimal("625.00"))
+        self.assertEqual(len(self.inventory.filter_transactions_by_type("sale")), 500)
+        self.assertEqual(self.inventory.get_inventory_value()[0], 0)
+
+    def test_unrelated_items_sell_in_parallel(self):
+        for index in range(self.THREADS):
+            self.inventory.add_item(f"Item {index}", 1000, 2.0, category=f"Category {index % 2}")
+
+        def sell(index):
+            for _ in range(300):
+                self.inventory.record_sale(f"Item {index}", 1)
+                self.inventory.record_sale(f"Item {(index + 1) % self.THREADS}", 1)
+
+        self._run_threads(sell)
+        for index in range(self.THREADS):
+            self.assertEqual(self.inventory.get_item(f"Item {index}").quantity, 400)
+        report = self.inventory.get_inventory_report()
+        self.assertEqual(report["total_value"], self.THREADS * 400 * 2.0)
+        self.assertEqual(report["total_revenue"], self.THREADS * 600 * 2.0)
+
+    def test_bulk_sales_and_single_sales_share_stock(self):
+        self.inventory.add_item("Tomato", 300, 1.0)
+        self.inventory.add_item("Onion", 300, 1.0)
+
+        def sell(index):
+            sold = 0
+            for _ in range(50):
+                if index % 2:
+                    outcome = self.inventory.record_sales_bulk([("Onion", 1), ("Tomato", 1)])
+                    sold += 2 if outcome["applied"] else 0
+                else:
+                    sold += sum(self.inventory.record_sale(name, 1) for name in ("Tomato", "Onion"))
+            return sold
+
+        sold = sum(self._run_threads(sell))
+        remaining = self.inventory.get_item("Tomato").quantity + self.inventory.get_item("Onion").quantity
+        self.assertEqual(sold + remaining, 600)
+        self.assertEqual(self.inventory.get_total_revenue(), Decimal(sold))
+
+    def test_locks_are_no_ops_when_disabled(self):
+        inventory = Inventory(quiet=True)
+        self.assertEqual(len(inventory._item_locks), 1)
+        self.assertIs(inventory._state_lock, inventory._log_lock)
+
+
+if __name__ == '__main__':
+    unittest.main()
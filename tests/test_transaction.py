@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from app.models.produce import ProduceItem
+from app.models.transaction import Transaction
+
+
+class TestTransaction(unittest.TestCase):
+
+    def test_round_trips_dict_with_exact_timestamp(self):
+        data = {"type": "sale", "produce_name": "Tomato", "quantity": 4, "unit_price": 1.5,
+                "note": "", "timestamp": "2024-01-16T11:00:00+02:00"}
+        txn = Transaction.from_dict(data)
+        self.assertEqual(txn.to_dict(), data)
+        self.assertEqual(txn.moment, datetime.fromisoformat(data["timestamp"]))
+
+    def test_new_transaction_formats_timestamp_lazily(self):
+        txn = Transaction("SALE", " Tomato ", 4, 1.5)
+        self.assertIsNone(txn._timestamp)
+        self.assertEqual(datetime.fromisoformat(txn.timestamp), txn.moment)
+        self.assertEqual(txn.type, "sale")
+        self.assertEqual(txn.produce_name, "Tomato")
+
+    def test_str_uses_parsed_time(self):
+        txn = Transaction("sale", "Tomato", 4, 1.5, "Market", "2024-01-15T10:00:00")
+        self.assertEqual(str(txn), "[2024-01-15 10:00] SALE: 4 Tomato @ $1.50 each (Total: $6.00) - Market")
+
+    def test_total_amount_is_exact(self):
+        self.assertEqual(Transaction("sale", "Apple", 3, 0.1).total_amount, Decimal("0.3"))
+        # Integer and float quantities keep their own precision
+        self.assertEqual(str(Transaction("sale", "Apple", 4, 1.5).total_amount), "6.0")
+        self.assertEqual(str(Transaction("sale", "Apple", 4.0, 1.5).total_amount), "6.00")
+
+    def test_item_price_decimal_follows_price_changes(self):
+        item = ProduceItem("Apple", 3, 0.1, "Fruit", "kg")
+        self.assertEqual(item.stock_value, Decimal("0.3"))
+        item.update_price(0.2)
+        self.assertEqual(item.price, Decimal("0.2"))
+        self.assertEqual(item.stock_value, Decimal("0.6"))
+
+    def test_models_are_slotted_and_share_strings(self):
+        first = Transaction("sale", "".join(["Tom", "ato"]), 1, 1.0)
+        second = Transaction("sale", "".join(["Toma", "to"]), 1, 1.0)
+        item = ProduceItem("".join(["To", "mato"]), 1, 1.0, "Vegetable", "kg")
+        self.assertIs(first.produce_name, second.produce_name)
+        self.assertIs(first.produce_name, item.name)
+        for obj in (first, item):
+            self.assertFalse(hasattr(obj, "__dict__"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import random
+from datetime import datetime
+from unittest import mock
+from decimal import Decimal
+from app.models.inventory import Inventory
+from app.models.transaction import Transaction
+from app.models.transaction_store import TransactionStore, to_micros
+
+
+class TestTransactionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.rows = [
+            {"type": "purchase", "produce_name": "Tomato", "quantity": 10, "unit_price": 1.5,
+             "note": "Added new item to inventory", "timestamp": "2024-01-15T09:30:00.123456"},
+            {"type": "sale", "produce_name": "Tomato", "quantity": 4, "unit_price": 1.5,
+             "note": "", "timestamp": "2024-01-15T10:00:00"},
+            {"type": "sale", "produce_name": "Kale", "quantity": 2.5, "unit_price": 0.1,
+             "note": "", "timestamp": "2024-01-16T11:00:00+02:00"},
+        ]
+        self.store = TransactionStore()
+        self.store.extend_dicts(self.rows)
+
+    def test_round_trips_serialized_rows(self):
+        self.assertEqual(list(self.store.iter_dicts()), self.rows)
+        self.assertEqual([txn.to_dict() for txn in self.store], self.rows)
+
+    def test_views_behave_like_transactions(self):
+        txn = self.store[-2]
+        self.assertIsInstance(txn, Transaction)
+        self.assertEqual(txn.total_amount, Decimal("6.0"))
+        self.assertEqual(len(self.store[1:]), 2)
+        with self.assertRaises(IndexError):
+            self.store[3]
+
+    def test_rejects_invalid_rows(self):
+        with self.assertRaises(ValueError):
+            self.store.append_dict(dict(self.rows[0], type="gift"))
+        with self.assertRaises(ValueError):
+            self.store.append_dict(dict(self.rows[0], quantity=0))
+        self.assertEqual(len(self.store), 3)
+
+    def test_extend_store_remaps_names(self):
+        other = TransactionStore([Transaction("sale", "Kale", 1, 0.1, "late")])
+        self.store.extend_store(other)
+        self.assertEqual(self.store[3].produce_name, "Kale")
+        self.assertEqual(self.store[3].note, "late")
+
+    def test_sales_summary_matches_row_by_row(self):
+        units, revenue, last_sale = self.store.sales_summary()
+        self.assertEqual(units, {"Tomato": 4, "Kale": 2})
+        self.assertEqual(revenue, {"Tomato": Decimal("6.0"), "Kale": Decimal("0.25")})
+        self.assertEqual(last_sale, "2024-01-16T11:00:00+02:00")
+
+
+class TestTransactionTimeIndex(unittest.TestCase):
+
+    DAYS = [5, 1, 3, 3, 9, 2, 7, 1]
+
+    def _build(self, days):
+        store = TransactionStore()
+        store.extend_dicts({"type": "sale", "produce_name": "Tomato", "quantity": 1,
+                            "unit_price": 1.0, "timestamp": f"2024-01-{day:02d}T12:00:00"}
+                           for day in days)
+        return store
+
+    def _micros(self, day):
+        return to_micros(datetime(2024, 1, day))
+
+    def _brute_force(self, store, start, end):
+        return [index for index, txn in enumerate(store)
+                if self._micros(start) <= to_micros(datetime.fromisoformat(txn.timestamp))
+                < self._micros(end)]
+
+    def test_in_order_log_is_searched_directly(self):
+        store = self._build(sorted(self.DAYS))
+        self.assertEqual(store.indices_between(self._micros(2), self._micros(5)), [2, 3, 4])
+        self.assertEqual(store.count_after(self._micros(7)), 2)
+        self.assertIsNone(store._time_order)
+
+    def test_out_of_order_rows_are_found_in_log_order(self):
+        store = self._build(self.DAYS)
+        for start, end in [(1, 31), (2, 5), (3, 4), (8, 9), (10, 20)]:
+            self.assertEqual(store.indices_between(self._micros(start), self._micros(end)),
+                             self._brute_force(store, start, end))
+        self.assertEqual(store.count_after(self._micros(3)), 5)
+
+    def test_index_follows_appends_after_disorder(self):
+        store = self._build(self.DAYS)
+        store.count_after(0)
+        store.extend_store(self._build([4, 8]))
+        store.append_dict({"type": "sale", "produce_name": "Kale", "quantity": 1,
+                           "unit_price": 1.0, "timestamp": "2024-01-06T00:00:00"})
+        self.assertEqual(store.indices_between(self._micros(4), self._micros(7)),
+                         self._brute_force(store, 4, 7))
+        self.assertEqual(store.count_after(self._micros(6)), 3)
+
+
+
+class TestParallelSalesSummary(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(7)
+        rows = []
+        for index in range(3000):
+            rows.append({
+                "type": rng.choice(["sale", "sale", "purchase", "adjustment"]),
+                "produce_name": f"Item {rng.randrange(40)}",
+                "quantity": rng.choice([1, 2, 5, 2.5, 3.0]),
+                "unit_price": rng.choice([0.1, 1.25, 3.0]),
+                "note": "",
+                # Mostly in order, with a few late arrivals and exact ties
+                "timestamp": datetime(2024, 1, 1, 0, 0, index // 2 % 60, index // 120).isoformat()
+            })
+        self.store = TransactionStore()
+        self.store.extend_dicts(rows)
+
+    def test_parallel_summary_is_identical_to_serial(self):
+        serial = self.store.sales_summary()
+        with mock.patch.object(TransactionStore, "PARALLEL_MIN_SHARD_ROWS", 100):
+            parallel = self.store.sales_summary(workers=3)
+
+        units, revenue, last_sale = parallel
+        self.assertEqual(list(units.items()), list(serial[0].items()))
+        self.assertEqual(list(revenue.items()), list(serial[1].items()))
+        self.assertEqual(last_sale, serial[2])
+
+    def test_inventory_insights_match_serial(self):
+        serial, parallel = Inventory(quiet=True), Inventory(quiet=True, report_workers=2)
+        for inventory in (serial, parallel):
+            inventory.transactions = TransactionStore(self.store)
+        with mock.patch.object(TransactionStore, "PARALLEL_MIN_SHARD_ROWS", 100):
+            self.assertEqual(parallel.generate_summary_insights(), serial.generate_summary_insights())
+
+    def test_small_logs_stay_serial(self):
+        with mock.patch("app.models.transaction_store.ProcessPoolExecutor") as pool:
+            self.store.sales_summary(workers=4)
+        pool.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()